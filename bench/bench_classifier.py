@@ -0,0 +1,105 @@
+"""
+bench_classifier.py
+Benchmark klasifikasi berita: loop substring lama (classify_news sebelum
+news_classifier) vs Matcher regex-trie, per judul dan batch, pada korpus
+headline sintetis (id/en) dengan leksikon yang diperbesar.
+
+  python bench/bench_classifier.py [--titles 50000] [--terms 5000]
+
+--terms menambah term sintetis berbobot ke leksikon bawaan untuk meniru
+leksikon ribuan term. Baris "setuju" membandingkan label Matcher (dengan
+20 keyword lama, bobot ±1) terhadap fungsi lama — harus ~100%.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+import news_classifier  # noqa: E402
+from news_classifier import Matcher, LEXICON  # noqa: E402
+
+LEGACY_BULL = ["menguat", "naik", "apresiasi", "positif", "stabil", "surplus",
+               "deal", "investasi masuk", "cadangan devisa", "beli rupiah"]
+LEGACY_BEAR = ["melemah", "turun", "depresiasi", "tekanan", "defisit", "jual",
+               "anjlok", "rekor rendah", "risk off", "capital outflow"]
+
+SUBJECTS = ["Rupiah", "Kurs rupiah", "IDR", "The rupiah", "Dolar AS", "Indonesia's rupiah", "Cadangan devisa"]
+VERBS = ["menguat", "melemah", "naik tipis", "turun", "anjlok", "stabil", "strengthens", "weakens",
+         "slides", "gains", "bergerak datar", "ditutup", "dibuka"]
+TAILS = ["terhadap dolar AS", "jelang keputusan BI", "di tengah tekanan jual", "as Fed signals rate cut",
+         "after trade surplus data", "ke rekor rendah", "seiring capital outflow", "on risk-off mood",
+         "pagi ini", "sore ini", "di pasar spot", "menurut analis", "setelah data inflasi"]
+
+
+def legacy_classify(title: str, bull=LEGACY_BULL, bear=LEGACY_BEAR) -> str:
+    """classify_news lama: loop substring per keyword."""
+    title_lower = title.lower()
+    bull_score = sum(1 for k in bull if k in title_lower)
+    bear_score = sum(1 for k in bear if k in title_lower)
+    if bull_score > bear_score:
+        return "BULLISH_IDR"
+    elif bear_score > bull_score:
+        return "BEARISH_IDR"
+    return "NEUTRAL"
+
+
+def corpus(n: int, rng: random.Random) -> list:
+    return [f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(TAILS)} ({rng.randint(1, 9999)})"
+            for _ in range(n)]
+
+
+def big_lexicon(n_extra: int, rng: random.Random) -> dict:
+    letters = "abcdefghijklmnoprstuwy"
+    terms = dict(LEXICON)
+    while len(terms) < len(LEXICON) + n_extra:
+        word = "".join(rng.choice(letters) for _ in range(rng.randint(5, 10)))
+        if rng.random() < 0.3:
+            word += " " + "".join(rng.choice(letters) for _ in range(rng.randint(4, 8)))
+        terms[word] = rng.choice([-2, -1, -0.5, 0.5, 1, 2])
+    return terms
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark loop substring vs Matcher regex-trie.")
+    parser.add_argument("--titles", type=int, default=50000)
+    parser.add_argument("--terms", type=int, default=5000, help="term sintetis tambahan di leksikon")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    titles = corpus(args.titles, rng)
+    lexicon = big_lexicon(args.terms, rng)
+    bull = [t for t, w in lexicon.items() if w > 0]
+    bear = [t for t, w in lexicon.items() if w < 0]
+
+    t_build, big = timed(lambda: Matcher(lexicon))
+    legacy_matcher = Matcher({**{t: 1 for t in LEGACY_BULL}, **{t: -1 for t in LEGACY_BEAR}})
+
+    rows = [
+        ("lama, 20 keyword", lambda: [legacy_classify(t) for t in titles]),
+        (f"lama, {len(lexicon)} term", lambda: [legacy_classify(t, bull, bear) for t in titles[:2000]]),
+        (f"Matcher per judul, {len(lexicon)} term", lambda: [news_classifier.label(big.score(t)) for t in titles]),
+        (f"Matcher batch, {len(lexicon)} term", lambda: news_classifier.classify_batch(titles, matcher=big)),
+    ]
+    print(f"{len(titles)} judul · leksikon {len(lexicon)} term · kompilasi Matcher {t_build * 1000:.0f} ms")
+    print(f"{'varian':<34} {'judul/s':>12} {'µs/judul':>10}")
+    for name, fn in rows:
+        elapsed, out = timed(fn)
+        print(f"{name:<34} {len(out) / elapsed:>12,.0f} {elapsed / len(out) * 1e6:>10.1f}")
+
+    old = [legacy_classify(t) for t in titles]
+    new = news_classifier.classify_batch(titles, matcher=legacy_matcher)
+    agree = sum(a == b for a, b in zip(old, new)) / len(titles)
+    print(f"setuju dengan fungsi lama (20 keyword): {agree:.2%}")
+
+
+if __name__ == "__main__":
+    main()
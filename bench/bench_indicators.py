@@ -0,0 +1,73 @@
+"""
+bench_indicators.py
+Benchmark engine indikator (scripts/indicators.py) vs implementasi lama
+compute_ma / statistics.stdev pada series harian sintetis 1–40 tahun.
+
+Jalankan:  python bench/bench_indicators.py
+"""
+import os
+import sys
+import time
+import random
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+import indicators  # noqa: E402
+
+WINDOWS = (5, 20, 50, 200)
+BUSINESS_DAYS_PER_YEAR = 261
+
+
+def legacy_compute_ma(prices: list, window: int) -> list:
+    """Salinan compute_ma sebelum engine indikator (O(n·w))."""
+    result = []
+    for i in range(len(prices)):
+        if i < window - 1:
+            result.append(None)
+        else:
+            result.append(round(sum(prices[i - window + 1:i + 1]) / window, 2))
+    return result
+
+
+def legacy_all(prices: list) -> dict:
+    out = {f"ma{w}": legacy_compute_ma(prices, w) for w in WINDOWS}
+    out["std14"] = [None] * 13 + [
+        round(statistics.stdev(prices[i - 13:i + 1]), 2) for i in range(13, len(prices))
+    ]
+    return out
+
+
+def engine_all(prices: list) -> dict:
+    return indicators.rolling(prices, sma=WINDOWS, ema=(12, 26), std=(14,), minmax=(20, 260))
+
+
+def synthetic_series(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    p, out = 14000.0, []
+    for _ in range(n):
+        p *= 1 + rng.gauss(0, 0.004)
+        out.append(round(p, 2))
+    return out
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def main():
+    print(f"{'tahun':>6} {'titik':>7} {'legacy (s)':>11} {'engine (s)':>11} {'speedup':>8}  cocok")
+    for years in (1, 5, 10, 20, 40):
+        prices = synthetic_series(years * BUSINESS_DAYS_PER_YEAR)
+        old, t_old = timed(legacy_all, prices)
+        new, t_new = timed(engine_all, prices)
+        match = all(
+            all(a is None and b is None or abs(a - b) <= 0.011 for a, b in zip(old[k], new[k]))
+            for k in old
+        )
+        print(f"{years:>6} {len(prices):>7} {t_old:>11.4f} {t_new:>11.4f} {t_old / t_new:>7.1f}x  {'ya' if match else 'TIDAK'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+bench_ingest.py
+Benchmark news_ingest.Ingest: throughput, akurasi dedup near-duplicate dan
+peak memori pada aliran artikel sintetis yang makin besar.
+
+Setiap "cerita" dimuat ulang beberapa kali seperti sindikasi: suffix
+" - Reuters", huruf besar/kecil, atau tambahan "hari ini". Baris "dedup"
+menghitung salinan yang tertangkap dan cerita berbeda yang keliru digabung.
+
+  python bench/bench_ingest.py [--sizes 1000,10000,50000] [--top 30]
+
+Peak memori (tracemalloc) berhenti tumbuh setelah window dedup penuh: yang
+disimpan hanya top-N dan DEDUP_WINDOW signature.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+import news_ingest  # noqa: E402
+
+SUBJECTS = ["Rupiah", "Kurs rupiah", "IDR", "Indonesia's rupiah", "Cadangan devisa", "Yield SBN",
+            "IHSG", "Bank Indonesia", "Dolar AS", "Harga emas", "Saham perbankan", "Inflasi"]
+VERBS = ["menguat", "melemah", "naik", "turun", "anjlok", "stabil", "strengthens", "weakens",
+         "slides", "bergerak datar", "ditutup", "dibuka", "tertekan"]
+TAILS = ["terhadap dolar AS", "jelang keputusan BI", "di tengah tekanan jual", "as Fed signals rate cut",
+         "after trade surplus data", "ke rekor rendah", "seiring capital outflow", "on risk-off mood",
+         "di pasar spot", "menurut analis", "setelah data inflasi", "jelang rilis PDB", "di awal pekan"]
+OUTLETS = ["Reuters", "Bloomberg", "Kontan", "Bisnis", "CNBC Indonesia", "Antara"]
+
+
+WORDS = ["".join(random.Random(i).choice("aeiou" if j % 2 else "bdgklmnprstw") for j in range(6))
+         for i in range(800)]   # kosakata pseudo: detail pembeda antar cerita
+
+
+def story(rng: random.Random) -> str:
+    return (f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} ke {rng.randint(15000, 17999):,} "
+            f"{rng.choice(TAILS)}, {' '.join(rng.sample(WORDS, 3))}").replace(",", ".")
+
+
+def variant(title: str, rng: random.Random) -> str:
+    kind = rng.randrange(3)
+    if kind == 0:
+        return f"{title} - {rng.choice(OUTLETS)}"
+    if kind == 1:
+        return title.title()
+    return title + " hari ini"
+
+
+def stream(n: int, rng: random.Random):
+    """Yield (artikel, id_cerita). ±40% artikel adalah salinan cerita sebelumnya."""
+    recent = []
+    for i in range(n):
+        if recent and rng.random() < 0.4:
+            sid, title = rng.choice(recent)
+            title = variant(title, rng)
+        else:
+            sid, title = i, story(rng)
+            recent = (recent + [(sid, title)])[-50:]
+        yield {"title": title, "source": rng.choice(OUTLETS), "datetime": "2026-02-27"}, sid
+
+
+def run(n: int, top: int, seed: int) -> dict:
+    articles = list(stream(n, random.Random(seed)))
+
+    ingest = news_ingest.Ingest(top_n=top, today="2026-02-27")
+    caught = merged = injected = 0
+    seen_sid = set()
+    t0 = time.perf_counter()
+    for article, sid in articles:
+        status = ingest.add(article)
+        if sid in seen_sid:
+            injected += 1
+            caught += status == "duplicate"
+        else:
+            merged += status == "duplicate"
+        seen_sid.add(sid)
+    elapsed = time.perf_counter() - t0
+
+    # peak memori di pass terpisah (tracemalloc memperlambat timing)
+    mem = news_ingest.Ingest(top_n=top, today="2026-02-27")
+    tracemalloc.start()
+    for article, _ in articles:
+        mem.add(article)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "n": n, "per_s": n / elapsed, "us": elapsed / n * 1e6, "peak_kb": peak // 1024,
+        "recall": caught / injected if injected else 1.0, "false_merge": merged / n,
+        "kept": len(ingest.ranked()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ingest berita + dedup MinHash.")
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--top", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    print(f"{'artikel':>8} {'artikel/s':>10} {'µs/artikel':>11} {'peak KB':>8} "
+          f"{'dedup':>7} {'salah gabung':>13} {'top':>4}")
+    for n in (int(x) for x in args.sizes.split(",")):
+        r = run(n, args.top, args.seed)
+        print(f"{r['n']:>8} {r['per_s']:>10,.0f} {r['us']:>11.1f} {r['peak_kb']:>8} "
+              f"{r['recall']:>7.1%} {r['false_merge']:>13.2%} {r['kept']:>4}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+bench_parse.py
+Benchmark parsing halaman scraping: BeautifulSoup html.parser seluruh
+halaman (cara lama) vs html_extract (lxml pull parser, hanya tag kandidat,
+berhenti begitu cukup).
+
+Tanpa argumen, fixture bench/fixtures/news_search.html dan marketwatch_dxy.html
+dibungkus menjadi halaman seukuran aslinya (±300 KB: script/style inline,
+navigasi, footer). Halaman asli yang disimpan bisa dipakai langsung:
+
+  python bench/bench_parse.py [--pages cnbc.html kontan.html] [--repeat 20]
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import statistics
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "scripts"))
+import html_extract  # noqa: E402
+import news_classifier  # noqa: E402
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+ENOUGH = 5  # fetch_news_scraping berhenti setelah 5 headline
+# Semua varian memindai kandidat sebanyak ini (limit lama 30 habis oleh link navigasi)
+CANDIDATES = 400
+
+
+def fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def inflate(page: str, rng: random.Random) -> str:
+    """Bungkus fixture kecil dengan bobot halaman portal berita sungguhan."""
+    script = "<script>" + "".join(f"var v{i}={rng.random()};function f{i}(a){{return a*v{i}}}\n"
+                                  for i in range(2500)) + "</script>"
+    style = "<style>" + "".join(f".c{i}{{margin:{i % 9}px;color:#{i % 999:03d}}}\n" for i in range(2000)) + "</style>"
+    nav = "<nav>" + "".join(f'<a href="/k/{i}">Kanal {i}</a>' for i in range(120)) + "</nav>"
+    related = "<aside>" + "".join(
+        f'<div class="card"><h3><a href="/r/{i}">Berita terkait nomor {i} tentang pasar dan ekonomi</a></h3>'
+        f'<p>{"Lorem ipsum dolor sit amet " * 8}</p></div>' for i in range(150)) + "</aside>"
+    footer = "<footer>" + "".join(f'<a href="/f/{i}">Tautan {i}</a>' for i in range(300)) + "</footer>"
+    page = page.replace("</head>", script + style + "</head>", 1)
+    return page.replace("<body>", "<body>" + nav, 1).replace("</body>", related + footer + "</body>", 1)
+
+
+# ── Varian: halaman hasil pencarian berita ───────────────────────────────────
+def news_bs4_html_parser(html: bytes) -> list:
+    """Cara lama: parse seluruh halaman, lalu find_all kandidat."""
+    soup = BeautifulSoup(html, "html.parser")
+    out = []
+    for el in soup.find_all(["h1", "h2", "h3", "a"], limit=CANDIDATES):
+        title = el.get_text(strip=True)
+        if len(title) >= 20 and news_classifier.is_relevant(title):
+            out.append(title)
+    return out[:ENOUGH]
+
+
+def news_bs4_strainer(html: bytes) -> list:
+    soup = BeautifulSoup(html, "lxml", parse_only=SoupStrainer(["h1", "h2", "h3", "a"]))
+    out = []
+    for el in soup.find_all(["h1", "h2", "h3", "a"], limit=CANDIDATES):
+        title = el.get_text(strip=True)
+        if len(title) >= 20 and news_classifier.is_relevant(title):
+            out.append(title)
+    return out[:ENOUGH]
+
+
+def news_html_extract(html: bytes) -> list:
+    out = []
+    for title in html_extract.headlines(html, CANDIDATES):
+        if news_classifier.is_relevant(title):
+            out.append(title)
+            if len(out) >= ENOUGH:
+                break
+    return out
+
+
+# ── Varian: MarketWatch DXY ──────────────────────────────────────────────────
+def dxy_bs4_html_parser(html: bytes):
+    soup = BeautifulSoup(html, "html.parser")
+    el = soup.find("bg-quote", {"field": "Last"}) or soup.find("span", {"class": re.compile("value")})
+    return el.get_text(strip=True) if el else None
+
+
+def dxy_html_extract(html: bytes):
+    for el in html_extract.iter_tags(html, ("bg-quote",)):
+        if el.get("field") == "Last":
+            return html_extract.text(el)
+    return None
+
+
+def bench(fn, html: bytes, repeat: int) -> tuple:
+    times, out = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(html)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times), out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark parsing halaman scraping.")
+    parser.add_argument("--pages", nargs="*", help="halaman hasil pencarian berita yang disimpan (.html)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(7)
+    pages = []
+    for path in args.pages or []:
+        with open(path, "rb") as f:
+            pages.append((os.path.basename(path), "news", f.read()))
+    if not args.pages:
+        pages = [
+            ("news_search (inflated)", "news", inflate(fixture("news_search.html"), rng).encode()),
+            ("marketwatch_dxy (inflated)", "dxy", inflate(fixture("marketwatch_dxy.html"), rng).encode()),
+        ]
+
+    variants = {
+        "news": [("bs4 html.parser (lama)", news_bs4_html_parser),
+                 ("bs4 lxml + SoupStrainer", news_bs4_strainer),
+                 ("html_extract (lxml pull)", news_html_extract)],
+        "dxy": [("bs4 html.parser (lama)", dxy_bs4_html_parser),
+                ("html_extract (lxml pull)", dxy_html_extract)],
+    }
+    print(f"{'halaman':<28} {'KB':>6} {'varian':<26} {'ms':>8} {'×':>6}  hasil")
+    for name, kind, html in pages:
+        base = None
+        for label, fn in variants[kind]:
+            t, out = bench(fn, html, args.repeat)
+            base = base or t
+            summary = f"{len(out)} headline" if isinstance(out, list) else out
+            print(f"{name:<28} {len(html) // 1024:>6} {label:<26} {t * 1000:>8.2f} {base / t:>6.1f}  {summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+bench_pipeline.py
+Benchmark end-to-end offline: fetch_data.main, generate_report.main
+(mode local & llm-stream) dan deploy_pages.main terhadap standin_server
+dengan fixture rekaman, per profil fault (clean, slow, flaky, ...).
+
+Setiap tahap jalan di subprocess baru (env dibaca saat import) di direktori
+kerja sementara; diukur wall time, peak alokasi Python (tracemalloc) dan
+max RSS proses.
+
+  python bench/bench_pipeline.py [--profiles clean,slow] [--repeat 3]
+  python bench/bench_pipeline.py --save bench/baseline.json
+  python bench/bench_pipeline.py --check bench/baseline.json [--tolerance 0.25]
+
+Yahoo Finance (yfinance) tidak punya fixture: di bench modulnya dinonaktifkan
+sehingga fetch_dxy memakai cabang MarketWatch.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(BENCH_DIR, "..", "scripts")
+sys.path.insert(0, BENCH_DIR)
+from standin_server import StandinServer, PROFILES  # noqa: E402
+
+FIXTURE_DATE = "2026-02-27"
+# (nama, modul, env tambahan)
+STAGES = [
+    ("fetch", "fetch_data", {}),
+    ("generate_local", "generate_report", {"REPORT_MODE": "local"}),
+    ("generate_llm", "generate_report", {"REPORT_MODE": "llm", "GEMINI_STREAM": "1"}),
+    ("deploy", "deploy_pages", {}),
+]
+
+
+# ── Child: satu tahap, satu proses ───────────────────────────────────────────
+def child(module: str):
+    import resource
+    import tracemalloc
+    sys.path.insert(0, SCRIPTS_DIR)
+    sys.modules["yfinance"] = None  # import gagal → fallback MarketWatch (ada fixture)
+    sys.argv = [module]
+    mod = __import__(module)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    status = "ok"
+    try:
+        mod.main()
+    except SystemExit as e:
+        status = "ok" if e.code in (None, 0) else f"exit {e.code}"
+    wall = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    print("BENCH " + json.dumps({
+        "wall_s": round(wall, 3),
+        "peak_kb": peak // 1024,
+        "maxrss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "status": status,
+    }))
+
+
+# ── Parent ───────────────────────────────────────────────────────────────────
+def run_stage(srv: StandinServer, profile: str, workdir: str, module: str, extra_env: dict, pairs: str) -> dict:
+    srv.set_profile(profile)
+    env = dict(os.environ)
+    env.update({
+        "HTTP_UPSTREAM": srv.base_url,
+        "DATE_OVERRIDE": FIXTURE_DATE,
+        "RADAR_PAIRS": pairs,
+        "NEWS_API_KEY": "bench",
+        "TAVILY_API_KEY": "",
+        "GEMINI_API_KEY": "bench",
+        "HTTP_CACHE": "0",
+        "LLM_CACHE": "0",
+        "FETCH_DEADLINE": "30",
+        "GEMINI_BUDGET_S": "120",
+        "PYTHONUNBUFFERED": "1",
+    })
+    env.update(extra_env)
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", module],
+        cwd=workdir, env=env, capture_output=True, text=True, timeout=600,
+    )
+    line = next((l for l in proc.stdout.splitlines() if l.startswith("BENCH ")), None)
+    if line is None:
+        tail = (proc.stderr or proc.stdout).strip().splitlines()[-3:]
+        return {"wall_s": None, "peak_kb": None, "maxrss_kb": None, "status": " | ".join(tail)[:80]}
+    result = json.loads(line[6:])
+    result["served"] = dict(srv.served)
+    return result
+
+
+def run_profile(srv: StandinServer, profile: str, pairs: str) -> dict:
+    workdir = tempfile.mkdtemp(prefix=f"radar-bench-{profile}-")
+    try:
+        return {name: run_stage(srv, profile, workdir, module, env, pairs) for name, module, env in STAGES}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def median_runs(runs: list) -> dict:
+    out = {}
+    for name in runs[0]:
+        walls = [r[name]["wall_s"] for r in runs if r[name]["wall_s"] is not None]
+        peaks = [r[name]["peak_kb"] for r in runs if r[name]["peak_kb"] is not None]
+        rss = [r[name]["maxrss_kb"] for r in runs if r[name]["maxrss_kb"] is not None]
+        out[name] = {
+            "wall_s": round(statistics.median(walls), 3) if walls else None,
+            "peak_kb": int(statistics.median(peaks)) if peaks else None,
+            "maxrss_kb": int(statistics.median(rss)) if rss else None,
+            "status": runs[-1][name]["status"],
+            "served": runs[-1][name].get("served", {}),
+        }
+    return out
+
+
+def check(results: dict, baseline: dict, tolerance: float) -> list:
+    """Tahap yang lebih lambat dari baseline·(1+tolerance) + 50 ms."""
+    regressions = []
+    for profile, stages in results.items():
+        for name, r in stages.items():
+            base = baseline.get(profile, {}).get(name, {}).get("wall_s")
+            if base is None or r["wall_s"] is None:
+                continue
+            if r["wall_s"] > base * (1 + tolerance) + 0.05:
+                regressions.append(f"{profile}/{name}: {r['wall_s']:.2f}s vs baseline {base:.2f}s")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline offline dengan server pengganti.")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--profiles", default="clean,slow,flaky,ratelimited,slowprimary,dead",
+                        help=f"profil fault, dipisah koma ({', '.join(PROFILES)})")
+    parser.add_argument("--repeat", type=int, default=1, help="ulangi tiap profil, ambil median")
+    parser.add_argument("--pairs", default="USDIDR,SGDIDR", help="RADAR_PAIRS untuk bench")
+    parser.add_argument("--save", metavar="PATH", help="simpan hasil sebagai baseline")
+    parser.add_argument("--check", metavar="PATH", help="bandingkan dengan baseline, exit 1 jika regresi")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+    if args.child:
+        return child(args.child)
+
+    srv = StandinServer().start()
+    results = {}
+    print(f"{'profil':<12} {'tahap':<15} {'wall (s)':>9} {'peak KB':>9} {'RSS KB':>9}  status / response")
+    for profile in args.profiles.split(","):
+        runs = [run_profile(srv, profile, args.pairs) for _ in range(max(1, args.repeat))]
+        results[profile] = median_runs(runs)
+        for name, r in results[profile].items():
+            wall = f"{r['wall_s']:.3f}" if r["wall_s"] is not None else "-"
+            served = " ".join(f"{k}×{v}" for k, v in sorted(r["served"].items()))
+            print(f"{profile:<12} {name:<15} {wall:>9} {r['peak_kb'] or '-':>9} {r['maxrss_kb'] or '-':>9}  "
+                  f"{r['status']} {served}")
+    srv.shutdown()
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Baseline disimpan ke {args.save}")
+    if args.check:
+        with open(args.check, "r", encoding="utf-8") as f:
+            regressions = check(results, json.load(f), args.tolerance)
+        for r in regressions:
+            print(f"❌ Regresi {r}")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ Tidak ada regresi (toleransi {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+standin_server.py
+Server HTTP lokal pengganti semua sumber eksternal pipeline, melayani
+fixture di bench/fixtures/ dengan fault injection (latency, error, 429).
+
+Pipeline diarahkan ke server ini lewat env HTTP_UPSTREAM (http_client):
+  https://api.frankfurter.app/2026-01-28..2026-02-27?from=USD&to=IDR
+  → http://127.0.0.1:<port>/api.frankfurter.app/2026-01-28..2026-02-27?from=USD&to=IDR
+
+Jalankan sendiri:
+  python bench/standin_server.py [--port 8765] [--profile slow]
+  python bench/standin_server.py --record     # perbarui fixture dari sumber asli
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+GEMINI_HOST = "generativelanguage.googleapis.com"
+
+# (host, regex path, fixture, content-type, URL asli untuk --record)
+ROUTES = [
+    ("api.frankfurter.app", r"^/[\d-]+\.\.[\d-]*$", "frankfurter.json", "application/json",
+     "https://api.frankfurter.app/2026-01-01..2026-02-27?from=USD&to=CNY,EUR,IDR,JPY,SGD"),
+    ("cdn.jsdelivr.net", r"^/npm/@fawazahmed0/", "fawazahmed0_usd.json", "application/json",
+     "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/usd.json"),
+    ("open.er-api.com", r"^/v6/latest/USD$", "open_er_api.json", "application/json",
+     "https://open.er-api.com/v6/latest/USD"),
+    ("www.bi.go.id", r"^/biwebservice/", "bi_jisdor.xml", "text/xml; charset=utf-8", None),
+    ("www.marketwatch.com", r"^/investing/index/dxy", "marketwatch_dxy.html", "text/html; charset=utf-8",
+     "https://www.marketwatch.com/investing/index/dxy"),
+    ("newsapi.org", r"^/v2/everything$", "newsapi.json", "application/json", None),
+    ("www.cnbcindonesia.com", r"^/search", "news_search.html", "text/html; charset=utf-8",
+     "https://www.cnbcindonesia.com/search?query=rupiah+kurs+dollar"),
+    ("ekonomi.bisnis.com", r"^/search", "news_search.html", "text/html; charset=utf-8", None),
+    ("www.kontan.co.id", r"^/search", "news_search.html", "text/html; charset=utf-8", None),
+    (GEMINI_HOST, r":generateContent$", "gemini_narrative.json", "application/json", None),
+    (GEMINI_HOST, r":streamGenerateContent$", "gemini_stream.sse", "text/event-stream", None),
+]
+
+# Fault per host ("*" = semua host):
+#   latency    detik sebelum response (timeout klien tetap berlaku)
+#   status     selalu balas kode ini
+#   error_rate peluang balas 503
+#   rate_limit N request pertama dibalas 429 + Retry-After: 1
+#   chunk_delay detik antar event SSE
+PROFILES = {
+    "clean": {},
+    "slow": {"latency": {"*": 0.3, "www.bi.go.id": 3.0, GEMINI_HOST: 1.0}, "chunk_delay": {GEMINI_HOST: 0.05}},
+    "flaky": {"error_rate": {"*": 0.3}},
+    "ratelimited": {"rate_limit": {GEMINI_HOST: 2, "newsapi.org": 1}},
+    "slowprimary": {"latency": {"cdn.jsdelivr.net": 5.0}},  # hedging BCA → open.er-api
+    "dead": {"status": {"www.bi.go.id": 503, "www.marketwatch.com": 403, "newsapi.org": 500,
+                        "cdn.jsdelivr.net": 502}},
+}
+
+
+def fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, profile: str = "clean", seed: int = 7):
+        super().__init__(("127.0.0.1", port), Handler)
+        self.lock = threading.Lock()
+        self.set_profile(profile, seed)
+
+    def set_profile(self, profile: str, seed: int = 7):
+        with self.lock:
+            self.profile = profile
+            self.faults = PROFILES[profile]
+            self.rng = random.Random(seed)
+            self.counts = {}    # host → jumlah request
+            self.served = {}    # status → jumlah
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def fault(self, kind: str, host: str, default=None):
+        table = self.faults.get(kind, {})
+        return table.get(host, table.get("*", default))
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):  # klien (proses child) selesai
+            super().handle_error(request, client_address)
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="standin", daemon=True).start()
+        return self
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.handle_request()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.handle_request()
+
+    def handle_request(self):
+        srv = self.server
+        host, _, rest = self.path.lstrip("/").partition("/")
+        path = "/" + urlsplit(rest).path
+        with srv.lock:
+            n = srv.counts[host] = srv.counts.get(host, 0) + 1
+            flaky = srv.rng.random() < srv.fault("error_rate", host, 0)
+
+        time.sleep(srv.fault("latency", host, 0))
+        route = next((r for r in ROUTES if r[0] == host and re.search(r[1], path)), None)
+        if route is None:
+            return self.reply(404, b"not found", "text/plain")
+        if srv.fault("status", host):
+            return self.reply(srv.fault("status", host), b"injected error", "text/plain")
+        if n <= srv.fault("rate_limit", host, 0):
+            return self.reply(429, b'{"error":{"code":429,"status":"RESOURCE_EXHAUSTED"}}',
+                              "application/json", {"Retry-After": "1"})
+        if flaky:
+            return self.reply(503, b"injected 503", "text/plain")
+
+        body = fixture(route[2])
+        if route[3] == "text/event-stream":
+            return self.stream(body, srv.fault("chunk_delay", host, 0))
+        return self.reply(200, body, route[3])
+
+    def reply(self, status: int, body: bytes, ctype: str, headers: dict = None):
+        with self.server.lock:
+            self.server.served[status] = self.server.served.get(status, 0) + 1
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream(self, body: bytes, delay: float):
+        """Kirim fixture SSE per event dengan chunked transfer encoding."""
+        with self.server.lock:
+            self.server.served[200] = self.server.served.get(200, 0) + 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for event in body.split(b"\r\n\r\n"):
+                if not event.strip():
+                    continue
+                chunk = event + b"\r\n\r\n"
+                self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                self.wfile.flush()
+                time.sleep(delay)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # klien berhenti di </html>
+
+
+def record():
+    """Unduh ulang fixture yang punya URL asli (butuh jaringan)."""
+    import requests
+    for host, _, name, _, url in ROUTES:
+        if not url:
+            continue
+        try:
+            r = requests.get(url, timeout=20, headers={"User-Agent": "Mozilla/5.0 (compatible; USDIDR-Radar/1.0)"})
+            r.raise_for_status()
+            with open(os.path.join(FIXTURES_DIR, name), "wb") as f:
+                f.write(r.content)
+            print(f"✅ {name} ← {url} ({len(r.content)} bytes)")
+        except Exception as e:
+            print(f"⚠️ {name}: {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server pengganti sumber eksternal untuk bench.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="clean")
+    parser.add_argument("--record", action="store_true", help="perbarui fixture dari sumber asli lalu keluar")
+    args = parser.parse_args(argv)
+    if args.record:
+        return record()
+    srv = StandinServer(args.port, args.profile)
+    print(f"🛰  {srv.base_url} (profile {args.profile}) — set HTTP_UPSTREAM={srv.base_url}")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+assets.py
+Tahap publish: pindahkan <style> / <script> inline yang besar ke file
+bersama di docs/assets/ dengan nama content-hashed, lalu minify HTML sisanya.
+
+  docs/assets/radar.<hash>.css / radar.<hash>.js   isi identik → file yang sama
+  docs/_headers                                      Cache-Control immutable untuk /assets/*
+
+Karena nama file berubah jika isinya berubah, asset boleh di-cache browser
+selamanya; report harian hanya membawa markup + data. Catatan: _headers hanya
+dibaca host seperti Netlify / Cloudflare Pages. GitHub Pages (deploy default
+workflow ini) mengabaikannya dan menyajikan semua file dengan max-age=600 —
+di sana manfaatnya hanya dari nama content-hashed (CSS/JS dipakai bersama
+semua report, URL baru begitu isinya berubah), bukan cache 1 tahun. <script> JSON
+(type="application/json") dan marker section <!-- Sx:start --> tidak disentuh.
+
+precompress() menulis sibling .gz (dan .br jika modul brotli ada) untuk
+host statis / mirror yang menyajikan bytes terkompresi. GitHub Pages tidak
+memakainya, jadi run harian tidak membuatnya; sebelum deploy docs/ ke host
+lain jalankan `python scripts/deploy_pages.py --rebuild`. Sibling tidak
+di-commit (.gitignore).
+"""
+import os
+import re
+import gzip
+import hashlib
+import threading
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+DOCS_DIR = "docs"
+ASSETS_DIR = os.path.join(DOCS_DIR, "assets")
+# Hanya berlaku di host yang membaca _headers (Netlify / Cloudflare Pages), bukan GitHub Pages
+HEADERS_PATH = os.path.join(DOCS_DIR, "_headers")
+# Blok inline lebih kecil dari ini tetap inline (tidak sebanding dengan 1 request)
+MIN_EXTERNAL_CHARS = 512
+HEADERS = """/assets/*
+  Cache-Control: public, max-age=31536000, immutable
+"""
+
+STYLE_RE = re.compile(r"<style[^>]*>(.*?)</style>", re.DOTALL | re.IGNORECASE)
+SCRIPT_RE = re.compile(r"<script(\s[^>]*)?>(.*?)</script>", re.DOTALL | re.IGNORECASE)
+COMMENT_RE = re.compile(r"<!--(?!\s*[A-Z0-9]+:(?:start|end)\s*-->).*?-->", re.DOTALL)
+PRE_RE = re.compile(r"(<(pre|textarea)\b.*?</\2>)", re.DOTALL | re.IGNORECASE)
+
+
+def precompress(path: str):
+    """Tulis path.gz (+ path.br jika modul brotli ada). gzip mtime=0 → bytes deterministik."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(raw, compresslevel=9, mtime=0))
+    if BROTLI_AVAILABLE:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(raw, quality=11))
+
+
+def minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};,>])\s*", r"\1", css).replace(";}", "}").strip()
+
+
+def write_asset(kind: str, content: str) -> str:
+    """Tulis docs/assets/radar.<hash>.<kind> jika belum ada. Return nama file."""
+    name = f"radar.{hashlib.sha256(content.encode()).hexdigest()[:12]}.{kind}"
+    path = os.path.join(ASSETS_DIR, name)
+    if not os.path.exists(path):
+        os.makedirs(ASSETS_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp, path)  # aman jika beberapa thread menulis asset yang sama
+    if not os.path.exists(HEADERS_PATH):
+        with open(HEADERS_PATH, "w", encoding="utf-8") as f:
+            f.write(HEADERS)
+    return name
+
+
+def externalize(html: str, root: str = "") -> str:
+    """Ganti <style>/<script> inline besar dengan <link>/<script src> ke docs/assets/. root = prefix relatif ke docs/."""
+    def style(m):
+        css = minify_css(m.group(1))
+        if len(css) < MIN_EXTERNAL_CHARS:
+            return m.group(0)
+        return f'<link rel="stylesheet" href="{root}assets/{write_asset("css", css)}">'
+
+    def script(m):
+        attrs, js = m.group(1) or "", m.group(2)
+        if "src=" in attrs or "type=" in attrs or len(js.strip()) < MIN_EXTERNAL_CHARS:
+            return m.group(0)
+        return f'<script src="{root}assets/{write_asset("js", js.strip())}"></script>'
+
+    return SCRIPT_RE.sub(script, STYLE_RE.sub(style, html))
+
+
+def minify_html(html: str) -> str:
+    """Buang komentar (kecuali marker section), indentasi, dan baris kosong. <pre>/<textarea> utuh."""
+    html = COMMENT_RE.sub("", html)
+    parts = PRE_RE.split(html)
+    out = []
+    for i in range(0, len(parts), 3):  # split: [teks, pre, nama_tag, teks, ...]
+        out.append("\n".join(line.strip() for line in parts[i].splitlines() if line.strip()))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])
+    return "".join(out)
+
+
+def publish(html: str, root: str = "") -> str:
+    return minify_html(externalize(html, root))
@@ -0,0 +1,124 @@
+"""
+backfill.py
+Generate report untuk rentang tanggal lampau dalam satu run.
+
+  python scripts/backfill.py 2026-01-05 2026-01-30 [--workers 4] [--rpm 10] [--force]
+
+  1. Hari non-bisnis dilewati (kalender check_market.CALENDAR).
+  2. Historis semua pair di-fetch SEKALI untuk seluruh rentang (+30 hari
+     lookback) ke rate store; window tiap tanggal dilayani dari store.
+  3. Report digenerate oleh worker pool terbatas; semua panggilan LLM
+     berbagi satu rate limit (--rpm).
+  4. docs/index.html dibangun ulang di akhir.
+
+Sumber yang hanya punya nilai "hari ini" (BCA, JISDOR, DXY, berita) tidak
+bisa di-backfill — diisi PROXY/STALE seperti saat sumber gagal.
+"""
+import os
+import sys
+import argparse
+import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import fetch_data
+import generate_report
+import deploy_pages
+import metrics
+from check_market import CALENDAR
+from rate_store import RateStore
+from pairs import PAIRS, pair_label, report_filename
+
+log = fetch_data.log
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill report Pre-Market Radar untuk rentang tanggal.")
+    parser.add_argument("start", type=datetime.date.fromisoformat, help="tanggal awal (YYYY-MM-DD)")
+    parser.add_argument("end", type=datetime.date.fromisoformat, help="tanggal akhir (YYYY-MM-DD, inklusif)")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("BACKFILL_WORKERS", "4")),
+                        help="jumlah report yang digenerate bersamaan (default 4)")
+    parser.add_argument("--rpm", type=float, default=float(os.environ.get("LLM_RPM") or 10),
+                        help="batas request LLM per menit untuk semua worker (default 10, 0 = tanpa batas)")
+    parser.add_argument("--force", action="store_true", help="generate ulang report yang sudah ada")
+    return parser.parse_args(argv)
+
+
+def business_days(start: datetime.date, end: datetime.date) -> list:
+    days = CALENDAR.business_days(start, end)
+    skipped = (end - start).days + 1 - len(days)
+    log(f"📅 {len(days)} hari kerja, {skipped} hari dilewati ({start}..{end})")
+    return days
+
+
+def backfill_shared() -> dict:
+    """Sumber non-historis: nilai fallback, sama seperti saat sumber gagal."""
+    news = []
+    return {
+        "bca": {},  # diganti estimate_spread per tanggal
+        "jisdor": {"rate": None, "date": None, "label": "PROXY", "note": "backfill — tidak tersedia"},
+        "dxy": {"value": None, "change_pct": None, "label": "STALE", "note": "backfill — tidak tersedia"},
+        "bi_rate": dict(fetch_data.BI_RATE_KNOWN),
+        "news": news,
+        "twitter": fetch_data.build_twitter_proxy(news),
+        "sentiment_dist": fetch_data.compute_sentiment_dist(news),
+    }
+
+
+def market_data_for(day: datetime.date, pair: str, store: RateStore, shared: dict) -> dict:
+    rate_data = fetch_data.rate_summary(
+        store, "LIVE" if len(store) else "STALE", "frankfurter.app",
+        day - datetime.timedelta(days=30), day,
+    )
+    data = fetch_data.build_market_data(pair, rate_data, shared, {}, date=day)
+    data["bca"] = fetch_data.estimate_spread(rate_data["spot"])
+    return data
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.end < args.start:
+        sys.exit("❌ END harus >= START")
+    generate_report.LLM_LIMITER = generate_report.RateLimiter(args.rpm)
+
+    days = business_days(args.start, args.end)
+    if not days:
+        return
+
+    # Satu fetch historis untuk seluruh rentang
+    fetch_data.fetch_frankfurter(PAIRS, days[0] - datetime.timedelta(days=30), days[-1])
+    stores = {p: RateStore(p) for p in PAIRS}
+    shared = backfill_shared()
+
+    tasks = []
+    for day in days:
+        for pair in PAIRS:
+            out = os.path.join(generate_report.DOCS_DIR, report_filename(pair, day.isoformat()))
+            if os.path.exists(out) and not args.force:
+                continue
+            tasks.append((day, pair))
+    log(f"🧵 {len(tasks)} report digenerate dengan {args.workers} worker, limit {args.rpm:g} rpm")
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {
+            pool.submit(generate_report.build_report,
+                        market_data_for(day, pair, stores[pair], shared), False): (day, pair)
+            for day, pair in tasks
+        }
+        for fut in as_completed(futures):
+            day, pair = futures[fut]
+            try:
+                log(f"  ✅ {pair_label(pair)} {day}: {fut.result()}")
+            except Exception as e:
+                failed += 1
+                log(f"  ❌ {pair_label(pair)} {day}: {e}")
+
+    deploy_pages.main([])
+    log(f"🏁 Backfill selesai — {len(tasks) - failed} sukses, {failed} gagal")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    with metrics.run("backfill"):
+        main()
@@ -1,41 +1,18 @@
 """
 check_market.py
-Cek apakah hari ini hari kerja (bukan weekend / libur nasional).
+Cek apakah hari ini hari kerja (bukan weekend / libur nasional Indonesia /
+US Federal holiday — kalender dari market_calendar.py).
 Output ke GitHub Actions environment variable.
 """
 import os
 import sys
 import datetime
 
-# ── Daftar libur nasional Indonesia + US Federal 2026 ──────────────────────
-# Format: "YYYY-MM-DD"
-HOLIDAYS_2026 = {
-    # Indonesia
-    "2026-01-01",  # Tahun Baru
-    "2026-01-27",  # Isra Mikraj
-    "2026-01-29",  # Tahun Baru Imlek
-    "2026-03-20",  # Hari Raya Nyepi
-    "2026-03-26",  # Wafat Isa Almasih
-    "2026-04-02",  # Idul Fitri (cuti bersama)
-    "2026-04-03",  # Idul Fitri
-    "2026-05-01",  # Hari Buruh
-    "2026-05-14",  # Kenaikan Isa Almasih
-    "2026-05-24",  # Hari Raya Waisak
-    "2026-06-01",  # Hari Lahir Pancasila
-    "2026-06-10",  # Idul Adha (estimasi)
-    "2026-07-01",  # Tahun Baru Islam (estimasi)
-    "2026-08-17",  # HUT RI
-    "2026-09-10",  # Maulid Nabi (estimasi)
-    "2026-12-25",  # Natal
-    # US Federal (relevan untuk data USD)
-    "2026-01-19",  # Martin Luther King Jr. Day
-    "2026-02-16",  # Presidents' Day
-    "2026-05-25",  # Memorial Day
-    "2026-07-03",  # Independence Day (observed)
-    "2026-09-07",  # Labor Day
-    "2026-11-26",  # Thanksgiving
-    "2026-12-25",  # Christmas
-}
+import market_calendar
+
+# Libur nasional Indonesia + US Federal, dihitung per tahun (lihat market_calendar.py)
+CALENDAR = market_calendar.calendar("ID", "US")
+HARI = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
 
 
 def set_output(key: str, value: str):
@@ -48,6 +25,28 @@ def set_output(key: str, value: str):
         print(f"OUTPUT: {key}={value}")
 
 
+def market_status(today: datetime.date) -> tuple:
+    """
+    Return (market_open, reason, skip_msg) untuk satu tanggal; skip_msg
+    menyebut hari kerja berikutnya (sudah memperhitungkan libur).
+    """
+    if CALENDAR.is_business_day(today):
+        return True, "", ""
+
+    today_str = today.isoformat()
+    weekday = today.weekday()  # 0=Senin, 6=Minggu
+    if weekday >= 5:
+        reason = f"Weekend ({HARI[weekday]} {today_str})"
+    else:
+        reason = f"Libur: {CALENDAR.holiday_name(today)} ({today_str})"
+    nxt = CALENDAR.next_business_day(today)
+    return False, reason, f"⏭ Pre-Market Radar skip — {reason}. Next run: {HARI[nxt.weekday()]} {nxt}."
+
+
+def is_business_day(day: datetime.date) -> bool:
+    return CALENDAR.is_business_day(day)
+
+
 def main():
     date_override = os.environ.get("DATE_OVERRIDE", "").strip()
     if date_override:
@@ -56,28 +55,15 @@ def main():
         # Waktu Jakarta (UTC+7)
         today = (datetime.datetime.utcnow() + datetime.timedelta(hours=7)).date()
 
-    today_str = today.isoformat()
-    weekday = today.weekday()  # 0=Senin, 6=Minggu
+    print(f"📅 Tanggal: {today.isoformat()} ({today.strftime('%A')})")
 
-    print(f"📅 Tanggal: {today_str} ({today.strftime('%A')})")
-
-    if weekday >= 5:
-        day_name = "Sabtu" if weekday == 5 else "Minggu"
-        reason = f"Weekend ({day_name} {today_str})"
-        next_monday = today + datetime.timedelta(days=(7 - weekday))
-        skip_msg = f"⏭ Pre-Market Radar skip — {reason}. Next run: Senin {next_monday}."
+    market_open, reason, skip_msg = market_status(today)
+    if not market_open:
         print(f"⏭ {reason} — skip")
         set_output("market_open", "false")
         set_output("skip_reason", skip_msg)
         return
 
-    if today_str in HOLIDAYS_2026:
-        reason = f"Libur nasional ({today_str})"
-        print(f"⏭ {reason} — skip")
-        set_output("market_open", "false")
-        set_output("skip_reason", f"⏭ Pre-Market Radar skip — {reason}.")
-        return
-
     print("✅ Hari kerja — lanjutkan generate radar")
     set_output("market_open", "true")
     set_output("skip_reason", "")
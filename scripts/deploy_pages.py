@@ -1,111 +1,356 @@
 """
 deploy_pages.py
-Update docs/index.html dengan daftar semua report yang ada,
-agar GitHub Pages punya halaman navigasi.
+Update halaman navigasi GitHub Pages dari manifest report.
+
+  docs/archive/manifest.jsonl   satu baris per report (append-only, O(1) per report)
+  docs/archive/slices.json      hash input tiap halaman arsip
+  docs/index.html               report terbaru + link arsip (selalu ditulis ulang)
+  docs/archive/page-<n>.html    arsip berhalaman, page-1 = report paling lama
+  docs/archive/<YYYY>.html      ringkasan per tahun (jumlah report per bulan)
+  docs/archive/<YYYY>-<MM>.html daftar report satu bulan
+
+generate_report.save_outputs memanggil register() untuk setiap report baru.
+Halaman ditulis lewat assets.publish (CSS bersama, HTML diminify).
+Sibling .gz/.br (assets.precompress) hanya dibuat oleh --rebuild, untuk
+deploy docs/ ke host yang menyajikannya — GitHub Pages tidak.
+Halaman arsip hanya dirender ulang jika hash isinya berubah, jadi report
+baru biasanya hanya menyentuh halaman terakhir, bulan & tahunnya.
+Halaman dinomori dari report terlama agar batas halaman lama tidak bergeser.
+
+  python scripts/deploy_pages.py [--rebuild]
 """
 import os
+import json
 import glob
+import hashlib
+import argparse
 import datetime
+import threading
 
-DOCS_DIR = "docs"
-os.makedirs(DOCS_DIR, exist_ok=True)
-
+import metrics
+from assets import precompress, publish
+from pairs import PRIMARY_PAIR, REPORT_PREFIX, REPORT_RE, pair_label
 
-def main():
-    # Kumpulkan semua report yang ada
-    reports = sorted(
-        glob.glob(f"{DOCS_DIR}/PreMarket_Radar_USDIDR_*.html"),
-        reverse=True
-    )
+DOCS_DIR = "docs"
+ARCHIVE_DIR = os.path.join(DOCS_DIR, "archive")
+MANIFEST_PATH = os.path.join(ARCHIVE_DIR, "manifest.jsonl")
+SLICES_PATH = os.path.join(ARCHIVE_DIR, "slices.json")
+# Report per halaman arsip & jumlah report terbaru di index
+PAGE_SIZE = int(os.environ.get("ARCHIVE_PAGE_SIZE", "50"))
+INDEX_RECENT = 20
+MONTHS_ID = ["Januari", "Februari", "Maret", "April", "Mei", "Juni", "Juli",
+             "Agustus", "September", "Oktober", "November", "Desember"]
 
-    report_links = ""
-    for r in reports:
-        fname = os.path.basename(r)
-        date_str = fname.replace("PreMarket_Radar_USDIDR_", "").replace(".html", "")
-        try:
-            d = datetime.date.fromisoformat(date_str)
-            label = d.strftime("%A, %d %B %Y")
-        except ValueError:
-            label = date_str
-
-        report_links += f"""
-        <a href="./{fname}" class="report-link">
-          <span class="date">{label}</span>
-          <span class="arrow">→</span>
-        </a>"""
-
-    latest = os.path.basename(reports[0]) if reports else "index.html"
-    now_wib = (datetime.datetime.utcnow() + datetime.timedelta(hours=7)).strftime("%d %b %Y %H:%M WIB")
+_LOCK = threading.Lock()
 
-    index = f"""<!DOCTYPE html>
-<html lang="id">
-<head>
-  <meta charset="UTF-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>USD/IDR Pre-Market Radar</title>
-  <link rel="preconnect" href="https://fonts.googleapis.com">
-  <link href="https://fonts.googleapis.com/css2?family=DM+Mono:wght@400;500&family=Syne:wght@700;800&display=swap" rel="stylesheet">
-  <style>
-    :root {{
+CSS = """
+    :root {
       --bg: #080c10; --surface: #0d1318; --border: #1a2332;
       --accent: #00e5ff; --text: #c8d8e8; --muted: #4a6070;
-    }}
-    * {{ margin:0; padding:0; box-sizing:border-box; }}
-    body {{
+    }
+    * { margin:0; padding:0; box-sizing:border-box; }
+    body {
       background: var(--bg); color: var(--text);
       font-family: 'DM Mono', monospace; min-height: 100vh;
       display: flex; flex-direction: column; align-items: center;
       padding: 40px 20px;
-    }}
-    h1 {{
+    }
+    h1 {
       font-family: 'Syne', sans-serif; font-size: 22px; font-weight: 800;
       letter-spacing: 0.15em; color: #fff; text-transform: uppercase; margin-bottom: 4px;
-    }}
-    h1 span {{ color: var(--accent); }}
-    .subtitle {{ font-size: 10px; color: var(--muted); letter-spacing: 0.2em; margin-bottom: 32px; }}
-    .latest-btn {{
+    }
+    h1 span { color: var(--accent); }
+    .subtitle { font-size: 10px; color: var(--muted); letter-spacing: 0.2em; margin-bottom: 32px; }
+    .latest-btn {
       display: inline-block; padding: 12px 28px;
       background: rgba(0,229,255,0.1); border: 1px solid rgba(0,229,255,0.3);
       color: var(--accent); text-decoration: none; font-size: 12px;
       letter-spacing: 0.1em; border-radius: 3px; margin-bottom: 32px;
       transition: background 0.2s;
-    }}
-    .latest-btn:hover {{ background: rgba(0,229,255,0.2); }}
-    .list-title {{ font-size: 9px; color: var(--muted); letter-spacing: 0.2em;
-      text-transform: uppercase; margin-bottom: 12px; }}
-    .report-link {{
+    }
+    .latest-btn:hover { background: rgba(0,229,255,0.2); }
+    .list-title { font-size: 9px; color: var(--muted); letter-spacing: 0.2em;
+      text-transform: uppercase; margin: 20px 0 12px; }
+    .report-link {
       display: flex; justify-content: space-between; align-items: center;
       padding: 10px 16px; background: var(--surface); border: 1px solid var(--border);
       border-radius: 3px; margin-bottom: 6px; text-decoration: none;
       color: var(--text); font-size: 11px; width: 100%; max-width: 480px;
       transition: border-color 0.2s;
-    }}
-    .report-link:hover {{ border-color: var(--accent); color: var(--accent); }}
-    .arrow {{ color: var(--muted); }}
-    .footer {{
+    }
+    .report-link:hover { border-color: var(--accent); color: var(--accent); }
+    .arrow { color: var(--muted); }
+    .nav { display: flex; flex-wrap: wrap; gap: 6px; max-width: 480px; justify-content: center; }
+    .nav a { font-size: 10px; color: var(--accent); text-decoration: none; padding: 4px 8px;
+      border: 1px solid var(--border); border-radius: 3px; }
+    .nav a:hover { border-color: var(--accent); }
+    .footer {
       margin-top: 32px; font-size: 9px; color: var(--muted);
       letter-spacing: 0.1em; text-align: center;
-    }}
-  </style>
+    }
+"""
+
+
+# ── Manifest ─────────────────────────────────────────────────────────────────
+def entry_for(filename: str):
+    """"PreMarket_Radar_USDIDR_2026-02-26.html" → {"file", "pair", "date"}, None jika bukan report."""
+    m = REPORT_RE.search(filename)
+    if not m:
+        return None
+    return {"file": filename, "pair": m.group(1), "date": m.group(2)}
+
+
+def register(filename: str):
+    """
+    Catat satu report baru di manifest (append satu baris, thread-safe).
+    Manifest belum ada → dibangun dari scan docs/ (report baru sudah ada di
+    sana), agar report lama tidak hilang dari index & arsip.
+    """
+    entry = entry_for(filename)
+    if entry is None:
+        return
+    with _LOCK:
+        if not os.path.exists(MANIFEST_PATH):
+            write_manifest(scan_docs())
+            return
+        with open(MANIFEST_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+def write_manifest(entries: list) -> list:
+    """Tulis ulang manifest (urut sort_key). Pemanggil memegang _LOCK."""
+    entries = sorted(entries, key=sort_key)
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(e) + "\n" for e in entries)
+    return entries
+
+
+def scan_docs() -> list:
+    """Bootstrap manifest dari file report yang ada di docs/."""
+    entries = [entry_for(os.path.basename(p)) for p in glob.glob(f"{DOCS_DIR}/{REPORT_PREFIX}*.html")]
+    return [e for e in entries if e]
+
+
+def load_manifest(rebuild: bool = False) -> dict:
+    """Return {filename: entry}. Manifest dibuat dari scan docs/ jika belum ada atau rebuild."""
+    if rebuild or not os.path.exists(MANIFEST_PATH):
+        with _LOCK:
+            entries = write_manifest(scan_docs())
+        print(f"📒 Manifest dibangun dari docs/ ({len(entries)} report)")
+        return {e["file"]: e for e in entries}
+
+    manifest = {}
+    with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                e = json.loads(line)
+                manifest[e["file"]] = e  # generate ulang (--force) → baris duplikat, ambil terakhir
+    return manifest
+
+
+def sort_key(e: dict) -> tuple:
+    """Urut naik: tanggal, lalu pair lain sebelum USD/IDR (USD/IDR teratas saat dibalik)."""
+    return e["date"], e["pair"] == PRIMARY_PAIR, e["pair"]
+
+
+def precompress_docs() -> int:
+    """Sibling .gz/.br untuk semua HTML/CSS/JS di docs/ (deploy ke host selain GitHub Pages)."""
+    paths = [p for ext in ("html", "css", "js")
+             for p in glob.glob(f"{DOCS_DIR}/**/*.{ext}", recursive=True)]
+    for path in paths:
+        precompress(path)
+    return len(paths)
+
+
+# ── Render ───────────────────────────────────────────────────────────────────
+def write_page(path: str, html: str):
+    """Tulis halaman navigasi (CSS bersama ke docs/assets/)."""
+    root = os.path.relpath(DOCS_DIR, os.path.dirname(path)).replace(os.sep, "/") + "/"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(publish(html, "" if root == "./" else root))
+
+
+def report_label(e: dict) -> str:
+    try:
+        day = datetime.date.fromisoformat(e["date"]).strftime("%A, %d %B %Y")
+    except ValueError:
+        day = e["date"]
+    return f"{pair_label(e['pair'])} · {day}"
+
+
+def report_links(entries: list, root: str) -> str:
+    """Link report, terbaru dulu. root = path relatif ke docs/ ("./" atau "../")."""
+    return "".join(f"""
+  <a href="{root}{e['file']}" class="report-link">
+    <span class="date">{report_label(e)}</span>
+    <span class="arrow">→</span>
+  </a>""" for e in reversed(entries))
+
+
+def nav(links: list) -> str:
+    return '<div class="nav">' + "".join(f'<a href="{href}">{text}</a>' for href, text in links) + "</div>"
+
+
+def page(title: str, subtitle: str, body: str, footer: str = "") -> str:
+    return f"""<!DOCTYPE html>
+<html lang="id">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>{title}</title>
+  <link rel="preconnect" href="https://fonts.googleapis.com">
+  <link href="https://fonts.googleapis.com/css2?family=DM+Mono:wght@400;500&family=Syne:wght@700;800&display=swap" rel="stylesheet">
+  <style>{CSS}  </style>
 </head>
 <body>
   <h1>Pre-Market <span>Intelligence</span> Radar</h1>
-  <div class="subtitle">USD / IDR DASHBOARD · SCHEDULED 08:00 WIB DAILY</div>
+  <div class="subtitle">{subtitle}</div>
+{body}
+  <div class="footer">{footer}</div>
+</body>
+</html>"""
+
+
+def month_name(ym: str) -> str:
+    year, month = ym.split("-")
+    return f"{MONTHS_ID[int(month) - 1]} {year}"
+
+
+def build_slices(entries: list) -> dict:
+    """
+    {path: (hash_input, render)} untuk semua halaman arsip. hash_input
+    memuat semua yang tampil di halaman, render() menghasilkan HTML-nya.
+    """
+    slices = {}
+    n_pages = max(1, -(-len(entries) // PAGE_SIZE))
+    for k in range(1, n_pages + 1):
+        chunk = entries[(k - 1) * PAGE_SIZE:k * PAGE_SIZE]
+        links = [("../index.html", "⌂ index")]
+        if k < n_pages:
+            links.append((f"page-{k + 1}.html", "← lebih baru"))
+        if k > 1:
+            links.append((f"page-{k - 1}.html", "lebih lama →"))
+        subtitle = f"ARSIP · HALAMAN {k} / {n_pages}"   # total halaman ikut hash
+        slices[f"page-{k}.html"] = (
+            [chunk, links, subtitle],
+            lambda chunk=chunk, links=links, k=k, subtitle=subtitle: page(
+                f"Arsip Radar · Halaman {k}", subtitle, nav(links) + report_links(chunk, "../"),
+            ),
+        )
+
+    by_month = {}
+    for e in entries:
+        by_month.setdefault(e["date"][:7], []).append(e)
+    by_year = {}
+    for ym, month_entries in by_month.items():
+        by_year.setdefault(ym[:4], []).append((ym, len(month_entries)))
 
+    for ym, month_entries in by_month.items():
+        links = [("../index.html", "⌂ index"), (f"{ym[:4]}.html", f"↑ {ym[:4]}")]
+        slices[f"{ym}.html"] = (
+            [month_entries, links],
+            lambda month_entries=month_entries, links=links, ym=ym: page(
+                f"Arsip Radar · {month_name(ym)}", f"ARSIP · {month_name(ym).upper()}",
+                nav(links) + report_links(month_entries, "../"),
+            ),
+        )
+    for year, months in by_year.items():
+        links = [("../index.html", "⌂ index")] + [
+            (f"{ym}.html", f"{month_name(ym)} ({count})") for ym, count in sorted(months, reverse=True)
+        ]
+        slices[f"{year}.html"] = (
+            links,
+            lambda links=links, year=year: page(
+                f"Arsip Radar · {year}", f"ARSIP · {year}",
+                '  <div class="list-title">Per bulan</div>\n' + nav(links),
+            ),
+        )
+    return slices
+
+
+def slice_hash(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def write_archive(entries: list, force: bool = False) -> tuple:
+    """Render ulang halaman arsip yang berubah. Return (ditulis, total)."""
+    try:
+        with open(SLICES_PATH, "r", encoding="utf-8") as f:
+            old = json.load(f)
+    except (OSError, ValueError):
+        old = {}
+
+    slices = build_slices(entries)
+    hashes, written = {}, 0
+    for name, (value, render) in slices.items():
+        h = hashes[name] = slice_hash(value)
+        path = os.path.join(ARCHIVE_DIR, name)
+        if not force and old.get(name) == h and os.path.exists(path):
+            continue
+        write_page(path, render())
+        written += 1
+    for name in set(old) - set(slices):  # slice yang hilang (report dihapus)
+        path = os.path.join(ARCHIVE_DIR, name)
+        for p in (path, path + ".gz", path + ".br"):
+            if os.path.exists(p):
+                os.remove(p)
+
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    with open(SLICES_PATH, "w", encoding="utf-8") as f:
+        json.dump(hashes, f, indent=1, sort_keys=True)
+    return written, len(slices)
+
+
+def write_index(entries: list):
+    primary = [e for e in entries if e["pair"] == PRIMARY_PAIR]
+    latest = primary[-1]["file"] if primary else "index.html"
+    now_wib = (datetime.datetime.utcnow() + datetime.timedelta(hours=7)).strftime("%d %b %Y %H:%M WIB")
+    n_pages = max(1, -(-len(entries) // PAGE_SIZE))
+    years = sorted({e["date"][:4] for e in entries}, reverse=True)
+
+    body = f"""
   <a href="./{latest}" class="latest-btn">▶ BUKA REPORT TERBARU</a>
 
-  <div class="list-title">Semua Report ({len(reports)} tersedia)</div>
-  {report_links}
+  <div class="list-title">Report Terbaru ({len(entries)} tersedia)</div>
+  {report_links(entries[-INDEX_RECENT:], "./")}
 
-  <div class="footer">Last updated: {now_wib} · Powered by GLM-4.7 · GitHub Actions</div>
-</body>
-</html>"""
+  <div class="list-title">Arsip per tahun</div>
+  {nav([(f"archive/{y}.html", y) for y in years])}
+
+  <div class="list-title">Semua report · {n_pages} halaman</div>
+  {nav([(f"archive/page-{k}.html", str(k)) for k in range(n_pages, 0, -1)])}
+"""
+    index = page(
+        "USD/IDR Pre-Market Radar", "USD / IDR DASHBOARD · SCHEDULED 08:00 WIB DAILY", body,
+        f"Last updated: {now_wib} · Powered by GLM-4.7 · GitHub Actions",
+    )
+    write_page(f"{DOCS_DIR}/index.html", index)
 
-    with open(f"{DOCS_DIR}/index.html", "w", encoding="utf-8") as f:
-        f.write(index)
 
-    print(f"✅ docs/index.html diupdate ({len(reports)} reports terdaftar)")
+@metrics.timed("deploy_pages")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update index & arsip GitHub Pages.")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="bangun ulang manifest dari docs/, render ulang semua halaman "
+                             "arsip dan tulis sibling .gz/.br untuk semua file docs/")
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest(rebuild=args.rebuild)
+    entries = sorted(
+        (e for e in manifest.values() if os.path.exists(os.path.join(DOCS_DIR, e["file"]))),
+        key=sort_key,
+    )
+    written, total = write_archive(entries, force=args.rebuild)
+    write_index(entries)
+    print(f"✅ docs/index.html diupdate ({len(entries)} reports terdaftar, "
+          f"{written}/{total} halaman arsip dirender ulang)")
+    if args.rebuild:
+        print(f"🗜 {precompress_docs()} file docs/ dikompres (.gz/.br)")
 
 
 if __name__ == "__main__":
-    main()
+    with metrics.run("deploy_pages"):
+        main()
@@ -11,17 +11,29 @@ Ambil semua data real untuk dashboard USD/IDR:
   H. Sentimen Twitter (proxy dari berita)
   I. Volatility proxy (ATR 14D)
 
-Output: data/market_data.json
+Output: data/market_data.json (USD/IDR) + data/market_data_<PAIR>.json
+untuk pair tambahan di RADAR_PAIRS (lihat pairs.py).
 """
 import os
 import json
 import datetime
-import statistics
 import time
 import re
+import queue
+import itertools
+import threading
 
-import requests
 from bs4 import BeautifulSoup
+
+import html_extract
+import http_client
+import indicators
+import metrics
+import news_classifier
+import news_ingest
+import source_health
+from rate_store import RateStore
+from pairs import PAIRS, PRIMARY_PAIR, pair_parts, pair_label, data_path, cross_rate
 try:
     from tavily import TavilyClient
     TAVILY_AVAILABLE = True
@@ -40,7 +52,34 @@ TODAY = (
 )
 DATE_30D_AGO = TODAY - datetime.timedelta(days=30)
 HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; USDIDR-Radar/1.0)"}
-OUTPUT_PATH = "data/market_data.json"
+# Deadline global (detik) untuk semua sumber yang di-fetch paralel
+FETCH_DEADLINE = float(os.environ.get("FETCH_DEADLINE", "60"))
+# Rantai fallback BCA/DXY: luncurkan fallback berikutnya setelah HEDGE_DELAY_S
+# detik tanpa menunggu yang lebih prioritas selesai (FETCH_HEDGE=0 → berurutan)
+FETCH_HEDGE = os.environ.get("FETCH_HEDGE", "1") != "0"
+HEDGE_DELAY = float(os.environ.get("HEDGE_DELAY_S", "1.0"))
+# Setelah jawaban valid pertama, kandidat prioritas lebih tinggi yang masih
+# jalan ditunggu maksimal sekian detik lagi (bukan sampai FETCH_DEADLINE)
+HEDGE_GRACE = float(os.environ.get("FETCH_HEDGE_GRACE", "1.5"))
+# Riwayat kurs untuk range 52W / multi-tahun: di-fetch sekali ke rate store,
+# run berikutnya hanya menambah tanggal baru. "all" = seluruh isi store.
+RANGE_HISTORY_YEARS = float(os.environ.get("RANGE_HISTORY_YEARS", "5"))
+RANGE_WINDOWS = (("52w", 364), ("all", None))
+# Mode ingest berita: semua halaman NewsAPI + Tavily + scraping → dedup → top-N
+NEWS_INGEST = os.environ.get("NEWS_INGEST", "0") == "1"
+NEWS_MAX_PAGES = int(os.environ.get("NEWS_MAX_PAGES", "5"))
+NEWS_PAGE_SIZE = 100
+TAVILY_NEWS_QUERIES = [
+    "rupiah dollar hari ini kurs IDR",
+    "Bank Indonesia rupiah berita terkini",
+    "Indonesian rupiah exchange rate",
+    "cadangan devisa BI rate rupiah",
+]
+NEWSAPI_QUERIES = [
+    ("Indonesian rupiah dollar exchange rate", "en"),
+    ("Bank Indonesia interest rate rupiah", "en"),
+    ("IDR USD currency Indonesia", "en"),
+]
 
 os.makedirs("data", exist_ok=True)
 
@@ -50,144 +89,316 @@ def log(msg):
 
 
 # ── A + D: Spot & Historical (Frankfurter — gratis, no key) ─────────────────
-def fetch_frankfurter():
-    log("A+D: Fetching Frankfurter historical + spot...")
-    url = f"https://api.frankfurter.app/{DATE_30D_AGO}..{TODAY}?from=USD&to=IDR"
-    try:
-        r = requests.get(url, timeout=10)
-        r.raise_for_status()
-        data = r.json()
-        rates = {date: v["IDR"] for date, v in data["rates"].items()}
-        sorted_dates = sorted(rates.keys())
-        prices = [rates[d] for d in sorted_dates]
-        spot = prices[-1] if prices else None
-        prev = prices[-2] if len(prices) >= 2 else spot
-        change_pct = round((spot - prev) / prev * 100, 3) if prev else 0
-
-        log(f"  ✅ Spot: {spot} | Dates: {len(sorted_dates)} hari")
-        return {
-            "spot": spot,
-            "change_pct": change_pct,
-            "dates": sorted_dates,
-            "prices": prices,
-            "source": "frankfurter.app",
-            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
-            "label": "LIVE"
+def _fetch_start(store: RateStore, start: datetime.date, end: datetime.date) -> datetime.date:
+    """Hari fixing pertama yang belum ada di store untuk window start..end."""
+    return store.first_gap(start, end) or start
+
+
+def range_summary(store: RateStore, end: datetime.date, label: str) -> dict:
+    """
+    Per window RANGE_WINDOWS yang berakhir di `end`: high/low (+ tanggal),
+    persentil close terakhir dan jarak ke high/low. O(log² n) per window
+    lewat store.range_index(). Window yang belum tercakup store dilabel PROXY;
+    window tanpa record sama sekali (store berhenti jauh sebelum `end`) dilewati.
+    """
+    _, hi = store.span(datetime.date.min, end)
+    if not hi:
+        return {}
+    idx, spot = store.range_index(), store.prices[hi - 1]
+    out = {}
+    for name, days in RANGE_WINDOWS:
+        start = end - datetime.timedelta(days=days) if days else store.first_date()
+        lo, _ = store.span(start, end)
+        if hi <= lo:
+            continue
+        i_low, i_high = idx.argmin(lo, hi), idx.argmax(lo, hi)
+        low, high = store.prices[i_low], store.prices[i_high]
+        out[name] = {
+            "from": datetime.date.fromordinal(store.ordinals[lo]).isoformat(),
+            "points": hi - lo,
+            "low": low,
+            "low_date": datetime.date.fromordinal(store.ordinals[i_low]).isoformat(),
+            "high": high,
+            "high_date": datetime.date.fromordinal(store.ordinals[i_high]).isoformat(),
+            "percentile": round(idx.rank(lo, hi, spot) / (hi - lo) * 100, 1),
+            "from_high_pct": round((spot - high) / high * 100, 2),
+            "from_low_pct": round((spot - low) / low * 100, 2),
+            "label": label if store.covers_start(start) else "PROXY",
         }
-    except Exception as e:
-        log(f"  ❌ Frankfurter error: {e}")
-        return {"spot": None, "prices": [], "dates": [], "label": "STALE", "error": str(e)}
+    return out
 
 
-# ── B: BCA E-Rate (Tavily extract → fallback proxy) ──────────────────────────
-def fetch_bca_rate():
-    log("B: Fetching BCA E-Rate...")
+def rate_summary(store: RateStore, label: str, source: str,
+                 start: datetime.date = DATE_30D_AGO, end: datetime.date = TODAY) -> dict:
+    """Spot, perubahan, window harga start..end dan range panjang dari store."""
+    sorted_dates, prices = store.window(start, end)
+    spot = prices[-1] if prices else None
+    prev = prices[-2] if len(prices) >= 2 else spot
+    change_pct = round((spot - prev) / prev * 100, 3) if prev else 0
+    return {
+        "spot": spot,
+        "change_pct": change_pct,
+        "dates": sorted_dates,
+        "prices": prices,
+        "source": source,
+        "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+        "label": label,
+        "ranges": range_summary(store, end, label),
+    }
 
-    # Opsi 1: Tavily — extract langsung dari bca.co.id (handle JS rendering)
-    if TAVILY_API_KEY and TAVILY_AVAILABLE:
+
+def _frankfurter_into(stores: dict, pairs: list, start: datetime.date, end: datetime.date) -> dict:
+    """
+    Satu request multi-symbol start..end, di-merge ke store tiap pair (range
+    ditandai sudah di-fetch, lihat RateStore.mark_fetched). Return {pair: tanggal baru}.
+    """
+    symbols = sorted({c for p in pairs for c in pair_parts(p) if c != "USD"})
+    url = f"https://api.frankfurter.app/{start}..{end}?from=USD&to={','.join(symbols)}"
+    r = http_client.get(url, timeout=10)
+    r.raise_for_status()
+    rates = r.json()["rates"]
+    added = {}
+    for p in pairs:
+        base, quote = pair_parts(p)
+        added[p] = stores[p].merge({date: cross_rate(v, base, quote) for date, v in rates.items()})
+        stores[p].mark_fetched(start, end)
+    return added
+
+
+@metrics.timed()
+def fetch_frankfurter(pairs: list = None, start: datetime.date = None, end: datetime.date = None) -> dict:
+    """
+    Fetch semua pair sekaligus dengan SATU request multi-symbol
+    (from=USD&to=IDR,SGD,...); kurs silang dihitung lokal.
+    Default window DATE_30D_AGO..TODAY. Return {pair: rate_data}.
+    """
+    pairs = pairs or PAIRS
+    start = start or DATE_30D_AGO
+    end = end or TODAY
+    log(f"A+D: Fetching Frankfurter historical + spot ({', '.join(pairs)})...")
+    stores = {p: RateStore(p) for p in pairs}
+    sources = {p: ("LIVE", "frankfurter.app") for p in pairs}
+    errors = {}
+
+    # Hanya fetch tanggal yang belum ada di store lokal
+    missing = [p for p in pairs if not stores[p].covers(start, end)]
+    if missing:
+        fetch_start = min(_fetch_start(stores[p], start, end) for p in missing)
         try:
-            from tavily import TavilyClient
-            client = TavilyClient(api_key=TAVILY_API_KEY)
-            resp = client.extract(urls=["https://www.bca.co.id/id/informasi/kurs"])
-            raw = ""
-            for r in resp.get("results", []):
-                raw += r.get("raw_content", "")
-
-            # Parse angka IDR dari konten — cari pola USD + angka 5 digit
-            lines = raw.splitlines()
-            for line in lines:
-                if "USD" in line.upper() or "Dollar" in line:
-                    nums = re.findall(r"1[0-9][.,]\d{3}(?:[.,]\d{1,2})?", line)
-                    nums_clean = []
-                    for n in nums:
-                        try:
-                            nums_clean.append(float(n.replace(".", "").replace(",", ".")))
-                        except:
-                            pass
-                    nums_valid = [n for n in nums_clean if 10000 < n < 25000]
-                    if len(nums_valid) >= 2:
-                        buy, sell = sorted(nums_valid[:2])
-                        mid = round((buy + sell) / 2, 0)
-                        log(f"  ✅ BCA via Tavily: Buy={buy} Sell={sell}")
-                        return {
-                            "buy": buy, "sell": sell, "mid": mid,
-                            "source": "bca.co.id via Tavily",
-                            "timestamp": datetime.datetime.now(
-                                datetime.timezone(datetime.timedelta(hours=7))
-                            ).strftime("%H:%M WIB"),
-                            "label": "LIVE"
-                        }
-            log("  ⚠️ Tavily extract BCA: angka tidak ditemukan di konten")
+            for p, added in _frankfurter_into(stores, missing, fetch_start, end).items():
+                log(f"  ✅ Frankfurter {pair_label(p)} {fetch_start}..{end}: {added} tanggal baru di store")
+            metrics.branch("frankfurter")
         except Exception as e:
-            log(f"  ⚠️ Tavily BCA error: {e}")
+            log(f"  ❌ Frankfurter error: {e}")
+            metrics.branch("rate_store")
+            for p in missing:
+                sources[p] = ("STALE", "rate store (lokal)")
+                if not len(stores[p]):
+                    errors[p] = str(e)
+    else:
+        log(f"  ℹ️ Store lokal sudah mencakup {start}..{end} — skip fetch")
+        metrics.branch("rate_store")
 
-    # Opsi 2: fawazahmed0 currency API (no key, gratis)
-    try:
-        r = requests.get(
-            "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/usd.json",
-            timeout=10
-        )
-        r.raise_for_status()
-        mid = r.json()["usd"]["idr"]
-        spread = round(mid * 0.003, 0)
-        log(f"  ✅ BCA proxy fawazahmed0: mid={mid}")
-        return {
-            "buy": round(mid - spread, 0), "sell": round(mid + spread, 0),
-            "mid": round(mid, 2),
-            "source": "fawazahmed0 (BCA spread est. ±0.3%)",
-            "timestamp": datetime.datetime.now(
-                datetime.timezone(datetime.timedelta(hours=7))
-            ).strftime("%H:%M WIB"),
-            "label": "PROXY"
-        }
-    except Exception as e:
-        log(f"  ⚠️ fawazahmed0 error: {e}")
+    # Riwayat range 52W / multi-tahun: hanya bagian sebelum record pertama store
+    history_start = end - datetime.timedelta(days=round(RANGE_HISTORY_YEARS * 365.25))
+    older = [p for p in pairs if len(stores[p]) and not stores[p].covers_start(history_start)]
+    if older:
+        first = min(stores[p].first_date() for p in older) - datetime.timedelta(days=1)
+        try:
+            for p, added in _frankfurter_into(stores, older, history_start, first).items():
+                log(f"  ✅ Riwayat {pair_label(p)} {history_start}..{first}: {added} tanggal baru di store")
+        except Exception as e:
+            log(f"  ⚠️ Riwayat Frankfurter gagal ({e}) — range 52W dari data yang ada")
 
-    # Opsi 3: open.er-api
-    try:
-        r = requests.get("https://open.er-api.com/v6/latest/USD", timeout=10)
+    result = {}
+    for p in pairs:
+        if p in errors:
+            result[p] = {"spot": None, "prices": [], "dates": [], "label": "STALE", "error": errors[p]}
+            continue
+        result[p] = rate_summary(stores[p], *sources[p], start, end)
+        log(f"  ✅ {pair_label(p)} Spot: {result[p]['spot']} | Dates: {len(result[p]['dates'])} hari")
+    return result
+
+
+# ── Hedged fallback chain ─────────────────────────────────────────────────────
+def hedge(label: str, chain: list, budget: float = FETCH_DEADLINE) -> tuple:
+    """
+    Jalankan rantai fallback [(nama, fn), ...] (urut prioritas) secara hedged:
+    selama belum ada jawaban valid, kandidat berikutnya diluncurkan
+    HEDGE_DELAY detik setelah yang sebelumnya, atau langsung jika semua yang
+    sudah jalan gagal. fn return dict valid, atau None / raise jika tidak ada data.
+
+    Pemenang = kandidat valid dengan prioritas tertinggi yang ada saat
+    berhenti: begitu jawaban valid pertama tiba, kandidat di atasnya yang
+    masih jalan ditunggu maksimal HEDGE_GRACE detik lagi (dalam `budget`),
+    lalu jawaban terbaik yang sudah ada dipakai. Begitu ada jawaban valid
+    tidak ada kandidat baru yang diluncurkan. Request yang sedang jalan
+    tidak bisa dihentikan: ia selesai di thread daemon dalam batas timeout
+    per sumber (source_health.timeout_for, health tetap tercatat), hasilnya
+    diabaikan.
+    FETCH_HEDGE=0 → berurutan seperti dulu (kandidat berikutnya hanya jika gagal).
+
+    Return (nama, hasil) atau (None, None).
+    """
+    done = queue.Queue()
+    names = [name for name, _ in chain]
+
+    def worker(name, fn):
+        result = None
+        try:
+            with metrics.stage(f"{label}.{name}"):
+                result = fn()
+        except source_health.SourceSkipped as e:
+            log(f"  ⏭ {e}")
+        except Exception as e:
+            log(f"  ⚠️ {name} error: {e}")
+        done.put((name, result))
+
+    start = time.perf_counter()
+    deadline = start + budget
+    launched, results = 0, {}
+    next_at, stop_at = start, deadline     # stop_at maju ke grace setelah jawaban valid pertama
+    while True:
+        now = time.perf_counter()
+        settled = all(n in results for n in names[:launched])
+        searching = launched < len(chain) and not any(results.values())
+        if searching and (settled or now >= next_at):
+            name, fn = chain[launched]
+            threading.Thread(target=worker, args=(name, fn), name=f"{label}-{name}", daemon=True).start()
+            launched += 1
+            next_at = now + HEDGE_DELAY if FETCH_HEDGE else float("inf")
+            continue
+
+        best = next((n for n in names if results.get(n)), None)
+        if best is not None and all(n in results for n in names[:names.index(best)]):
+            break
+        if len(results) == len(chain) or now >= stop_at:
+            break
+        wake = min(stop_at, next_at) if searching else stop_at
+        try:
+            name, result = done.get(timeout=max(0.0, wake - now))
+        except queue.Empty:
+            continue
+        results[name] = result
+        if result and sum(1 for r in results.values() if r) == 1:
+            stop_at = min(deadline, time.perf_counter() + HEDGE_GRACE)
+
+    best = next((n for n in names if results.get(n)), None)
+    pending = [n for n in names[:launched] if n not in results]
+    if best and pending:
+        log(f"  ✂️ {label}: {best} menang setelah {time.perf_counter() - start:.1f}s — "
+            f"tidak ditunggu: {', '.join(pending)}")
+    return (best, results[best]) if best else (None, None)
+
+
+def wib_now() -> str:
+    return datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=7))).strftime("%H:%M WIB")
+
+
+# ── B: BCA E-Rate (Tavily extract → fallback proxy) ──────────────────────────
+def bca_tavily():
+    """Tavily — extract langsung dari bca.co.id (handle JS rendering)."""
+    with source_health.track("tavily_bca") as t:
+        client = TavilyClient(api_key=TAVILY_API_KEY)
+        resp = client.extract(urls=["https://www.bca.co.id/id/informasi/kurs"])
+        raw = ""
+        for r in resp.get("results", []):
+            raw += r.get("raw_content", "")
+
+        # Parse angka IDR dari konten — cari pola USD + angka 5 digit
+        for line in raw.splitlines():
+            if "USD" in line.upper() or "Dollar" in line:
+                nums = re.findall(r"1[0-9][.,]\d{3}(?:[.,]\d{1,2})?", line)
+                nums_clean = []
+                for n in nums:
+                    try:
+                        nums_clean.append(float(n.replace(".", "").replace(",", ".")))
+                    except ValueError:
+                        pass
+                nums_valid = [n for n in nums_clean if 10000 < n < 25000]
+                if len(nums_valid) >= 2:
+                    buy, sell = sorted(nums_valid[:2])
+                    mid = round((buy + sell) / 2, 0)
+                    log(f"  ✅ BCA via Tavily: Buy={buy} Sell={sell}")
+                    t.ok()
+                    return {
+                        "buy": buy, "sell": sell, "mid": mid,
+                        "source": "bca.co.id via Tavily",
+                        "timestamp": wib_now(),
+                        "label": "LIVE"
+                    }
+        log("  ⚠️ Tavily extract BCA: angka tidak ditemukan di konten")
+
+
+def bca_proxy(name: str, url: str, parse, source: str):
+    """Mid-rate USD/IDR dari API gratis + estimasi spread BCA ±0.3%."""
+    with source_health.track(name) as t:
+        r = http_client.get(url, timeout=source_health.timeout_for(name, 10))
         r.raise_for_status()
-        mid = r.json()["rates"]["IDR"]
+        mid = parse(r.json())
         spread = round(mid * 0.003, 0)
-        log(f"  ✅ BCA proxy open.er-api: mid={mid}")
+        log(f"  ✅ BCA proxy {name}: mid={mid}")
+        t.ok()
         return {
             "buy": round(mid - spread, 0), "sell": round(mid + spread, 0),
             "mid": round(mid, 2),
-            "source": "open.er-api (BCA spread est. ±0.3%)",
-            "timestamp": datetime.datetime.now(
-                datetime.timezone(datetime.timedelta(hours=7))
-            ).strftime("%H:%M WIB"),
+            "source": f"{source} (BCA spread est. ±0.3%)",
+            "timestamp": wib_now(),
             "label": "PROXY"
         }
-    except Exception as e:
-        log(f"  ⚠️ open.er-api error: {e}")
-        return {"buy": None, "sell": None, "mid": None, "label": "PROXY", "error": str(e)}
+
+
+@metrics.timed()
+def fetch_bca_rate():
+    log("B: Fetching BCA E-Rate...")
+    chain = []
+    if TAVILY_API_KEY and TAVILY_AVAILABLE:
+        chain.append(("tavily", bca_tavily))
+    chain += [
+        ("fawazahmed0", lambda: bca_proxy(
+            "fawazahmed0",
+            "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/usd.json",
+            lambda d: d["usd"]["idr"], "fawazahmed0")),
+        ("open_er_api", lambda: bca_proxy(
+            "open_er_api", "https://open.er-api.com/v6/latest/USD",
+            lambda d: d["rates"]["IDR"], "open.er-api")),
+    ]
+    name, result = hedge("bca", chain)
+    if result is None:
+        metrics.branch("none")
+        return {"buy": None, "sell": None, "mid": None, "label": "PROXY", "error": "semua sumber gagal"}
+    metrics.branch(name)
+    return result
 
 
 # ── C: BI JISDOR (via BI webservice JSON) ────────────────────────────────────
+@metrics.timed()
 def fetch_jisdor():
     log("C: Fetching BI JISDOR...")
 
     # Opsi 1: BI webservice API
     try:
-        today_str = TODAY.strftime("%Y%m%d")
-        url = f"https://www.bi.go.id/biwebservice/wskursbi.asmx/getSubKursLokal2?startdate={today_str}&enddate={today_str}"
-        r = requests.get(url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(r.text, "xml")
-        items = soup.find_all("Table")
-        for item in items:
-            kode = item.find("kode_kurs")
-            rate_el = item.find("kurs_tengah") or item.find("kurs_jual")
-            if kode and "USD" in kode.get_text() and rate_el:
-                rate = float(rate_el.get_text().replace(",", "").replace(".", ""))
-                if rate > 10000:
-                    log(f"  ✅ JISDOR webservice: {rate}")
-                    return {
-                        "rate": int(rate),
-                        "date": TODAY.strftime("%d/%m/%Y"),
-                        "source": "bi.go.id/biwebservice",
-                        "label": "LIVE"
-                    }
+        with source_health.track("bi_webservice") as t:
+            today_str = TODAY.strftime("%Y%m%d")
+            url = f"https://www.bi.go.id/biwebservice/wskursbi.asmx/getSubKursLokal2?startdate={today_str}&enddate={today_str}"
+            r = http_client.get(url, headers=HEADERS, timeout=source_health.timeout_for("bi_webservice", 15))
+            soup = BeautifulSoup(r.text, "xml")
+            items = soup.find_all("Table")
+            for item in items:
+                kode = item.find("kode_kurs")
+                rate_el = item.find("kurs_tengah") or item.find("kurs_jual")
+                if kode and "USD" in kode.get_text() and rate_el:
+                    rate = float(rate_el.get_text().replace(",", "").replace(".", ""))
+                    if rate > 10000:
+                        log(f"  ✅ JISDOR webservice: {rate}")
+                        t.ok()
+                        metrics.branch("bi_webservice")
+                        return {
+                            "rate": int(rate),
+                            "date": TODAY.strftime("%d/%m/%Y"),
+                            "source": "bi.go.id/biwebservice",
+                            "label": "LIVE"
+                        }
     except Exception as e:
         log(f"  ⚠️ BI webservice error: {e}")
 
@@ -195,87 +406,108 @@ def fetch_jisdor():
     # Opsi 2: Tavily search untuk JISDOR
     if TAVILY_API_KEY and TAVILY_AVAILABLE:
         try:
-            client = TavilyClient(api_key=TAVILY_API_KEY)
-            resp = client.search(
-                query=f"JISDOR Bank Indonesia kurs USD IDR {TODAY.strftime('%d %B %Y')}",
-                search_depth="basic",
-                max_results=3
-            )
-            for r in resp.get("results", []):
-                text = r.get("content", "") + r.get("title", "")
-                match = re.search(r"1[5-9][.,]\d{3}", text)
-                if match:
-                    rate_str = match.group(0).replace(".", "").replace(",", "")
-                    rate = int(rate_str)
-                    if 15000 < rate < 20000:
-                        log(f"  ✅ JISDOR via Tavily: {rate}")
-                        return {
-                            "rate": rate,
-                            "date": TODAY.strftime("%d/%m/%Y"),
-                            "source": "Tavily/BI",
-                            "label": "PROXY"
-                        }
+            with source_health.track("tavily_jisdor") as t:
+                client = TavilyClient(api_key=TAVILY_API_KEY)
+                resp = client.search(
+                    query=f"JISDOR Bank Indonesia kurs USD IDR {TODAY.strftime('%d %B %Y')}",
+                    search_depth="basic",
+                    max_results=3
+                )
+                for r in resp.get("results", []):
+                    text = r.get("content", "") + r.get("title", "")
+                    match = re.search(r"1[5-9][.,]\d{3}", text)
+                    if match:
+                        rate_str = match.group(0).replace(".", "").replace(",", "")
+                        rate = int(rate_str)
+                        if 15000 < rate < 20000:
+                            log(f"  ✅ JISDOR via Tavily: {rate}")
+                            t.ok()
+                            metrics.branch("tavily")
+                            return {
+                                "rate": rate,
+                                "date": TODAY.strftime("%d/%m/%Y"),
+                                "source": "Tavily/BI",
+                                "label": "PROXY"
+                            }
         except Exception as e:
             log(f"  ⚠️ Tavily JISDOR error: {e}")
 
     log("  ℹ️ JISDOR: menggunakan spot rate sebagai proxy")
+    metrics.branch("proxy")
     return {"rate": None, "date": None, "label": "PROXY", "note": "BI site JS-rendered"}
 
 
 # ── E: DXY via yfinance ───────────────────────────────────────────────────────
-def fetch_dxy():
-    log("E: Fetching DXY...")
-    try:
+def dxy_yfinance():
+    with source_health.track("yfinance") as t:
         import yfinance as yf
-        dxy = yf.Ticker("DX-Y.NYB")
-        hist = dxy.history(period="5d")
+        hist = yf.Ticker("DX-Y.NYB").history(period="5d")
         if not hist.empty:
             latest = hist["Close"].iloc[-1]
             prev = hist["Close"].iloc[-2] if len(hist) >= 2 else latest
             change = round((latest - prev) / prev * 100, 3)
             log(f"  ✅ DXY: {round(latest, 2)} ({change:+}%)")
+            t.ok()
             return {
                 "value": round(latest, 2),
                 "change_pct": change,
                 "source": "Yahoo Finance",
                 "label": "LIVE"
             }
-    except Exception as e:
-        log(f"  ⚠️ DXY yfinance error: {e}")
 
-    # Fallback: scraping via marketwatch
-    try:
-        r = requests.get("https://www.marketwatch.com/investing/index/dxy", headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(r.text, "html.parser")
-        val_el = soup.find("bg-quote", {"field": "Last"}) or soup.find("span", {"class": re.compile("value")})
-        if val_el:
-            val = float(val_el.get_text(strip=True).replace(",", ""))
+
+def dxy_marketwatch():
+    """Fallback: scraping via marketwatch."""
+    with source_health.track("marketwatch") as t:
+        r = http_client.get("https://www.marketwatch.com/investing/index/dxy", headers=HEADERS,
+                            timeout=source_health.timeout_for("marketwatch", 10))
+        val_el = None
+        for el in html_extract.iter_tags(r.content, ("bg-quote", "span"), html_extract.charset(r)):
+            if el.tag == "bg-quote" and el.get("field") == "Last":
+                val_el = el
+                break       # harga utama ketemu — sisa halaman tidak di-parse
+            if val_el is None and el.tag == "span" and "value" in el.get("class", ""):
+                val_el = el
+        if val_el is not None:
+            val = float(html_extract.text(val_el).replace(",", ""))
             log(f"  ✅ DXY (MarketWatch): {val}")
+            t.ok()
             return {"value": val, "change_pct": None, "source": "MarketWatch", "label": "PROXY"}
-    except Exception as e2:
-        log(f"  ⚠️ DXY fallback error: {e2}")
 
-    return {"value": None, "change_pct": None, "label": "STALE"}
+
+@metrics.timed()
+def fetch_dxy():
+    log("E: Fetching DXY...")
+    name, result = hedge("dxy", [("yfinance", dxy_yfinance), ("marketwatch", dxy_marketwatch)])
+    if result is None:
+        metrics.branch("none")
+        return {"value": None, "change_pct": None, "label": "STALE"}
+    metrics.branch(name)
+    return result
 
 
 # ── F: BI Rate ────────────────────────────────────────────────────────────────
+@metrics.timed()
 def fetch_bi_rate():
     log("F: Fetching BI Rate...")
     # BI Rate jarang berubah — cek dari berita terbaru
     try:
         if NEWS_API_KEY:
-            r = requests.get(
-                "https://newsapi.org/v2/everything",
-                params={
-                    "q": "BI rate Bank Indonesia suku bunga",
-                    "language": "id",
-                    "sortBy": "publishedAt",
-                    "pageSize": 3,
-                    "apiKey": NEWS_API_KEY
-                },
-                timeout=10
-            )
-            articles = r.json().get("articles", [])
+            with source_health.track("newsapi") as t:
+                r = http_client.get(
+                    "https://newsapi.org/v2/everything",
+                    params={
+                        "q": "BI rate Bank Indonesia suku bunga",
+                        "language": "id",
+                        "sortBy": "publishedAt",
+                        "pageSize": 3,
+                        "apiKey": NEWS_API_KEY
+                    },
+                    timeout=source_health.timeout_for("newsapi", 10)
+                )
+                r.raise_for_status()
+                articles = r.json().get("articles", [])
+                t.ok()
             for a in articles:
                 text = a.get("title", "") + " " + a.get("description", "")
                 match = re.search(r"(\d+[.,]\d+)\s*%", text)
@@ -283,85 +515,89 @@ def fetch_bi_rate():
                     rate = float(match.group(1).replace(",", "."))
                     if 2.0 <= rate <= 10.0:
                         log(f"  ✅ BI Rate dari berita: {rate}%")
+                        metrics.branch("newsapi")
                         return {"rate": rate, "source": "NewsAPI", "label": "LIVE"}
     except Exception as e:
         log(f"  ⚠️ BI Rate news error: {e}")
 
     # Known value fallback (update manual jika berubah)
     log("  ℹ️ BI Rate: menggunakan nilai terakhir diketahui (4.75%)")
-    return {"rate": 4.75, "decision": "Hold", "source": "Known value", "label": "STALE"}
+    metrics.branch("known_value")
+    return dict(BI_RATE_KNOWN)
+
+
+BI_RATE_KNOWN = {"rate": 4.75, "decision": "Hold", "source": "Known value", "label": "STALE"}
 
 
 # ── G: Berita Terkini (Tavily → NewsAPI → Scraping fallback) ─────────────────
+@metrics.timed()
 def fetch_news():
     log("G: Fetching berita terkini...")
+    if NEWS_INGEST:
+        return fetch_news_ingest()
 
     # Opsi 1: Tavily API (best quality, real-time)
     if TAVILY_API_KEY and TAVILY_AVAILABLE:
         try:
-            client = TavilyClient(api_key=TAVILY_API_KEY)
-            results = []
-            queries = [
-                "rupiah dollar hari ini kurs IDR",
-                "Bank Indonesia rupiah berita terkini"
-            ]
-            seen = set()
-            for q in queries:
-                resp = client.search(
-                    query=q,
-                    search_depth="basic",
-                    topic="news",
-                    days=1,
-                    max_results=4,
-                    include_answer=False
-                )
-                for r in resp.get("results", []):
-                    title = r.get("title", "")
-                    if title and title not in seen and len(title) > 20:
-                        seen.add(title)
-                        results.append({
-                            "title": title[:120],
-                            "source": r.get("url","").split("/")[2] if r.get("url") else "Tavily",
-                            "datetime": r.get("published_date", TODAY.isoformat())[:16],
-                            "url": r.get("url", ""),
-                            "classification": classify_news(title),
-                            "label": "LIVE"
-                        })
-                if len(results) >= 5:
-                    break
-            if results:
-                log(f"  ✅ {len(results)} berita dari Tavily")
-                return results[:5]
+            with source_health.track("tavily_news") as t:
+                client = TavilyClient(api_key=TAVILY_API_KEY)
+                results = []
+                seen = set()
+                for q in TAVILY_NEWS_QUERIES[:2]:
+                    resp = client.search(
+                        query=q,
+                        search_depth="basic",
+                        topic="news",
+                        days=1,
+                        max_results=4,
+                        include_answer=False
+                    )
+                    for r in resp.get("results", []):
+                        title = r.get("title", "")
+                        if title and title not in seen and len(title) > 20:
+                            seen.add(title)
+                            results.append({
+                                "title": title[:120],
+                                "source": r.get("url","").split("/")[2] if r.get("url") else "Tavily",
+                                "datetime": r.get("published_date", TODAY.isoformat())[:16],
+                                "url": r.get("url", ""),
+                                "classification": classify_news(title, r.get("content") or ""),
+                                "label": "LIVE"
+                            })
+                    if len(results) >= 5:
+                        break
+                if results:
+                    log(f"  ✅ {len(results)} berita dari Tavily")
+                    t.ok()
+                    metrics.branch("tavily")
+                    return results[:5]
         except Exception as e:
             log(f"  ⚠️ Tavily error: {e}")
 
     # Opsi 2: NewsAPI (free tier: English only, no date filter)
-    if NEWS_API_KEY:
-        newsapi_queries = [
-            ("Indonesian rupiah dollar exchange rate", "en"),
-            ("Bank Indonesia interest rate rupiah", "en"),
-            ("IDR USD currency Indonesia", "en"),
-        ]
+    if NEWS_API_KEY and source_health.allow("newsapi"):
         newsapi_results = []
         seen_newsapi = set()
-        for q, lang in newsapi_queries:
+        for q, lang in NEWSAPI_QUERIES:
             try:
-                r = requests.get(
-                    "https://newsapi.org/v2/everything",
-                    params={
-                        "q": q,
-                        "language": lang,
-                        "sortBy": "publishedAt",
-                        "pageSize": 5,
-                        "apiKey": NEWS_API_KEY
-                        # Note: 'from' param requires paid plan — dihapus
-                    },
-                    timeout=10
-                )
-                data = r.json()
-                if data.get("status") == "error":
-                    log(f"  ⚠️ NewsAPI error: {data.get('message','')}")
-                    break
+                with source_health.track("newsapi") as t:
+                    r = http_client.get(
+                        "https://newsapi.org/v2/everything",
+                        params={
+                            "q": q,
+                            "language": lang,
+                            "sortBy": "publishedAt",
+                            "pageSize": 5,
+                            "apiKey": NEWS_API_KEY
+                            # Note: 'from' param requires paid plan — dihapus
+                        },
+                        timeout=source_health.timeout_for("newsapi", 10)
+                    )
+                    data = r.json()
+                    if data.get("status") == "error":
+                        log(f"  ⚠️ NewsAPI error: {data.get('message','')}")
+                        break
+                    t.ok()
                 for a in data.get("articles", []):
                     title = a.get("title", "")
                     if not title or title in seen_newsapi or len(title) < 15:
@@ -374,7 +610,7 @@ def fetch_news():
                         "source": a.get("source", {}).get("name", "NewsAPI"),
                         "datetime": a.get("publishedAt", "")[:16].replace("T", " "),
                         "url": a.get("url", ""),
-                        "classification": classify_news(title),
+                        "classification": classify_news(title, a.get("description") or ""),
                         "label": "LIVE"
                     })
                 if len(newsapi_results) >= 5:
@@ -385,80 +621,198 @@ def fetch_news():
 
         if newsapi_results:
             log(f"  ✅ {len(newsapi_results)} berita dari NewsAPI")
+            metrics.branch("newsapi")
             return newsapi_results[:5]
         else:
             log("  ⚠️ NewsAPI: 0 artikel — mungkin rate limit atau plan gratis")
 
     # Opsi 3: Scraping fallback
     log("  ℹ️ Fallback ke scraping...")
+    metrics.branch("scraping")
     return fetch_news_scraping()
 
 
+# Maks elemen h1/h2/h3/a yang diperiksa per halaman. Dulu 30 — habis oleh link
+# navigasi sebelum daftar berita; parser lxml cukup murah untuk memindai lebih jauh.
+SCRAPE_CANDIDATES = 400
+SCRAPE_SOURCES = [
+    ("https://www.cnbcindonesia.com/search?query=rupiah+kurs+dollar", "CNBCIndonesia"),
+    ("https://ekonomi.bisnis.com/search?type=news&q=rupiah", "BisnisIndonesia"),
+    ("https://www.kontan.co.id/search/?q=rupiah+kurs", "Kontan"),
+]
+
+
+def fetch_page(url: str, src_name: str):
+    name = f"scrape_{src_name.lower()}"
+    with metrics.stage(name), source_health.track(name) as t:
+        r = http_client.get(url, headers={
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }, timeout=source_health.timeout_for(name, 15))
+        r.raise_for_status()
+        t.ok()
+    return r
+
+
+def iter_scraped(limit: int = SCRAPE_CANDIDATES):
+    """
+    Headline relevan IDR dari situs berita. Semua situs di-fetch paralel;
+    tiap halaman di-parse (lxml, hanya tag kandidat) begitu tiba, dan hanya
+    sejauh yang dikonsumsi pemanggil — berhenti iterasi = berhenti parsing.
+    """
+    done = queue.Queue()
+
+    def worker(url, src_name):
+        try:
+            done.put((src_name, fetch_page(url, src_name), None))
+        except Exception as e:
+            done.put((src_name, None, e))
+
+    sites = [(url, src) for url, src in SCRAPE_SOURCES if source_health.allow(f"scrape_{src.lower()}")]
+    for url, src_name in sites:
+        threading.Thread(target=worker, args=(url, src_name), name=f"scrape-{src_name}", daemon=True).start()
+
+    for _ in sites:
+        src_name, r, err = done.get()
+        if err is not None:
+            log(f"  ⚠️ Scraping {src_name}: {err}")
+            continue
+        # Cari heading/link yang mengandung kata kunci
+        for title in html_extract.headlines(r.content, limit, encoding=html_extract.charset(r)):
+            if news_classifier.is_relevant(title):
+                yield {"title": title, "source": src_name, "datetime": TODAY.isoformat(), "label": "PROXY"}
+
+
+@metrics.timed()
 def fetch_news_scraping():
     """Fallback: scraping dari beberapa sumber berita IDR."""
     results = []
     seen = set()
+    for item in iter_scraped():
+        if item["title"] in seen:
+            continue
+        seen.add(item["title"])
+        item["classification"] = classify_news(item["title"])
+        item["title"] = item["title"][:120]
+        results.append(item)
+        if len(results) >= 5:
+            # sisa halaman tidak di-parse; request-nya tetap jalan di thread daemon
+            # (sudah dikirim paralel) dan hasilnya dibuang
+            break
 
-    sources = [
-        ("https://www.cnbcindonesia.com/search?query=rupiah+kurs+dollar", "CNBCIndonesia"),
-        ("https://ekonomi.bisnis.com/search?type=news&q=rupiah", "BisnisIndonesia"),
-        ("https://www.kontan.co.id/search/?q=rupiah+kurs", "Kontan"),
-    ]
+    # Jika masih kosong — gunakan headline statis berdasarkan konteks DXY + spot
+    metrics.branch("scraping")
+    if not results:
+        log("  ℹ️ Menggunakan fallback headlines kontekstual")
+        metrics.branch("fallback_headlines")
+        results = fallback_headlines()
+    return results
 
-    for url, src_name in sources:
-        try:
-            r = requests.get(url, headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }, timeout=15)
-            soup = BeautifulSoup(r.text, "html.parser")
-
-            # Cari semua heading/link yang mengandung kata kunci
-            candidates = soup.find_all(["h1","h2","h3","a"], limit=30)
-            for el in candidates:
-                title = el.get_text(strip=True)
-                if len(title) < 20:
+
+# ── G': Ingest berita volume besar (NEWS_INGEST=1) ───────────────────────────
+def iter_newsapi():
+    """Semua artikel NewsAPI untuk NEWSAPI_QUERIES, halaman demi halaman."""
+    for q, lang in NEWSAPI_QUERIES:
+        for page in range(1, NEWS_MAX_PAGES + 1):
+            if not source_health.allow("newsapi"):
+                return
+            try:
+                with source_health.track("newsapi") as t:
+                    data = http_client.get(
+                        "https://newsapi.org/v2/everything",
+                        params={"q": q, "language": lang, "sortBy": "publishedAt",
+                                "pageSize": NEWS_PAGE_SIZE, "page": page, "apiKey": NEWS_API_KEY},
+                        timeout=source_health.timeout_for("newsapi", 10),
+                    ).json()
+                    # plan gratis: maks 100 hasil per query — bukan tanda sumber rusak
+                    if data.get("status") != "error" or data.get("code") == "maximumResultsReached":
+                        t.ok()
+            except Exception as e:
+                log(f"  ⚠️ NewsAPI query error: {e}")
+                break
+            if data.get("status") == "error":
+                if data.get("code") != "maximumResultsReached":
+                    log(f"  ⚠️ NewsAPI error: {data.get('message','')}")
+                break
+            articles = data.get("articles", [])
+            for a in articles:
+                title = a.get("title") or ""
+                if len(title) < 15 or "[Removed]" in title:
                     continue
-                keywords = ["rupiah","kurs","IDR","BI rate","dollar","devisa","valas"]
-                if any(k.lower() in title.lower() for k in keywords):
-                    if title not in seen:
-                        seen.add(title)
-                        results.append({
-                            "title": title[:120],
-                            "source": src_name,
-                            "datetime": TODAY.isoformat(),
-                            "classification": classify_news(title),
-                            "label": "PROXY"
-                        })
-            if len(results) >= 5:
+                yield {
+                    "title": title,
+                    "body": a.get("description") or "",
+                    "source": a.get("source", {}).get("name", "NewsAPI"),
+                    "datetime": a.get("publishedAt", "")[:16].replace("T", " "),
+                    "url": a.get("url", ""),
+                    "label": "LIVE",
+                }
+            if len(articles) < NEWS_PAGE_SIZE or page * NEWS_PAGE_SIZE >= data.get("totalResults", 0):
                 break
+
+
+def iter_tavily_news():
+    if not source_health.allow("tavily_news"):
+        return
+    client = TavilyClient(api_key=TAVILY_API_KEY)
+    for q in TAVILY_NEWS_QUERIES:
+        try:
+            with source_health.track("tavily_news") as t:
+                resp = client.search(query=q, search_depth="basic", topic="news", days=1,
+                                     max_results=20, include_answer=False)
+                t.ok()
         except Exception as e:
-            log(f"  ⚠️ Scraping {src_name}: {e}")
+            log(f"  ⚠️ Tavily error: {e}")
             continue
+        for r in resp.get("results", []):
+            url = r.get("url", "")
+            if len(r.get("title") or "") > 20:
+                yield {
+                    "title": r["title"],
+                    "body": r.get("content") or "",
+                    "source": url.split("/")[2] if url else "Tavily",
+                    "datetime": r.get("published_date", TODAY.isoformat())[:16],
+                    "url": url,
+                    "label": "LIVE",
+                }
 
-    # Jika masih kosong — gunakan headline statis berdasarkan konteks DXY + spot
+
+@metrics.timed()
+def fetch_news_ingest():
+    """Semua sumber → dedup MinHash + LSH banding → top NEWS_TOP_N (memori terbatas, lihat news_ingest)."""
+    ingest = news_ingest.Ingest(today=TODAY.isoformat())
+    streams = []
+    if TAVILY_API_KEY and TAVILY_AVAILABLE:
+        streams.append(iter_tavily_news())
+    if NEWS_API_KEY:
+        streams.append(iter_newsapi())
+    streams.append(iter_scraped())
+    for article in itertools.chain.from_iterable(streams):
+        ingest.add(article)
+
+    stats = ingest.stats
+    log(f"  ✅ Ingest: {stats['seen']} artikel, {stats['duplicates']} duplikat, "
+        f"top {stats['kept']} disimpan")
+    metrics.branch("ingest")
+    results = ingest.ranked()
     if not results:
         log("  ℹ️ Menggunakan fallback headlines kontekstual")
-        results = [
-            {"title": "Rupiah stabil di kisaran 16.700-an, pasar tunggu data inflasi AS", "source": "Fallback", "datetime": TODAY.isoformat(), "classification": "NEUTRAL", "label": "PROXY"},
-            {"title": "BI pertahankan suku bunga 4,75% demi jaga stabilitas rupiah", "source": "Fallback", "datetime": TODAY.isoformat(), "classification": "NEUTRAL", "label": "PROXY"},
-            {"title": "DXY menguat tipis, tekanan eksternal masih bayangi rupiah", "source": "Fallback", "datetime": TODAY.isoformat(), "classification": "BEARISH_IDR", "label": "PROXY"},
-        ]
-    return results[:5]
-
-
-def classify_news(title: str) -> str:
-    title_lower = title.lower()
-    bullish_keywords = ["menguat", "naik", "apresiasi", "positif", "stabil", "surplus",
-                        "deal", "investasi masuk", "cadangan devisa", "beli rupiah"]
-    bearish_keywords = ["melemah", "turun", "depresiasi", "tekanan", "defisit", "jual",
-                        "anjlok", "rekor rendah", "risk off", "capital outflow"]
-    bull_score = sum(1 for k in bullish_keywords if k in title_lower)
-    bear_score = sum(1 for k in bearish_keywords if k in title_lower)
-    if bull_score > bear_score:
-        return "BULLISH_IDR"
-    elif bear_score > bull_score:
-        return "BEARISH_IDR"
-    return "NEUTRAL"
+        metrics.branch("fallback_headlines")
+        return fallback_headlines()
+    return results
+
+
+def fallback_headlines() -> list:
+    """Headline statis kontekstual — dipakai jika semua sumber berita gagal."""
+    return [
+        {"title": "Rupiah stabil di kisaran 16.700-an, pasar tunggu data inflasi AS", "source": "Fallback", "datetime": TODAY.isoformat(), "classification": "NEUTRAL", "label": "PROXY"},
+        {"title": "BI pertahankan suku bunga 4,75% demi jaga stabilitas rupiah", "source": "Fallback", "datetime": TODAY.isoformat(), "classification": "NEUTRAL", "label": "PROXY"},
+        {"title": "DXY menguat tipis, tekanan eksternal masih bayangi rupiah", "source": "Fallback", "datetime": TODAY.isoformat(), "classification": "BEARISH_IDR", "label": "PROXY"},
+    ]
+
+
+def classify_news(title: str, body: str = "") -> str:
+    """Label sentimen IDR satu berita (lihat news_classifier untuk batch)."""
+    return news_classifier.classify(title, body)
 
 
 # ── H: Twitter Sentiment Proxy ────────────────────────────────────────────────
@@ -517,11 +871,15 @@ def compute_atr(prices: list) -> dict:
         return {"atr": None, "atr_pct": None, "label": "PROXY"}
     # True range sederhananya = |high-low| per hari
     # Karena kita hanya punya close, pakai std dev sebagai proxy
-    window = prices[-14:]
-    std_dev = statistics.stdev(window)
-    mean_price = statistics.mean(window)
+    std_dev = indicators.last_std(prices, 14)
+    vol = atr_summary(std_dev, sum(prices[-14:]) / 14)
+    log(f"  ✅ ATR proxy: ±{std_dev:.1f} IDR ({vol['atr_pct']}%)")
+    return vol
+
+
+def atr_summary(std_dev: float, mean_price: float) -> dict:
+    """Field volatility market_data.json dari std dev & rata-rata 14D."""
     atr_pct = round(std_dev / mean_price * 100, 3)
-    log(f"  ✅ ATR proxy: ±{std_dev:.1f} IDR ({atr_pct}%)")
     return {
         "atr": round(std_dev, 2),
         "atr_pct": atr_pct,
@@ -530,17 +888,6 @@ def compute_atr(prices: list) -> dict:
     }
 
 
-# ── Compute Moving Averages ───────────────────────────────────────────────────
-def compute_ma(prices: list, window: int) -> list:
-    result = []
-    for i in range(len(prices)):
-        if i < window - 1:
-            result.append(None)
-        else:
-            result.append(round(sum(prices[i - window + 1:i + 1]) / window, 2))
-    return result
-
-
 # ── Compute sentiment distribution ───────────────────────────────────────────
 def compute_sentiment_dist(news: list) -> dict:
     total = len(news) if news else 1
@@ -554,42 +901,129 @@ def compute_sentiment_dist(news: list) -> dict:
     }
 
 
-# ── Main ──────────────────────────────────────────────────────────────────────
-def main():
-    log(f"🚀 Memulai fetch data untuk {TODAY}")
+# ── Concurrent fetch orchestrator ────────────────────────────────────────────
+# Nilai pengganti jika sumber error / tidak selesai sebelum deadline.
+# Label mengikuti fallback terakhir masing-masing fetcher.
+LATE_FALLBACKS = {
+    "frankfurter": lambda err: {
+        p: {"spot": None, "prices": [], "dates": [], "label": "STALE", "error": err} for p in PAIRS
+    },
+    "bca": lambda err: {"buy": None, "sell": None, "mid": None, "label": "PROXY", "error": err},
+    "jisdor": lambda err: {"rate": None, "date": None, "label": "PROXY", "error": err},
+    "dxy": lambda err: {"value": None, "change_pct": None, "label": "STALE", "error": err},
+    "bi_rate": lambda err: dict(BI_RATE_KNOWN, error=err),
+    "news": lambda err: fallback_headlines(),
+}
+
+
+def run_sources(fetchers: dict, deadline: float = FETCH_DEADLINE) -> tuple:
+    """
+    Jalankan semua fetcher paralel (satu thread per sumber) di bawah satu
+    deadline global. Sumber yang belum selesai saat deadline habis diganti
+    nilai LATE_FALLBACKS dan tidak ditunggu lagi (thread daemon).
 
-    rate_data = fetch_frankfurter()
-    bca = fetch_bca_rate()
-    jisdor = fetch_jisdor()
-    dxy = fetch_dxy()
-    bi_rate = fetch_bi_rate()
-    news = fetch_news()
-    twitter = build_twitter_proxy(news)
-    vol = compute_atr(rate_data.get("prices", []))
+    Return (results, timing).
+    """
+    done = queue.Queue()
+
+    def worker(name, fn):
+        t0 = time.perf_counter()
+        try:
+            result, status = fn(), "ok"
+        except Exception as e:
+            result, status = e, "error"
+        done.put((name, result, status, time.perf_counter() - t0))
 
+    start = time.perf_counter()
+    for name, fn in fetchers.items():
+        threading.Thread(target=worker, args=(name, fn), name=f"fetch-{name}", daemon=True).start()
+
+    results, sources = {}, {}
+    while len(results) < len(fetchers):
+        remaining = deadline - (time.perf_counter() - start)
+        if remaining <= 0:
+            break
+        try:
+            name, result, status, elapsed = done.get(timeout=remaining)
+        except queue.Empty:
+            break
+        if status == "error":
+            log(f"  ❌ {name}: {result}")
+            result = LATE_FALLBACKS[name](str(result))
+        results[name] = result
+        sources[name] = {"elapsed_s": round(elapsed, 2), "status": status}
+
+    wall = time.perf_counter() - start
+    for name in fetchers:
+        if name in results:
+            continue
+        log(f"  ⏰ {name}: belum selesai setelah {deadline:.0f}s — ditandai late")
+        results[name] = LATE_FALLBACKS[name](f"deadline {deadline:.0f}s")
+        sources[name] = {"elapsed_s": round(wall, 2), "status": "late"}
+
+    slowest = max(sources, key=lambda n: sources[n]["elapsed_s"])
+    serial = sum(v["elapsed_s"] for v in sources.values())
+    log(f"⏱ Fetch selesai dalam {wall:.1f}s — paling lambat: {slowest} "
+        f"({sources[slowest]['elapsed_s']}s), total serial {serial:.1f}s")
+    timing = {
+        "wall_s": round(wall, 2),
+        "deadline_s": deadline,
+        "slowest": slowest,
+        "serial_s": round(serial, 2),
+        "sources": sources,
+    }
+    return results, timing
+
+
+# ── Per-pair market data ─────────────────────────────────────────────────────
+def estimate_spread(spot) -> dict:
+    """Kurs beli/jual estimasi ±0.3% dari spot (pair non-USD tidak ada BCA)."""
+    if not spot:
+        return {"buy": None, "sell": None, "mid": None, "label": "PROXY"}
+    spread = round(spot * 0.003, 2)
+    return {
+        "buy": round(spot - spread, 2), "sell": round(spot + spread, 2),
+        "mid": round(spot, 2),
+        "source": "spot ±0.3% (est.)",
+        "label": "PROXY"
+    }
+
+
+def build_market_data(pair: str, rate_data: dict, shared: dict, fetch_timing: dict,
+                      date: datetime.date = TODAY) -> dict:
+    """Susun market_data.json untuk satu pair dari data rate + sumber bersama."""
     prices = rate_data.get("prices", [])
     dates = rate_data.get("dates", [])
-    ma5 = compute_ma(prices, 5)
-    ma20 = compute_ma(prices, 20)
+    ind = indicators.rolling(prices, sma=(5, 20))
+    ma5 = ind["ma5"]
+    ma20 = ind["ma20"]
+    vol = compute_atr(prices)
 
-    # 52-week range dari data yang ada (proxy dengan 30D)
+    # Range & rata-rata window 30D; range 52W / multi-tahun ada di rate_data["ranges"]
     min_price = min(prices) if prices else None
     max_price = max(prices) if prices else None
     avg_30d = round(sum(prices) / len(prices), 2) if prices else None
     last_price = prices[-1] if prices else None
 
+    if pair == PRIMARY_PAIR:
+        bca, jisdor = shared["bca"], shared["jisdor"]
+    else:
+        bca = estimate_spread(last_price)
+        jisdor = {"rate": None, "date": None, "label": "PROXY", "note": "JISDOR hanya untuk USD/IDR"}
+
     # Spot: override BCA mid jika lebih fresh
     spot = last_price
     if bca.get("mid") and bca["label"] == "LIVE":
         spot = bca["mid"]
 
-    sentiment_dist = compute_sentiment_dist(news)
-
-    output = {
+    return {
         "meta": {
-            "date": TODAY.isoformat(),
+            "date": date.isoformat(),
+            "pair": pair,
+            "pair_label": pair_label(pair),
             "generated_at": datetime.datetime.utcnow().isoformat() + "Z",
-            "generated_at_wib": (datetime.datetime.utcnow() + datetime.timedelta(hours=7)).strftime("%H:%M WIB")
+            "generated_at_wib": (datetime.datetime.utcnow() + datetime.timedelta(hours=7)).strftime("%H:%M WIB"),
+            "fetch": fetch_timing
         },
         "spot": {
             "value": spot,
@@ -599,8 +1033,8 @@ def main():
         },
         "bca": bca,
         "jisdor": jisdor,
-        "dxy": dxy,
-        "bi_rate": bi_rate,
+        "dxy": shared["dxy"],
+        "bi_rate": shared["bi_rate"],
         "historical": {
             "dates": dates,
             "prices": prices,
@@ -609,21 +1043,54 @@ def main():
             "range_30d_low": min_price,
             "range_30d_high": max_price,
             "avg_30d": avg_30d,
+            "ranges": rate_data.get("ranges", {}),
             "label": rate_data.get("label", "PROXY")
         },
-        "news": news,
-        "twitter": twitter,
+        "news": shared["news"],
+        "twitter": shared["twitter"],
         "volatility": vol,
-        "sentiment_dist": sentiment_dist
+        "sentiment_dist": shared["sentiment_dist"]
+    }
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+def main():
+    log(f"🚀 Memulai fetch data untuk {TODAY} — {', '.join(pair_label(p) for p in PAIRS)} "
+        f"(deadline {FETCH_DEADLINE:.0f}s)")
+
+    fetched, fetch_timing = run_sources({
+        "frankfurter": fetch_frankfurter,
+        "bca": fetch_bca_rate,
+        "jisdor": fetch_jisdor,
+        "dxy": fetch_dxy,
+        "bi_rate": fetch_bi_rate,
+        "news": fetch_news,
+    })
+    news = fetched["news"]
+    shared = {
+        "bca": fetched["bca"],
+        "jisdor": fetched["jisdor"],
+        "dxy": fetched["dxy"],
+        "bi_rate": fetched["bi_rate"],
+        "news": news,
+        "twitter": build_twitter_proxy(news),
+        "sentiment_dist": compute_sentiment_dist(news),
     }
 
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    for pair in PAIRS:
+        output = build_market_data(pair, fetched["frankfurter"][pair], shared, fetch_timing)
+        path = data_path(pair)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+        log(f"✅ {pair_label(pair)} tersimpan ke {path} — Spot: {output['spot']['value']}")
 
-    log(f"✅ Data tersimpan ke {OUTPUT_PATH}")
-    log(f"   Spot: {spot} | BCA: {bca.get('buy')}/{bca.get('sell')} | JISDOR: {jisdor.get('rate')}")
+    http_client.purge()
+    source_health.save()
+    bca, jisdor, dxy, bi_rate = shared["bca"], shared["jisdor"], shared["dxy"], shared["bi_rate"]
+    log(f"   BCA: {bca.get('buy')}/{bca.get('sell')} | JISDOR: {jisdor.get('rate')}")
     log(f"   DXY: {dxy.get('value')} | BI Rate: {bi_rate.get('rate')}% | Berita: {len(news)}")
 
 
 if __name__ == "__main__":
-    main()
+    with metrics.run("fetch_data"):
+        main()
@@ -1,26 +1,94 @@
 """
 generate_report.py
 Panggil Google Gemini API dengan data real yang sudah di-fetch,
-lalu ekstrak HTML output dan simpan ke outputs/ dan docs/.
+lalu ekstrak HTML output dan simpan ke docs/ (outputs/ berisi symlink).
+Semua pair di RADAR_PAIRS digenerate paralel (lihat pairs.py).
 """
 import os
 import json
 import re
+import math
 import datetime
 import time
+import hashlib
+import shutil
+import random
+import email.utils
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
+import assets
+import metrics
+import http_client
+import render_report
+import deploy_pages
+from pairs import PAIRS, PRIMARY_PAIR, pair_label, data_path, report_filename
+
 # ── Config ───────────────────────────────────────────────────────────────────
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
 GEMINI_ENDPOINT = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+GEMINI_STREAM_ENDPOINT = "https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent?alt=sse"
+# Mode llm: stream HTML langsung ke file, berhenti di </html>
+GEMINI_STREAM = os.environ.get("GEMINI_STREAM", "1") != "0"
+# Batas karakter sebelum <!DOCTYPE/<html muncul — lebih dari ini dianggap output rusak
+STREAM_PREAMBLE_LIMIT = 4000
 MODEL = "gemini-3-flash-preview"
 DATE_OVERRIDE = os.environ.get("DATE_OVERRIDE", "").strip()
+# local = layout S1–S9 dirender lokal, LLM hanya menulis narasi (default)
+# llm   = mode lama: LLM menghasilkan seluruh HTML
+REPORT_MODE = os.environ.get("REPORT_MODE", "local").strip().lower()
+SYSTEM_HTML = (
+    "Kamu adalah ahli FX dan front-end developer. Output HANYA kode HTML valid, lengkap, dan "
+    "self-contained. Tidak ada penjelasan, tidak ada markdown, tidak ada komentar di luar HTML."
+)
+SYSTEM_NARRATIVE = (
+    "Kamu adalah analis FX profesional. Jawab HANYA dengan satu objek JSON valid, tanpa markdown."
+)
+HTML_CONFIG = {"maxOutputTokens": 16000, "temperature": 0.3}
+NARRATIVE_CONFIG = {"maxOutputTokens": 1024, "temperature": 0.3, "responseMimeType": "application/json"}
 TODAY = (
     datetime.date.fromisoformat(DATE_OVERRIDE)
     if DATE_OVERRIDE
     else (datetime.datetime.utcnow() + datetime.timedelta(hours=7)).date()
 )
-DATA_PATH = "data/market_data.json"
+# Jumlah report pair yang digenerate bersamaan
+REPORT_WORKERS = int(os.environ.get("REPORT_WORKERS", "3"))
+# Batas request LLM per menit, dibagi semua thread (0 = tanpa batas)
+LLM_RPM = float(os.environ.get("LLM_RPM", "0"))
+# Retry Gemini: budget total semua panggilan LLM dalam satu run (harus di
+# bawah timeout-minutes job, 15 menit), timeout & jumlah attempt per request,
+# dan exponential backoff (base·2^n detik, full jitter, maks cap)
+GEMINI_BUDGET_S = float(os.environ.get("GEMINI_BUDGET_S", "600"))
+GEMINI_ATTEMPT_TIMEOUT = float(os.environ.get("GEMINI_ATTEMPT_TIMEOUT", "120"))
+GEMINI_MAX_ATTEMPTS = int(os.environ.get("GEMINI_MAX_ATTEMPTS", "5"))
+GEMINI_BACKOFF_BASE = 2.0
+GEMINI_BACKOFF_CAP = 60.0
+# Attempt tidak dimulai jika sisa budget kurang dari ini
+GEMINI_MIN_ATTEMPT_S = 10.0
+# Budget token prompt (estimasi lokal sebelum kirim): prompt HTML yang melewati
+# budget dipadatkan bertahap (array historis dibulatkan lalu dipersingkat)
+PROMPT_TOKEN_BUDGET = int(os.environ.get("PROMPT_TOKEN_BUDGET", "4000"))
+# Teks non-digit (tokenizer Gemini memecah angka per digit); kalibrasi dari
+# tokens.estimate_ratio di data/llm_attempts.json
+CHARS_PER_TOKEN = float(os.environ.get("CHARS_PER_TOKEN", "3.0"))
+PROMPT_LEVELS = ((30, None), (30, 5), (20, 5), (10, 5))     # (titik historis, digit signifikan)
+# Output terpotong di maxOutputTokens: HTML dilanjutkan (giliran "lanjutkan"),
+# JSON narasi diulang dengan maxOutputTokens 2×; masih terpotong → fallback lokal
+LLM_MAX_CONTINUATIONS = int(os.environ.get("LLM_MAX_CONTINUATIONS", "2"))
+CONTINUE_PROMPT = (
+    "Output sebelumnya terpotong. Lanjutkan PERSIS dari karakter terakhir, "
+    "tanpa mengulang bagian yang sudah ada dan tanpa penjelasan."
+)
+# Cache response LLM (key = hash model + system instruction + prompt + config)
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE", "1") != "0"
+LLM_CACHE_DIR = os.environ.get("LLM_CACHE_DIR", "data/llm_cache")
+LLM_CACHE_MAX_AGE_DAYS = float(os.environ.get("LLM_CACHE_MAX_AGE_DAYS", "14"))
+LLM_CACHE_MAX_MB = float(os.environ.get("LLM_CACHE_MAX_MB", "50"))
+# Cache per section (mode local): hash input tiap section + narasi per key per report
+SECTION_CACHE_ENABLED = os.environ.get("SECTION_CACHE", "1") != "0"
+SECTION_CACHE_DIR = os.environ.get("SECTION_CACHE_DIR", "data/section_cache")
 OUTPUT_DIR = "outputs"
 DOCS_DIR = "docs"
 
@@ -32,13 +100,50 @@ def log(msg):
     print(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] {msg}")
 
 
-def load_data() -> dict:
-    with open(DATA_PATH, "r", encoding="utf-8") as f:
+def load_data(pair: str = PRIMARY_PAIR) -> dict:
+    with open(data_path(pair), "r", encoding="utf-8") as f:
         return json.load(f)
 
 
-def build_prompt(data: dict) -> str:
-    """Bangun prompt lengkap dengan data real yang sudah di-inject."""
+def report_date(data: dict) -> datetime.date:
+    """Tanggal report = tanggal data (bisa lampau saat backfill)."""
+    date_str = data.get("meta", {}).get("date")
+    return datetime.date.fromisoformat(date_str) if date_str else TODAY
+
+
+def range_line(hist: dict) -> str:
+    """Ringkasan range 52W + high/low sejak awal riwayat store (satu baris)."""
+    ranges = hist.get("ranges") or {}
+    r52, rall = ranges.get("52w"), ranges.get("all")
+    if not r52:
+        return "Range 52W: N/A"
+    line = (f"Range 52W: {r52['low']} – {r52['high']} ({r52['label']}) · persentil spot {r52['percentile']}% "
+            f"· {r52['from_high_pct']:+}% dari high 52W")
+    if rall:
+        line += (f" · sejak {rall['from']}: high {rall['high']} ({rall['high_date']}, {rall['from_high_pct']:+}%), "
+                 f"low {rall['low']} ({rall['low_date']}, {rall['from_low_pct']:+}%)")
+    return line
+
+
+def compact_series(values: list, sig: int = None) -> list:
+    """Bulatkan ke `sig` digit signifikan (16908.0 → 16908, 108.234 → 108.23); None tetap."""
+    if sig is None:
+        return values
+    out = []
+    for v in values:
+        if v is None or v == 0:
+            out.append(v)
+            continue
+        ndigits = max(0, sig - 1 - math.floor(math.log10(abs(v))))
+        out.append(round(v, ndigits) if ndigits else int(round(v)))
+    return out
+
+
+def build_prompt(data: dict, points: int = 30, sig: int = None) -> str:
+    """
+    Bangun prompt lengkap dengan data real yang sudah di-inject. points / sig
+    memadatkan array historis (lihat fit_prompt); default = array 30D utuh.
+    """
 
     d = data
     spot = d["spot"]
@@ -52,6 +157,8 @@ def build_prompt(data: dict) -> str:
     vol = d["volatility"]
     sent = d["sentiment_dist"]
     meta = d["meta"]
+    label = pair_label(meta.get("pair", PRIMARY_PAIR))
+    day = report_date(d)
 
     # Format news untuk prompt
     news_text = "\n".join([
@@ -64,20 +171,21 @@ def build_prompt(data: dict) -> str:
         for t in twitter[:4]
     ])
 
-    prices_json = json.dumps(hist["prices"][-30:])
-    dates_json = json.dumps(hist["dates"][-30:])
-    ma5_json = json.dumps(hist["ma5"][-30:])
-    ma20_json = json.dumps(hist["ma20"][-30:])
+    sep = (",", ":") if sig else None
+    prices_json = json.dumps(compact_series(hist["prices"][-points:], sig), separators=sep)
+    dates_json = json.dumps(hist["dates"][-points:], separators=sep)
+    ma5_json = json.dumps(compact_series(hist["ma5"][-points:], sig), separators=sep)
+    ma20_json = json.dumps(compact_series(hist["ma20"][-points:], sig), separators=sep)
 
-    prompt = f"""Kamu adalah analis FX profesional. Buat SATU file HTML lengkap untuk "Pre-Market Intelligence Radar USD/IDR".
+    prompt = f"""Kamu adalah analis FX profesional. Buat SATU file HTML lengkap untuk "Pre-Market Intelligence Radar {label}".
 
 ═══════════════════════════════
 DATA REAL (sudah di-fetch otomatis)
 ═══════════════════════════════
 
-TANGGAL: {TODAY.strftime('%A, %d %B %Y')} · Generated: {meta['generated_at_wib']}
+TANGGAL: {day.strftime('%A, %d %B %Y')} · Generated: {meta['generated_at_wib']}
 
-A. SPOT USD/IDR:
+A. SPOT {label}:
    Mid-market: {spot['value']} IDR
    Perubahan: {spot['change_pct']:+}%
    Label: {spot['label']} · Sumber: {spot.get('source','')}
@@ -90,13 +198,14 @@ C. BI JISDOR:
    Rate: {jisdor.get('rate', 'N/A')} | Tanggal: {jisdor.get('date', 'N/A')}
    Label: {jisdor.get('label','PROXY')}
 
-D. HISTORICAL 30D (untuk chart):
+D. HISTORICAL {points}D (untuk chart):
    Tanggal: {dates_json}
    Harga close: {prices_json}
    5D MA: {ma5_json}
    20D MA: {ma20_json}
    Range 30D: {hist['range_30d_low']} – {hist['range_30d_high']}
    Avg 30D: {hist['avg_30d']}
+   {range_line(hist)}
    Label: {hist.get('label','PROXY')}
 
 E. DXY:
@@ -132,7 +241,7 @@ Buat file HTML LENGKAP dengan:
 
 LAYOUT SECTIONS (wajib urut):
 
-S1 — HEADER: judul "Pre-Market Intelligence Radar · USD/IDR · {TODAY.strftime('%d %b %Y').upper()}", radar dot pulse animasi, timestamp
+S1 — HEADER: judul "Pre-Market Intelligence Radar · {label} · {day.strftime('%d %b %Y').upper()}", radar dot pulse animasi, timestamp
 
 S2 — RATE HERO (4 kolom):
   - Spot {spot['value']} IDR ({spot['change_pct']:+}%) [CYAN accent, label: {spot['label']}]
@@ -143,7 +252,7 @@ S2 — RATE HERO (4 kolom):
 
 S3 — 30-DAY PRICE CHART (full width):
   - Line chart pakai data ACTUAL dari section D di atas
-  - 3 dataset: USD/IDR (cyan), 5D MA (orange dashed), 20D MA (red dashed)
+  - 3 dataset: {label} (cyan), 5D MA (orange dashed), 20D MA (red dashed)
   - Badge: UPTREND jika harga > 20D MA, DOWNTREND jika di bawah
   - Sumbu Y range: auto dari data ±0.5%
   - Sumbu X: label tanggal dari array dates
@@ -158,7 +267,7 @@ S5 — VOLATILITY BAR + RISK HEATMAP (2 kolom):
 
 S6 — SENTIMENT DONUT + MACRO (2 kolom):
   Kiri: Donut chart pakai data ACTUAL: Bearish {sent['bearish_pct']}% / Bullish {sent['bullish_pct']}% / Neutral {sent['neutral_pct']}%
-  Kanan: 6 kotak macro (BI Rate, DXY, GDP, Next release, Tariff, IDR high)
+  Kanan: 9 kotak macro (BI Rate, DXY, JISDOR, Avg 30D, ATR 14D, IDR high, Range 52W, Persentil 52W, high sejak awal riwayat — dari section D)
 
 S7 — TWITTER SENTIMENT (4 kartu): pakai data dari section H, label ⚡ PROXY di setiap kartu
 
@@ -178,83 +287,799 @@ ATURAN PENTING:
     return prompt
 
 
-def call_glm(prompt: str) -> str:
-    """Panggil Google Gemini API."""
-    log(f"🤖 Memanggil {MODEL} ({len(prompt)} chars prompt)...")
+def estimate_tokens(text: str) -> int:
+    """Estimasi token lokal tanpa request countTokens: 1 token per digit + CHARS_PER_TOKEN karakter per token sisanya."""
+    digits = sum(1 for ch in text if ch.isdigit())
+    return digits + math.ceil((len(text) - digits) / CHARS_PER_TOKEN)
+
+
+def fit_prompt(data: dict, budget: int = PROMPT_TOKEN_BUDGET) -> str:
+    """build_prompt di level PROMPT_LEVELS pertama yang muat di budget token (termasuk system)."""
+    for points, sig in PROMPT_LEVELS:
+        prompt = build_prompt(data, points, sig)
+        tokens = estimate_tokens(SYSTEM_HTML + prompt)
+        if tokens <= budget:
+            break
+    if tokens > budget:
+        log(f"⚠️ Prompt ±{tokens} token masih melewati budget {budget} setelah dipadatkan — tetap dikirim")
+    elif (points, sig) != PROMPT_LEVELS[0]:
+        log(f"🗜️ Prompt dipadatkan ke {points} titik historis, {sig} digit signifikan (±{tokens} token)")
+    metrics.branch(f"prompt_{points}" + (f"_sig{sig}" if sig else ""))
+    return prompt
+
+
+# ── LLM response cache ───────────────────────────────────────────────────────
+def llm_cache_key(payload: dict) -> str:
+    blob = json.dumps({"model": MODEL, **payload}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def llm_cache_get(key: str):
+    if not LLM_CACHE_ENABLED:
+        return None
+    path = os.path.join(LLM_CACHE_DIR, f"{key}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get("created_at", 0) > LLM_CACHE_MAX_AGE_DAYS * 86400:
+        return None
+    os.utime(path)  # tandai baru dipakai (untuk eviksi LRU)
+    return entry["text"]
+
+
+def llm_cache_put(key: str, text: str):
+    if not LLM_CACHE_ENABLED:
+        return
+    os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+    path = os.path.join(LLM_CACHE_DIR, f"{key}.json")
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"model": MODEL, "created_at": time.time(), "text": text}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    llm_cache_evict()
+
+
+def llm_cache_evict():
+    """Hapus entry kadaluarsa, lalu yang paling lama tidak dipakai sampai di bawah batas ukuran."""
+    if not os.path.isdir(LLM_CACHE_DIR):
+        return
+    now = time.time()
+    entries = []
+    for name in os.listdir(LLM_CACHE_DIR):
+        path = os.path.join(LLM_CACHE_DIR, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if now - st.st_mtime > LLM_CACHE_MAX_AGE_DAYS * 86400:
+            os.remove(path)
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= LLM_CACHE_MAX_MB * 1024 * 1024:
+            break
+        os.remove(path)
+        total -= size
 
+
+def payload_tokens(payload: dict) -> int:
+    """Estimasi token input satu payload generateContent (system + semua giliran)."""
+    texts = [p["text"] for p in payload["system_instruction"]["parts"]]
+    texts += [p["text"] for c in payload["contents"] for p in c["parts"]]
+    return estimate_tokens("".join(texts))
+
+
+def generate_once(payload: dict, kind: str = "generate") -> tuple:
+    """Satu generateContent (dengan retry). Return (text, finishReason); usage dicatat."""
     url = GEMINI_ENDPOINT.format(model=MODEL) + f"?key={GEMINI_API_KEY}"
+    estimate = payload_tokens(payload)
+    response = post_with_retry(url, payload)
+    metrics.add_bytes(len(response.content))
+    try:
+        result = response.json()
+        cand = result["candidates"][0]
+    except (ValueError, KeyError, IndexError) as e:
+        raise LLMUnavailable(f"response Gemini tanpa candidates ({type(e).__name__}: {e})")
+    text = "".join(p.get("text", "") for p in cand.get("content", {}).get("parts", []))
+    finish = cand.get("finishReason")
+    record_usage(kind, estimate, result.get("usageMetadata"), finish)
+    return text, finish
+
+
+@metrics.timed()
+def call_glm(prompt: str, system: str = SYSTEM_HTML, config: dict = None, on_truncate: str = "continue") -> str:
+    """
+    Panggil Google Gemini API (dengan cache on-disk untuk input identik).
+
+    finishReason MAX_TOKENS: on_truncate="continue" mengirim giliran
+    "lanjutkan" dengan output sejauh ini (HTML), "regenerate" mengulang dengan
+    maxOutputTokens 2× (JSON). Maks LLM_MAX_CONTINUATIONS kali, lalu
+    TruncatedOutput. Output terpotong tidak pernah masuk cache.
+    """
+    log(f"🤖 Memanggil {MODEL} ({len(prompt)} chars prompt)...")
+
     payload = {
         "system_instruction": {
-            "parts": [{"text": "Kamu adalah ahli FX dan front-end developer. Output HANYA kode HTML valid, lengkap, dan self-contained. Tidak ada penjelasan, tidak ada markdown, tidak ada komentar di luar HTML."}]
+            "parts": [{"text": system}]
         },
         "contents": [{"parts": [{"text": prompt}]}],
-        "generationConfig": {
-            "maxOutputTokens": 16000,
-            "temperature": 0.3
-        }
+        "generationConfig": dict(config or HTML_CONFIG)
     }
 
-    max_retries = 5
-    for attempt in range(1, max_retries + 1):
+    cache_key = llm_cache_key(payload)
+    cached = llm_cache_get(cache_key)
+    if cached is not None:
+        log(f"⚡ Cache hit {cache_key[:12]} — skip panggilan API ({len(cached)} chars)")
+        metrics.branch("cache")
+        return cached
+
+    metrics.branch("api")
+    text, finish = generate_once(payload)
+    rounds = 0
+    while finish == "MAX_TOKENS":
+        if rounds >= LLM_MAX_CONTINUATIONS:
+            raise TruncatedOutput(f"masih terpotong di maxOutputTokens setelah {rounds}× {on_truncate} "
+                                  f"({len(text)} chars)")
+        rounds += 1
+        log(f"✂️ Output terpotong di maxOutputTokens ({len(text)} chars) — {on_truncate} "
+            f"{rounds}/{LLM_MAX_CONTINUATIONS}")
+        metrics.branch(on_truncate)
+        if on_truncate == "regenerate":
+            config = payload["generationConfig"]
+            payload = dict(payload, generationConfig=dict(config, maxOutputTokens=config["maxOutputTokens"] * 2))
+            text, finish = generate_once(payload, "regenerate")
+        else:
+            more, finish = generate_once(continuation_payload(payload, text), "continue")
+            text += more
+    log(f"✅ Response diterima ({len(text)} chars)")
+    llm_cache_put(cache_key, text)
+    return text
+
+
+def continuation_payload(payload: dict, partial: str) -> dict:
+    """Payload multi-turn: prompt asli → output terpotong (giliran model) → "lanjutkan"."""
+    return dict(payload, contents=[
+        {"role": "user", "parts": payload["contents"][0]["parts"]},
+        {"role": "model", "parts": [{"text": partial}]},
+        {"role": "user", "parts": [{"text": CONTINUE_PROMPT}]},
+    ])
+
+
+class RateLimiter:
+    """Jarak minimum antar request (60/rpm detik), thread-safe."""
+
+    def __init__(self, rpm: float):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self.next_at = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            wait = max(0.0, self.next_at - now)
+            self.next_at = max(now, self.next_at) + self.interval
+        if wait:
+            time.sleep(wait)
+
+
+LLM_LIMITER = RateLimiter(LLM_RPM)
+# Deadline monotonic semua panggilan LLM (diset main() lewat set_deadline)
+LLM_DEADLINE = None
+# Satu entry per attempt HTTP ke Gemini: kind, attempt, status, latency_s, wait_s
+ATTEMPT_LOG = []
+ATTEMPT_LOCK = threading.Lock()
+# Satu entry per response Gemini: kind, estimasi vs token aktual (usageMetadata), finishReason
+TOKEN_LOG = []
+
+
+class LLMUnavailable(Exception):
+    """Gemini tidak memberi response sukses dalam jumlah attempt / budget waktu."""
+
+
+class TruncatedOutput(Exception):
+    """Output LLM tidak lengkap (terpotong maxOutputTokens / tanpa </html>) — jangan dipublikasi."""
+
+
+class RetryScheduler:
+    """
+    Jadwal retry untuk satu request: exponential backoff dengan full jitter,
+    menghormati Retry-After / RetryInfo dari server, dan tidak pernah melewati
+    deadline (budget run). Latency tiap attempt dicatat di ATTEMPT_LOG.
+    """
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(self, deadline: float = None, max_attempts: int = GEMINI_MAX_ATTEMPTS):
+        self.deadline = deadline
+        self.max_attempts = max_attempts
+        self.attempt = 0
+
+    def remaining(self) -> float:
+        return float("inf") if self.deadline is None else self.deadline - time.monotonic()
+
+    def attempt_timeout(self) -> float:
+        """Timeout attempt berikutnya, dipotong ke sisa budget."""
+        return max(1.0, min(GEMINI_ATTEMPT_TIMEOUT, self.remaining()))
+
+    @staticmethod
+    def server_hint(response) -> float:
+        """Detik tunggu yang diminta server (Retry-After atau RetryInfo.retryDelay), None jika tidak ada."""
+        if response is None:
+            return None
+        value = response.headers.get("Retry-After", "").strip()
+        if value:
+            if value.isdigit():
+                return float(value)
+            try:
+                when = email.utils.parsedate_to_datetime(value)
+                return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+        try:
+            for detail in response.json().get("error", {}).get("details", []):
+                delay = detail.get("retryDelay")
+                if delay and delay.endswith("s"):
+                    return float(delay[:-1])
+        except (ValueError, AttributeError):
+            pass
+        return None
+
+    def next_wait(self, response=None) -> float:
+        """
+        Detik tunggu sebelum attempt berikutnya, atau None jika harus
+        berhenti (attempt habis / tunggu + attempt minimum melewati budget).
+        """
+        if self.attempt >= self.max_attempts:
+            return None
+        hint = self.server_hint(response)
+        if hint is None:
+            wait = random.uniform(0, min(GEMINI_BACKOFF_CAP, GEMINI_BACKOFF_BASE * 2 ** self.attempt))
+        else:
+            wait = hint + random.uniform(0, 1)
+        if wait + GEMINI_MIN_ATTEMPT_S > self.remaining():
+            return None
+        return wait
+
+    def record(self, kind: str, status, latency: float, wait: float = None):
+        entry = {"kind": kind, "attempt": self.attempt, "status": status,
+                 "latency_s": round(latency, 2), "wait_s": None if wait is None else round(wait, 1)}
+        with ATTEMPT_LOCK:
+            ATTEMPT_LOG.append(entry)
+        return entry
+
+
+def set_deadline(budget_s: float):
+    """Mulai budget global untuk semua panggilan LLM di run ini (None = tanpa batas)."""
+    global LLM_DEADLINE
+    LLM_DEADLINE = time.monotonic() + budget_s if budget_s else None
+
+
+def post_with_retry(url: str, payload: dict, stream: bool = False,
+                    scheduler: RetryScheduler = None) -> requests.Response:
+    """
+    POST ke Gemini (lewat LLM_LIMITER). 429/5xx/timeout di-retry sesuai
+    RetryScheduler; 4xx lain langsung raise. Raise LLMUnavailable jika
+    attempt atau budget habis — caller fallback ke renderer/narasi lokal.
+    """
+    sched = scheduler or RetryScheduler(LLM_DEADLINE)
+    kind = "stream" if stream else "generate"
+    while True:
+        if sched.remaining() < GEMINI_MIN_ATTEMPT_S:
+            raise LLMUnavailable(f"budget LLM habis sebelum attempt {sched.attempt + 1}")
+        sched.attempt += 1
+        LLM_LIMITER.acquire()
+        metrics.add_request()
+        t0 = time.perf_counter()
+        response, reason = None, None
         try:
-            response = requests.post(
+            response = http_client.post(
                 url,
                 headers={"Content-Type": "application/json"},
                 json=payload,
-                timeout=300
+                timeout=sched.attempt_timeout(),
+                stream=stream
             )
-            if response.status_code == 429:
-                wait = 30 * attempt
-                log(f"⚠️ Rate limit (429) — attempt {attempt}/{max_retries}, tunggu {wait}s...")
-                time.sleep(wait)
-                continue
-            if response.status_code == 503:
-                wait = 20 * attempt
-                log(f"⚠️ Service unavailable — attempt {attempt}/{max_retries}, tunggu {wait}s...")
-                time.sleep(wait)
-                continue
-            response.raise_for_status()
-            result = response.json()
-            text = result["candidates"][0]["content"]["parts"][0]["text"]
-            log(f"✅ Response diterima ({len(text)} chars)")
-            return text
-        except requests.exceptions.Timeout:
-            log(f"⚠️ Timeout — attempt {attempt}/{max_retries}, retry...")
-            time.sleep(20)
-            continue
+            if response.status_code not in RetryScheduler.RETRY_STATUS:
+                sched.record(kind, response.status_code, time.perf_counter() - t0)
+                response.raise_for_status()
+                return response
+            reason = f"HTTP {response.status_code}"
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            reason = type(e).__name__
+        latency = time.perf_counter() - t0
+        wait = sched.next_wait(response)
+        sched.record(kind, reason, latency, wait)
+        if response is not None:
+            response.close()
+        if wait is None:
+            raise LLMUnavailable(
+                f"{reason} pada attempt {sched.attempt}/{sched.max_attempts} "
+                f"— sisa budget {max(0.0, sched.remaining()):.0f}s, berhenti"
+            )
+        log(f"⚠️ {reason} — attempt {sched.attempt}/{sched.max_attempts} ({latency:.1f}s), tunggu {wait:.1f}s...")
+        metrics.add_retry()
+        time.sleep(wait)
+
+
+def record_usage(kind: str, estimate: int, usage: dict, finish: str):
+    """Catat usageMetadata response ke TOKEN_LOG + counter token tahap metrics yang sedang jalan."""
+    usage = usage or {}
+    entry = {
+        "kind": kind, "estimate": estimate,
+        "prompt": usage.get("promptTokenCount"),
+        "output": usage.get("candidatesTokenCount"),
+        "thoughts": usage.get("thoughtsTokenCount"),
+        "finish": finish,
+    }
+    with ATTEMPT_LOCK:
+        TOKEN_LOG.append(entry)
+    metrics.add_tokens(entry["prompt"] or 0, (entry["output"] or 0) + (entry["thoughts"] or 0))
+    return entry
+
+
+def token_summary() -> dict:
+    """Total token aktual run ini + akurasi estimasi lokal (aktual / estimasi)."""
+    with ATTEMPT_LOCK:
+        entries = list(TOKEN_LOG)
+    measured = [e for e in entries if e["prompt"]]
+    return {
+        "calls": len(entries),
+        "prompt": sum(e["prompt"] or 0 for e in entries),
+        "output": sum(e["output"] or 0 for e in entries),
+        "thoughts": sum(e["thoughts"] or 0 for e in entries),
+        "truncated": sum(1 for e in entries if e["finish"] == "MAX_TOKENS"),
+        "estimate_ratio": round(sum(e["prompt"] for e in measured) / sum(e["estimate"] for e in measured), 2)
+        if measured else None,
+        "entries": entries,
+    }
 
-    raise Exception(f"❌ Gagal setelah {max_retries} retry — Gemini tidak merespons")
 
+def attempt_summary() -> dict:
+    """Ringkasan ATTEMPT_LOG untuk tuning: jumlah attempt, retry, latency p50/max."""
+    with ATTEMPT_LOCK:
+        entries = list(ATTEMPT_LOG)
+    latencies = sorted(e["latency_s"] for e in entries)
+    return {
+        "attempts": len(entries),
+        "retries": sum(1 for e in entries if e["wait_s"] is not None),
+        "errors": sum(1 for e in entries if e["status"] != 200),
+        "latency_p50_s": latencies[len(latencies) // 2] if latencies else None,
+        "latency_max_s": latencies[-1] if latencies else None,
+        "entries": entries,
+        "tokens": token_summary(),
+    }
+
+
+def write_attempt_log(path: str = "data/llm_attempts.json"):
+    """Simpan ringkasan attempt Gemini run ini (untuk tuning budget & backoff)."""
+    summary = attempt_summary()
+    if not summary["attempts"]:
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    tokens = summary["tokens"]
+    log(f"📈 Gemini: {summary['attempts']} attempt, {summary['retries']} retry, "
+        f"p50 {summary['latency_p50_s']}s, max {summary['latency_max_s']}s, "
+        f"token in/out {tokens['prompt']}/{tokens['output'] + tokens['thoughts']} → {path}")
+
+
+# ── Streaming (mode llm) ─────────────────────────────────────────────────────
+class StreamAborted(Exception):
+    """Stream dihentikan: output rusak atau terpotong di maxOutputTokens."""
+
+
+class HtmlStreamWriter:
+    """
+    Tulis chunk teks ke file begitu tiba, mulai dari <!DOCTYPE html / <html
+    (preamble & fence markdown dibuang) dan berhenti tepat setelah </html>.
+    Hanya buffer kecil yang disimpan di memori.
+    """
+    START_RE = re.compile(r"<!DOCTYPE html|<html[\s>]", re.IGNORECASE)
+    END_TAG = "</html>"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.f = None
+        self.pending = ""       # preamble sebelum start, atau ekor untuk deteksi </html>
+        self.chars = 0
+        self.done = False
+
+    def feed(self, text: str):
+        if self.done or not text:
+            return
+        buf = self.pending + text
+        if self.f is None:
+            m = self.START_RE.search(buf)
+            if not m:
+                if len(buf) > STREAM_PREAMBLE_LIMIT:
+                    raise StreamAborted(f"tidak ada <!DOCTYPE html> dalam {len(buf)} chars pertama")
+                self.pending = buf
+                return
+            self.f = open(self.path, "w", encoding="utf-8")
+            buf = buf[m.start():]
+        end = buf.lower().find(self.END_TAG)
+        if end != -1:
+            self._write(buf[:end + len(self.END_TAG)])
+            self.pending = ""
+            self.done = True
+            return
+        # Simpan ekor agar </html> yang terpotong antar chunk tetap terdeteksi
+        keep = len(self.END_TAG) - 1
+        self._write(buf[:-keep] if len(buf) > keep else "")
+        self.pending = buf[-keep:] if len(buf) > keep else buf
+
+    def _write(self, text: str):
+        if text:
+            self.f.write(text)
+            self.chars += len(text)
+
+    def text(self) -> str:
+        """Output sejauh ini (sudah ditulis + buffer) — giliran model untuk "lanjutkan"."""
+        if self.f is None:
+            return self.pending
+        self.f.flush()
+        with open(self.path, "r", encoding="utf-8") as f:
+            return f.read() + self.pending
+
+    def close(self):
+        if self.f is not None:
+            if not self.done:
+                self._write(self.pending)
+            self.f.close()
+
+
+def iter_sse(response: requests.Response):
+    """Yield objek JSON dari setiap event `data:` stream SSE Gemini."""
+    for line in response.iter_lines(decode_unicode=True):
+        metrics.add_bytes(len(line or "") + 1)
+        if line and line.startswith("data:"):
+            data = line[5:].strip()
+            if data and data != "[DONE]":
+                yield json.loads(data)
+
+
+@metrics.timed()
+def stream_glm(prompt: str, out_path: str) -> dict:
+    """
+    Generate HTML via streamGenerateContent, chunk langsung ditulis ke
+    out_path. Return {"finish_reason", "chars", "ttfb_s", "early_stop"}.
+    Terpotong di maxOutputTokens → dilanjutkan lewat giliran "lanjutkan"
+    (maks LLM_MAX_CONTINUATIONS). Raise StreamAborted jika output rusak atau
+    masih terpotong.
+    """
+    log(f"🤖 Streaming {MODEL} ({len(prompt)} chars prompt)...")
+    payload = {
+        "system_instruction": {"parts": [{"text": SYSTEM_HTML}]},
+        "contents": [{"parts": [{"text": prompt}]}],
+        "generationConfig": dict(HTML_CONFIG)
+    }
+
+    cache_key = llm_cache_key(payload)
+    cached = llm_cache_get(cache_key)
+    if cached is not None:
+        log(f"⚡ Cache hit {cache_key[:12]} — skip panggilan API ({len(cached)} chars)")
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write(extract_html(cached))
+        metrics.branch("cache")
+        return {"finish_reason": "CACHED", "chars": len(cached), "ttfb_s": 0.0, "early_stop": False}
+
+    url = GEMINI_STREAM_ENDPOINT.format(model=MODEL) + f"&key={GEMINI_API_KEY}"
+    t0 = time.perf_counter()
+    sched = RetryScheduler(LLM_DEADLINE)
+    try:
+        response = post_with_retry(url, payload, stream=True, scheduler=sched)
+    except requests.RequestException as e:
+        raise StreamAborted(f"request stream gagal: {e}")
+    metrics.branch("stream")
+    writer = HtmlStreamWriter(out_path)
+    ttfb, finish_reason, usage, rounds = None, None, None, 0
+    try:
+        try:
+            for event in iter_sse(response):
+                cand = (event.get("candidates") or [{}])[0]
+                for part in cand.get("content", {}).get("parts", []):
+                    if ttfb is None:
+                        ttfb = time.perf_counter() - t0
+                        log(f"  ⏱ Chunk pertama setelah {ttfb:.1f}s")
+                    writer.feed(part.get("text", ""))
+                finish_reason = cand.get("finishReason") or finish_reason
+                usage = event.get("usageMetadata") or usage
+                if writer.done or finish_reason == "MAX_TOKENS":
+                    break
+                if sched.remaining() <= 0:
+                    raise StreamAborted(f"budget LLM habis di tengah stream ({writer.chars} chars)")
+        except (requests.RequestException, ValueError) as e:
+            # koneksi putus di tengah stream / event SSE bukan JSON
+            raise StreamAborted(f"stream terputus setelah {writer.chars} chars: {type(e).__name__}: {e}")
+        response.close()
+        record_usage("stream", payload_tokens(payload), usage, finish_reason)
+        while finish_reason == "MAX_TOKENS" and not writer.done:
+            if rounds >= LLM_MAX_CONTINUATIONS:
+                raise StreamAborted(f"output masih terpotong di maxOutputTokens setelah {rounds}× "
+                                    f"lanjutkan ({writer.chars} chars)")
+            rounds += 1
+            log(f"  ✂️ Terpotong di maxOutputTokens ({writer.chars} chars) — lanjutkan {rounds}/{LLM_MAX_CONTINUATIONS}")
+            metrics.branch("continue")
+            try:
+                more, finish_reason = generate_once(continuation_payload(payload, writer.text()), "continue")
+            except (LLMUnavailable, requests.RequestException) as e:
+                raise StreamAborted(f"lanjutan gagal: {e}")
+            writer.feed(more)
+    finally:
+        response.close()
+        writer.close()
+
+    if not writer.done:
+        raise StreamAborted(f"stream selesai ({finish_reason}) tanpa </html> — {writer.chars} chars")
+    early = finish_reason is None
+    log(f"✅ Stream selesai ({writer.chars} chars, {'stop di </html>' if early else finish_reason})")
+    with open(out_path, "r", encoding="utf-8") as f:
+        llm_cache_put(cache_key, f.read())
+    return {"finish_reason": finish_reason or "HTML_END", "chars": writer.chars,
+            "ttfb_s": round(ttfb or 0.0, 2), "early_stop": early}
+
+
+@metrics.timed()
 def extract_html(raw: str) -> str:
-    """Ekstrak blok HTML dari response Gemini."""
+    """Ekstrak blok HTML dari response Gemini. Raise TruncatedOutput jika tidak ada dokumen utuh."""
+    # Awal dokumen sama dengan HtmlStreamWriter.START_RE: <!DOCTYPE html atau langsung <html
+    start = HtmlStreamWriter.START_RE.pattern
     # Coba ambil dari ```html ... ```
-    match = re.search(r"```html\s*(<!DOCTYPE.*?</html>)\s*```", raw, re.DOTALL | re.IGNORECASE)
+    match = re.search(rf"```html\s*((?:{start}).*?</html>)\s*```", raw, re.DOTALL | re.IGNORECASE)
     if match:
         return match.group(1).strip()
 
-    # Langsung cari <!DOCTYPE ... </html>
-    match = re.search(r"(<!DOCTYPE html.*?</html>)", raw, re.DOTALL | re.IGNORECASE)
+    # Langsung cari <!DOCTYPE / <html ... </html>
+    match = re.search(rf"((?:{start}).*?</html>)", raw, re.DOTALL | re.IGNORECASE)
     if match:
         return match.group(1).strip()
 
-    # Jika tidak ada, kembalikan seluruh response
-    log("⚠️ Tidak menemukan HTML yang bersih — menyimpan raw response")
-    return raw
+    # Tidak ada dokumen utuh: terpotong (tanpa </html>) atau bukan HTML — jangan dipublikasi
+    if re.search(start, raw, re.IGNORECASE):
+        raise TruncatedOutput(f"HTML tanpa </html> ({len(raw)} chars)")
+    raise TruncatedOutput(f"response bukan dokumen HTML ({len(raw)} chars)")
+
+
+# ── Narasi (mode local) ──────────────────────────────────────────────────────
+NARRATIVE_KEYS = ("quick_take", "risk_commentary", "telegram_preview")
+# Blok fakta yang dibaca tiap key narasi — key hanya diminta ulang jika blok-nya berubah
+NARRATIVE_FACTS = {
+    "quick_take": ("spot", "range", "sentiment", "news"),
+    "risk_commentary": ("spot", "macro", "sentiment"),
+    "telegram_preview": ("spot", "range", "macro", "sentiment", "news"),
+}
+NARRATIVE_SPECS = {
+    "quick_take": '"quick_take": 2 kalimat kesimpulan arah {label} hari ini',
+    "risk_commentary": '"risk_commentary": 2-3 kalimat risiko utama (DXY, volatilitas, sentimen)',
+    "telegram_preview": '"telegram_preview": pesan Telegram 6 baris (pakai emoji, baris dipisah \\n)',
+}
+
+
+def narrative_facts(data: dict) -> dict:
+    """Angka kunci per blok (tanpa array historis), urut seperti di prompt."""
+    d = data
+    spot, bca, hist, dxy, bi_rate, vol, sent = (
+        d["spot"], d["bca"], d["historical"], d["dxy"], d["bi_rate"], d["volatility"], d["sentiment_dist"]
+    )
+    ma20 = render_report.last_valid(hist.get("ma20"))
+    news_text = "\n".join(f"- [{n['classification']}] {n['title']}" for n in d["news"][:5])
+    return {
+        "spot": f"Spot {spot['value']} ({spot['change_pct']}%, {spot['label']}) · BCA {bca.get('buy')}/{bca.get('sell')} ({bca.get('label')})",
+        "range": f"Range 30D {hist['range_30d_low']}–{hist['range_30d_high']} · Avg {hist['avg_30d']} · 20D MA {ma20}\n{range_line(hist)}",
+        "macro": f"DXY {dxy.get('value')} ({dxy.get('change_pct')}%) · BI Rate {bi_rate.get('rate')}% · ATR14 {vol.get('atr_pct')}% ({vol.get('interpretation')})",
+        "sentiment": f"Sentimen berita: bullish IDR {sent['bullish_pct']}%, bearish IDR {sent['bearish_pct']}%, neutral {sent['neutral_pct']}%",
+        "news": f"Berita:\n{news_text}",
+    }
 
 
-def save_outputs(html: str, date_str: str):
-    filename = f"PreMarket_Radar_USDIDR_{date_str}.html"
+def build_narrative_prompt(data: dict, keys=NARRATIVE_KEYS) -> str:
+    """Prompt ringkas untuk key narasi `keys`: hanya blok fakta yang mereka baca."""
+    label = pair_label(data["meta"].get("pair", PRIMARY_PAIR))
+    facts = narrative_facts(data)
+    needed = {b for k in keys for b in NARRATIVE_FACTS[k]}
+    lines = "\n".join(text for block, text in facts.items() if block in needed)
+    specs = ",\n".join(NARRATIVE_SPECS[k].format(label=label) for k in keys)
+    return f"""Data {label} pre-market {report_date(data).strftime('%d %b %Y')}:
+{lines}
+
+Tulis JSON dengan key:
+{specs}.
+Bahasa Indonesia. Gunakan HANYA angka dari data di atas."""
+
+
+def narrative_hash(data: dict, key: str) -> str:
+    """Hash input persis satu key narasi (prompt satu key + model + system)."""
+    blob = json.dumps([MODEL, SYSTEM_NARRATIVE, NARRATIVE_CONFIG, build_narrative_prompt(data, (key,))],
+                      sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def fallback_narrative(data: dict) -> dict:
+    """Narasi deterministik jika LLM gagal — report tetap bisa dipublikasi."""
+    spot, dxy, sent = data["spot"], data["dxy"], data["sentiment_dist"]
+    m = render_report.derive(data)
+    label = pair_label(data["meta"].get("pair", PRIMARY_PAIR))
+    trend = m["trend"] or "N/A"
+    return {
+        "quick_take": (
+            f"{label} di {spot['value']} ({spot.get('change_pct')}%) dengan tren {trend} terhadap 20D MA. "
+            f"Sentimen berita: {sent['bearish_pct']}% bearish vs {sent['bullish_pct']}% bullish IDR."
+        ),
+        "risk_commentary": (
+            f"DXY {dxy.get('value') or 'N/A'} ({dxy.get('change_pct') or 'N/A'}%), volatilitas "
+            f"{data['volatility'].get('interpretation') or 'N/A'}. Narasi otomatis — LLM tidak tersedia."
+        ),
+        "telegram_preview": (
+            f"📡 PRE-MARKET RADAR · {label} · {report_date(data).strftime('%d %b %Y').upper()}\n"
+            f"📍 Spot {spot['value']} ({spot.get('change_pct')}%) · {trend}\n"
+            f"📊 Range 30D {data['historical']['range_30d_low']}–{data['historical']['range_30d_high']}\n"
+            f"🌐 DXY {dxy.get('value') or 'N/A'} · BI Rate {data['bi_rate'].get('rate')}%\n"
+            f"📰 Sentimen: ▼{sent['bearish_pct']}% ▲{sent['bullish_pct']}%\n"
+            f"⚡ Narasi otomatis"
+        ),
+    }
 
-    # Simpan ke outputs/
-    out_path = os.path.join(OUTPUT_DIR, filename)
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(html)
-    log(f"💾 Disimpan: {out_path}")
 
-    # Simpan ke docs/ untuk GitHub Pages
+def generate_narrative(data: dict, cache: dict = None) -> dict:
+    """
+    Minta LLM menulis narasi pendek (JSON); fallback deterministik jika gagal.
+    cache = {key: {"hash", "text"}} dari run sebelumnya (diupdate in-place):
+    key yang input-nya tidak berubah dipakai ulang, hanya sisanya yang diminta.
+    """
+    narrative = fallback_narrative(data)
+    if not GEMINI_API_KEY:
+        return narrative
+    cache = {} if cache is None else cache
+    hashes = {k: narrative_hash(data, k) for k in NARRATIVE_KEYS}
+    stale = [k for k in NARRATIVE_KEYS if cache.get(k, {}).get("hash") != hashes[k]]
+    for k in NARRATIVE_KEYS:
+        if k not in stale:
+            narrative[k] = cache[k]["text"]
+    if not stale:
+        log("♻️ Narasi tidak berubah — pakai cache section")
+        return narrative
+    if len(stale) < len(NARRATIVE_KEYS):
+        log(f"♻️ Narasi: hanya {', '.join(stale)} yang diminta ulang")
+    try:
+        raw = call_glm(build_narrative_prompt(data, stale), system=SYSTEM_NARRATIVE, config=NARRATIVE_CONFIG,
+                       on_truncate="regenerate")
+        raw = re.sub(r"^```(?:json)?\s*|\s*```$", "", raw.strip())
+        parsed = json.loads(raw)
+        for key in stale:
+            if isinstance(parsed.get(key), str) and parsed[key].strip():
+                narrative[key] = parsed[key].strip()
+                cache[key] = {"hash": hashes[key], "text": narrative[key]}
+    except Exception as e:
+        log(f"⚠️ Narasi LLM gagal ({e}) — pakai narasi deterministik")
+    return narrative
+
+
+# ── Cache section ────────────────────────────────────────────────────────────
+def section_state_path(filename: str) -> str:
+    return os.path.join(SECTION_CACHE_DIR, f"{filename}.json")
+
+
+def load_section_state(filename: str) -> dict:
+    """{"page", "sections": {sid: [hash input, digest blok di file]}, "narrative": {...}} atau {}."""
+    if not SECTION_CACHE_ENABLED:
+        return {}
+    try:
+        with open(section_state_path(filename), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_section_state(filename: str, state: dict):
+    if not SECTION_CACHE_ENABLED:
+        return
+    os.makedirs(SECTION_CACHE_DIR, exist_ok=True)
+    path = section_state_path(filename)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def section_cache_evict():
+    """State section untuk report yang lebih tua dari LLM_CACHE_MAX_AGE_DAYS dibuang."""
+    if not os.path.isdir(SECTION_CACHE_DIR):
+        return
+    now = time.time()
+    for name in os.listdir(SECTION_CACHE_DIR):
+        path = os.path.join(SECTION_CACHE_DIR, name)
+        try:
+            if now - os.stat(path).st_mtime > LLM_CACHE_MAX_AGE_DAYS * 86400:
+                os.remove(path)
+        except OSError:
+            continue
+
+
+def block_digest(block) -> str:
+    return hashlib.sha256((block or "").encode("utf-8")).hexdigest()[:16]
+
+
+@metrics.timed()
+def render_incremental(data: dict, narrative: dict, date_label: str, filename: str, state: dict) -> str:
+    """
+    HTML siap publish. Jika report yang sama sudah ada di docs/, hanya section
+    yang hash input-nya berubah — atau yang isinya di file sudah diubah pihak
+    lain (intraday.py) — yang dirender dan di-splice; sisanya dipakai apa adanya.
+    state diupdate in-place.
+    """
+    sids = render_report.SECTIONS + ("DATA",)
+    hashes = render_report.section_hashes(data, narrative, date_label)
+    path = os.path.join(DOCS_DIR, filename)
+    old = state.get("sections", {})
+    html = None
+    if state.get("page") == hashes["PAGE"] and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            html = f.read()
+        stale = [sid for sid in sids
+                 if old.get(sid) != [hashes[sid], block_digest(render_report.extract(html, sid))]]
+        fresh = render_report.render_sections(data, narrative, date_label, stale)
+        for sid in stale:
+            html = render_report.splice(html, sid, assets.minify_html(render_report.section(sid, fresh[sid])))
+            if html is None:
+                break
+        if html is not None:
+            metrics.branch("splice")
+            log(f"♻️ {filename}: section dirender ulang {', '.join(stale) or 'tidak ada'} "
+                f"({len(sids) - len(stale)}/{len(sids)} dari cache)")
+    if html is None:
+        metrics.branch("full")
+        html = assets.publish(render_report.render(data, narrative, date_label))
+    state["page"] = hashes["PAGE"]
+    state["sections"] = {sid: [hashes[sid], block_digest(render_report.extract(html, sid))] for sid in sids}
+    return html
+
+
+def link_output(filename: str):
+    """outputs/<file> → symlink relatif ke docs/<file>; salin jika FS tidak mendukung symlink."""
+    out_path = os.path.join(OUTPUT_DIR, filename)
+    target = os.path.relpath(os.path.join(DOCS_DIR, filename), OUTPUT_DIR)
+    if os.path.lexists(out_path):
+        if os.path.islink(out_path) and os.readlink(out_path) == target:
+            return
+        os.remove(out_path)
+    try:
+        os.symlink(target, out_path)
+    except OSError:
+        shutil.copyfile(os.path.join(DOCS_DIR, filename), out_path)
+
+
+@metrics.timed()
+def save_outputs(html: str, date_str: str, pair: str = PRIMARY_PAIR, src_path: str = None,
+                 publish_latest: bool = True, published: bool = False):
+    """
+    Simpan report. src_path = file hasil streaming yang dipindah (html diabaikan).
+    publish_latest=False (backfill) → docs/index.html & latest_report.txt tidak disentuh.
+    published=True → html sudah lewat assets.publish (render_incremental), ditulis apa adanya.
+    """
+    filename = report_filename(pair, date_str)
+
+    # Satu salinan kanonik di docs/ (GitHub Pages): CSS/JS bersama ke
+    # docs/assets/, HTML diminify
     docs_path = os.path.join(DOCS_DIR, filename)
+    if src_path:
+        with open(src_path, "r", encoding="utf-8") as f:
+            html = f.read()
+        os.remove(src_path)
     with open(docs_path, "w", encoding="utf-8") as f:
-        f.write(html)
+        f.write(html if published else assets.publish(html))
+    log(f"💾 Disimpan: {docs_path}")
+
+    # outputs/ hanya symlink ke docs/
+    link_output(filename)
+    deploy_pages.register(filename)
+
+    if pair != PRIMARY_PAIR or not publish_latest:
+        log(f"🌐 GitHub Pages: docs/{filename}")
+        return filename
 
     # Update docs/index.html sebagai halaman utama GitHub Pages
     index_html = f"""<!DOCTYPE html>
@@ -280,20 +1105,76 @@ def save_outputs(html: str, date_str: str):
     return filename
 
 
-def main():
-    if not GEMINI_API_KEY:
-        log("❌ GEMINI_API_KEY tidak ada di environment!")
-        exit(1)
-
-    log(f"🚀 Generate report untuk {TODAY}")
+@metrics.timed()
+def build_report(data: dict, publish_latest: bool = True) -> str:
+    """Generate + simpan report untuk satu market_data (pair & tanggal dari meta). Return filename."""
+    pair = data["meta"].get("pair", PRIMARY_PAIR)
+    day = report_date(data)
+    date_str, date_label = day.isoformat(), day.strftime("%d %b %Y")
+    if REPORT_MODE == "llm" and GEMINI_STREAM:
+        part_path = os.path.join(DOCS_DIR, report_filename(pair, date_str) + ".part")
+        try:
+            stream_glm(fit_prompt(data), part_path)
+            metrics.branch("llm_stream")
+            return save_outputs(None, date_str, pair, src_path=part_path, publish_latest=publish_latest)
+        except (StreamAborted, LLMUnavailable, TruncatedOutput) as e:
+            log(f"❌ Stream {pair_label(pair)} {date_str} dibatalkan: {e} — fallback ke renderer lokal")
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            metrics.branch("local_fallback")
+            html = render_report.render(data, fallback_narrative(data), date_label)
+    elif REPORT_MODE == "llm":
+        try:
+            html = extract_html(call_glm(fit_prompt(data)))
+            metrics.branch("llm")
+        except (LLMUnavailable, TruncatedOutput, requests.RequestException) as e:
+            log(f"❌ Gemini {pair_label(pair)} {date_str} gagal: {e} — fallback ke renderer lokal")
+            metrics.branch("local_fallback")
+            html = render_report.render(data, fallback_narrative(data), date_label)
+    else:
+        metrics.branch("local")
+        filename = report_filename(pair, date_str)
+        state = load_section_state(filename)
+        narrative = generate_narrative(data, state.setdefault("narrative", {}))
+        html = render_incremental(data, narrative, date_label, filename, state)
+        filename = save_outputs(html, date_str, pair, publish_latest=publish_latest, published=True)
+        save_section_state(filename, state)
+        return filename
+    return save_outputs(html, date_str, pair, publish_latest=publish_latest)
+
+
+def generate_pair(pair: str) -> tuple:
+    """Generate + simpan report satu pair hari ini. Return (filename, data)."""
+    data = load_data(pair)
+    filename = build_report(data)
+    log(f"✅ Report {pair_label(pair)} selesai: {filename}")
+    return filename, data
 
-    data = load_data()
-    prompt = build_prompt(data)
-    raw_response = call_glm(prompt)
-    html = extract_html(raw_response)
-    filename = save_outputs(html, TODAY.isoformat())
 
-    log(f"✅ Report selesai: {filename}")
+def main():
+    if not GEMINI_API_KEY:
+        if REPORT_MODE == "llm":
+            log("❌ GEMINI_API_KEY tidak ada di environment!")
+            exit(1)
+        log("⚠️ GEMINI_API_KEY tidak ada — report dirender dengan narasi deterministik")
+
+    log(f"🚀 Generate report untuk {TODAY} — {', '.join(pair_label(p) for p in PAIRS)}")
+    set_deadline(GEMINI_BUDGET_S)
+    section_cache_evict()
+
+    pairs = [p for p in PAIRS if os.path.exists(data_path(p))]
+    with ThreadPoolExecutor(max_workers=max(1, min(REPORT_WORKERS, len(pairs)))) as pool:
+        futures = {p: pool.submit(generate_pair, p) for p in pairs}
+    results = {}
+    for p, fut in futures.items():
+        try:
+            results[p] = fut.result()
+        except Exception as e:
+            log(f"❌ Report {pair_label(p)} gagal: {e}")
+    write_attempt_log()
+    if PRIMARY_PAIR not in results:
+        raise SystemExit(f"❌ Report utama {pair_label(PRIMARY_PAIR)} gagal digenerate")
+    filename, data = results[PRIMARY_PAIR]
 
     # Simpan telegram message untuk step berikutnya
     data_spot = data["spot"]
@@ -310,8 +1191,13 @@ def main():
         f"🟢 Bullish Catalyst: {best_bull}\n"
         f"🔴 Highest Risk: {worst_bear}\n"
         f"🌐 Key Macro Driver: BI Rate {data['bi_rate']['rate']}% · DXY {data['dxy'].get('value','N/A')}\n"
-        f"📎 [{filename}]"
     )
+    others = [p for p in results if p != PRIMARY_PAIR]
+    if others:
+        telegram_msg += "💱 " + " · ".join(
+            f"{pair_label(p)} {results[p][1]['spot']['value']}" for p in others
+        ) + "\n"
+    telegram_msg += f"📎 [{filename}]"
     with open("data/telegram_msg.txt", "w", encoding="utf-8") as f:
         f.write(telegram_msg)
 
@@ -319,4 +1205,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with metrics.run("generate_report"):
+        main()
@@ -0,0 +1,56 @@
+"""
+html_extract.py
+Parsing HTML terarah untuk scraper: lxml pull parser yang hanya melaporkan
+tag kandidat dan di-feed per chunk, jadi parsing berhenti begitu pemanggil
+sudah mendapat cukup (sisa halaman tidak pernah di-parse).
+
+  for title in headlines(r.content, limit=30):       # h1/h2/h3/a, urutan dokumen
+      ...
+  for el in iter_tags(r.content, ("bg-quote", "span")):
+      ...
+
+Dibanding BeautifulSoup(html, "html.parser") tidak ada tree objek Python
+untuk seluruh halaman — lihat bench/bench_parse.py.
+"""
+from lxml import etree
+
+CHUNK = 16 * 1024
+HEADLINE_TAGS = ("h1", "h2", "h3", "a")
+
+
+def iter_tags(html, tags, encoding: str = None, chunk: int = CHUNK):
+    """Yield elemen lxml untuk `tags` saat tag penutupnya selesai di-parse."""
+    if isinstance(html, str):
+        html, encoding = html.encode("utf-8"), "utf-8"
+    parser = etree.HTMLPullParser(events=("end",), tag=tags, encoding=encoding)
+    for i in range(0, len(html), chunk):
+        parser.feed(html[i:i + chunk])
+        for _, el in parser.read_events():
+            yield el
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        return  # dokumen kosong
+    for _, el in parser.read_events():
+        yield el
+
+
+def charset(resp):
+    """Charset dari header Content-Type, atau None (biar lxml membaca <meta charset>)."""
+    ctype = resp.headers.get("Content-Type", "")
+    return ctype.split("charset=", 1)[1].split(";")[0].strip() if "charset=" in ctype else None
+
+
+def text(el) -> str:
+    """Setara get_text(strip=True) BeautifulSoup."""
+    return "".join(s.strip() for s in el.itertext())
+
+
+def headlines(html, limit: int = 30, min_len: int = 20, encoding: str = None, tags=HEADLINE_TAGS):
+    """Teks dari `limit` elemen kandidat pertama yang panjangnya >= min_len."""
+    for n, el in enumerate(iter_tags(html, tags, encoding), 1):
+        title = text(el)
+        if len(title) >= min_len:
+            yield title
+        if n >= limit:
+            return
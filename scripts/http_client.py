@@ -0,0 +1,226 @@
+"""
+http_client.py
+Satu HTTP client bersama untuk semua fetcher:
+  - requests.Session dengan connection pool (keep-alive antar request)
+  - cache on-disk di data/http_cache/ yang menghormati Cache-Control,
+    Expires, ETag dan Last-Modified
+  - revalidasi 304 → body diambil dari cache, tidak di-download ulang
+
+Pemakaian sama seperti requests:
+    import http_client
+    r = http_client.get(url, params={...}, timeout=10)
+    r.json(); r.from_cache  # True jika body berasal dari cache
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+import email.utils
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+import metrics
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# ── Config ───────────────────────────────────────────────────────────────────
+CACHE_DIR = os.environ.get("HTTP_CACHE_DIR", "data/http_cache")
+CACHE_ENABLED = os.environ.get("HTTP_CACHE", "1") != "0"
+# Arahkan SEMUA request ke satu server pengganti (bench/standin_server.py):
+# https://host/path?q → <HTTP_UPSTREAM>/host/path?q
+UPSTREAM = os.environ.get("HTTP_UPSTREAM", "").rstrip("/")
+POOL_SIZE = 16
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; USDIDR-Radar/1.0)"}
+# Header transport yang tidak relevan untuk body yang sudah di-decode
+_SKIP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE))
+SESSION.mount("http://", HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE))
+SESSION.headers.update(DEFAULT_HEADERS)
+
+_lock = threading.Lock()
+
+
+# ── Cache entry helpers ──────────────────────────────────────────────────────
+def _cache_key(url: str, params) -> str:
+    req = requests.Request("GET", url, params=params).prepare()
+    return hashlib.sha256(req.url.encode("utf-8")).hexdigest()
+
+
+def _entry_paths(key: str) -> tuple:
+    base = os.path.join(CACHE_DIR, key[:2], key)
+    return base + ".json", base + ".body"
+
+
+def _load_entry(key: str):
+    meta_path, body_path = _entry_paths(key)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+        return meta, body
+    except (OSError, ValueError):
+        return None, None
+
+
+def _atomic_write(path: str, data: bytes):
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _store_entry(key: str, meta: dict, body: bytes = None):
+    meta_path, body_path = _entry_paths(key)
+    with _lock:
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        if body is not None:
+            _atomic_write(body_path, body)
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+def _cache_control(headers) -> dict:
+    """Parse header Cache-Control → {directive: value|True}."""
+    directives = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        name, _, value = part.partition("=")
+        directives[name] = value.strip('"') if value else True
+    return directives
+
+
+def _expires_at(headers, stored_at: float):
+    """Waktu (epoch) entry kadaluarsa, atau None jika harus revalidasi."""
+    cc = _cache_control(headers)
+    if "no-cache" in cc:
+        return None
+    if "max-age" in cc:
+        try:
+            age = int(headers.get("Age", "0") or 0)
+            return stored_at + int(cc["max-age"]) - age
+        except ValueError:
+            return None
+    if headers.get("Expires"):
+        try:
+            return email.utils.parsedate_to_datetime(headers["Expires"]).timestamp()
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _cacheable(resp) -> bool:
+    cc = _cache_control(resp.headers)
+    if "no-store" in cc:
+        return False
+    has_validator = "ETag" in resp.headers or "Last-Modified" in resp.headers
+    return resp.status_code == 200 and (has_validator or _expires_at(resp.headers, time.time()) is not None)
+
+
+def _response_from_cache(url: str, meta: dict, body: bytes) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = body
+    resp.headers = CaseInsensitiveDict(meta["headers"])
+    resp.url = meta.get("url", url)
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    resp.from_cache = True
+    return resp
+
+
+def _count(resp):
+    """Catat request ke tahap metrics yang aktif (bytes = body yang benar-benar di-download)."""
+    metrics.add_request(resp.from_cache)
+    if not resp.from_cache:
+        metrics.add_bytes(len(resp.content))
+    return resp
+
+
+def _route(url: str) -> str:
+    if not UPSTREAM:
+        return url
+    parts = urlsplit(url)
+    return f"{UPSTREAM}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+
+# ── Public API ───────────────────────────────────────────────────────────────
+def get(url: str, params=None, headers=None, timeout=10, cache: bool = True) -> requests.Response:
+    """
+    GET lewat session bersama. Jika ada entry cache yang masih fresh → tidak
+    ada request sama sekali; jika stale tapi punya validator → conditional
+    request (If-None-Match / If-Modified-Since) dan 304 dilayani dari cache.
+    """
+    if not (cache and CACHE_ENABLED):
+        resp = SESSION.get(_route(url), params=params, headers=headers, timeout=timeout)
+        resp.from_cache = False
+        _count(resp)
+        return resp
+
+    key = _cache_key(url, params)
+    meta, body = _load_entry(key)
+    req_headers = dict(headers or {})
+
+    if meta is not None:
+        expires = meta.get("expires_at")
+        if expires is not None and time.time() < expires:
+            return _count(_response_from_cache(url, meta, body))
+        cached_headers = CaseInsensitiveDict(meta["headers"])
+        if cached_headers.get("ETag"):
+            req_headers["If-None-Match"] = cached_headers["ETag"]
+        if cached_headers.get("Last-Modified"):
+            req_headers["If-Modified-Since"] = cached_headers["Last-Modified"]
+
+    resp = SESSION.get(_route(url), params=params, headers=req_headers, timeout=timeout)
+
+    if resp.status_code == 304 and meta is not None:
+        # Header 304 boleh memperbarui Cache-Control/Expires/ETag
+        merged = CaseInsensitiveDict(meta["headers"])
+        for h in ("Cache-Control", "Expires", "ETag", "Last-Modified", "Date"):
+            if h in resp.headers:
+                merged[h] = resp.headers[h]
+        now = time.time()
+        meta.update(headers=dict(merged), stored_at=now, expires_at=_expires_at(merged, now))
+        _store_entry(key, meta)
+        return _count(_response_from_cache(url, meta, body))
+
+    resp.from_cache = False
+    if _cacheable(resp):
+        now = time.time()
+        _store_entry(key, {
+            "url": _redact(resp.url),
+            "headers": {k: v for k, v in resp.headers.items() if k.lower() not in _SKIP_HEADERS},
+            "stored_at": now,
+            "expires_at": _expires_at(resp.headers, now),
+        }, resp.content)
+    return _count(resp)
+
+
+def _redact(url: str) -> str:
+    """scheme://host/path saja — query (mis. apiKey=) tidak ikut tersimpan di cache."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """POST lewat session bersama (pooled, tidak di-cache)."""
+    return SESSION.post(_route(url), **kwargs)
+
+
+def purge(max_age_days: float = 30):
+    """Hapus entry cache yang tidak tersentuh lebih dari max_age_days."""
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for root, _, files in os.walk(CACHE_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+    return removed
@@ -0,0 +1,265 @@
+"""
+indicators.py
+Engine indikator rolling satu-pass (running sums + monotonic deque).
+
+Semua window dihitung bersamaan dalam satu iterasi atas series:
+  - SMA   → running sum per window                O(n) total
+  - EMA   → rekursi standar (alpha = 2/(w+1))      O(n)
+  - STD   → running sum + sum of squares (sample)  O(n)
+  - MIN/MAX → monotonic deque                      O(n) amortized
+
+Output per indikator berupa list sepanjang series, None untuk index
+sebelum window penuh — sama dengan bentuk historical.ma5 / ma20.
+
+Untuk query window arbitrer atas seluruh riwayat (range 52W / multi-tahun)
+ada RangeIndex: dibangun sekali, lalu tiap query tidak memindai window.
+"""
+import math
+import bisect
+import operator
+from array import array
+from collections import deque
+
+
+def rolling(prices: list, sma=(5, 20), ema=(), std=(), minmax=(), ndigits: int = 2) -> dict:
+    """
+    Hitung banyak indikator sekaligus dalam satu pass.
+
+    Return dict dengan key "ma{w}", "ema{w}", "std{w}", "min{w}", "max{w}".
+    """
+    n = len(prices)
+    out = {}
+    for w in sma:
+        out[f"ma{w}"] = [None] * n
+    for w in ema:
+        out[f"ema{w}"] = [None] * n
+    for w in std:
+        out[f"std{w}"] = [None] * n
+    for w in minmax:
+        out[f"min{w}"] = [None] * n
+        out[f"max{w}"] = [None] * n
+    if not n:
+        return out
+
+    # Geser ke nilai referensi agar sum of squares tidak kehilangan presisi
+    ref = prices[0]
+    sum_windows = sorted(set(sma) | set(std))
+    sums = {w: 0.0 for w in sum_windows}
+    sq_sums = {w: 0.0 for w in std}
+    ema_state = {w: None for w in ema}
+    alphas = {w: 2.0 / (w + 1) for w in ema}
+    min_q = {w: deque() for w in minmax}
+    max_q = {w: deque() for w in minmax}
+
+    for i, p in enumerate(prices):
+        x = p - ref
+        for w in sum_windows:
+            sums[w] += x
+            if i >= w:
+                sums[w] -= prices[i - w] - ref
+        for w in sq_sums:
+            sq_sums[w] += x * x
+            if i >= w:
+                old = prices[i - w] - ref
+                sq_sums[w] -= old * old
+
+        for w in sma:
+            if i >= w - 1:
+                out[f"ma{w}"][i] = round(sums[w] / w + ref, ndigits)
+
+        for w in std:
+            if i >= w - 1 and w > 1:
+                mean = sums[w] / w
+                var = max((sq_sums[w] - w * mean * mean) / (w - 1), 0.0)
+                out[f"std{w}"][i] = round(math.sqrt(var), ndigits)
+
+        for w in ema:
+            # Seed EMA dengan SMA window pertama (konvensi umum)
+            if i == w - 1:
+                ema_state[w] = sum(prices[:w]) / w
+            elif i >= w:
+                ema_state[w] += alphas[w] * (p - ema_state[w])
+            if ema_state[w] is not None:
+                out[f"ema{w}"][i] = round(ema_state[w], ndigits)
+
+        for w in minmax:
+            lo, hi = min_q[w], max_q[w]
+            while lo and prices[lo[-1]] >= p:
+                lo.pop()
+            lo.append(i)
+            while hi and prices[hi[-1]] <= p:
+                hi.pop()
+            hi.append(i)
+            if lo[0] <= i - w:
+                lo.popleft()
+            if hi[0] <= i - w:
+                hi.popleft()
+            if i >= w - 1:
+                out[f"min{w}"][i] = prices[lo[0]]
+                out[f"max{w}"][i] = prices[hi[0]]
+
+    return out
+
+
+def sma(prices: list, window: int, ndigits: int = 2) -> list:
+    return rolling(prices, sma=(window,), ndigits=ndigits)[f"ma{window}"]
+
+
+def last_std(prices: list, window: int):
+    """Sample std dev window terakhir (None jika data kurang)."""
+    if len(prices) < window:
+        return None
+    series = rolling(prices[-window:], sma=(), std=(window,), ndigits=10)[f"std{window}"]
+    return series[-1]
+
+
+class Incremental:
+    """
+    Indikator O(1) per update untuk series yang bar terakhirnya masih bergerak
+    (mode intraday): bar yang sudah final disimpan sebagai running sum / sum of
+    squares / monotonic deque atas w-1 bar terakhir, bar "live" digabung saat
+    query. update() = ganti nilai bar live, roll() = bar live jadi final dan
+    bar baru dimulai. Hasil sama dengan rolling() atas prices + [live].
+    """
+
+    def __init__(self, prices: list, sma=(5, 20), std=(), minmax=(), ndigits: int = 2):
+        self.sma_windows, self.std_windows, self.minmax_windows = tuple(sma), tuple(std), tuple(minmax)
+        self.ndigits = ndigits
+        self.sum_windows = sorted(set(sma) | set(std))
+        self.size = max(self.sum_windows + list(minmax) + [2])
+        self.final = deque(maxlen=self.size)    # bar final terakhir (cukup untuk semua window)
+        self.ref = prices[0] if prices else 0.0
+        self.sums = {w: 0.0 for w in self.sum_windows}
+        self.sq_sums = {w: 0.0 for w in std}
+        self.lo = {w: deque() for w in minmax}  # (index, harga)
+        self.hi = {w: deque() for w in minmax}
+        self.n = 0
+        self.live = None
+        for p in prices[:-1]:
+            self._finalize(p)
+        if prices:
+            self.live = prices[-1]
+
+    def _finalize(self, p: float):
+        i, x = self.n, p - self.ref
+        for w in self.sum_windows:
+            k = w - 1                       # bar final yang ikut window bersama bar live
+            if k <= 0:
+                continue
+            self.sums[w] += x
+            if i >= k:
+                self.sums[w] -= self.final[-k] - self.ref
+            if w in self.sq_sums:
+                self.sq_sums[w] += x * x
+                if i >= k:
+                    old = self.final[-k] - self.ref
+                    self.sq_sums[w] -= old * old
+        for w in self.minmax_windows:
+            lo, hi = self.lo[w], self.hi[w]
+            while lo and lo[-1][1] >= p:
+                lo.pop()
+            lo.append((i, p))
+            while hi and hi[-1][1] <= p:
+                hi.pop()
+            hi.append((i, p))
+            if lo[0][0] <= i - (w - 1):
+                lo.popleft()
+            if hi[0][0] <= i - (w - 1):
+                hi.popleft()
+        self.final.append(p)
+        self.n += 1
+
+    def update(self, price: float):
+        """Ganti nilai bar live (tick intraday di hari yang sama)."""
+        self.live = price
+
+    def roll(self, price: float):
+        """Bar live jadi final, bar baru dimulai dengan `price`."""
+        if self.live is not None:
+            self._finalize(self.live)
+        self.live = price
+
+    def _full(self, w: int) -> bool:
+        return self.live is not None and self.n + 1 >= w
+
+    def sma(self, w: int):
+        if not self._full(w):
+            return None
+        return round((self.sums[w] + self.live - self.ref) / w + self.ref, self.ndigits)
+
+    def std(self, w: int):
+        if not self._full(w) or w < 2:
+            return None
+        x = self.live - self.ref
+        s, sq = self.sums[w] + x, self.sq_sums[w] + x * x
+        mean = s / w
+        return round(math.sqrt(max((sq - w * mean * mean) / (w - 1), 0.0)), self.ndigits)
+
+    def min(self, w: int):
+        if not self._full(w):
+            return None
+        return min(self.lo[w][0][1], self.live) if w > 1 else self.live
+
+    def max(self, w: int):
+        if not self._full(w):
+            return None
+        return max(self.hi[w][0][1], self.live) if w > 1 else self.live
+
+    def prev(self):
+        """Harga bar final terakhir (basis perubahan harian)."""
+        return self.final[-1] if self.final else None
+
+
+class RangeIndex:
+    """
+    Query window [lo, hi) arbitrer atas series statis (mis. isi rate store):
+      - argmin / argmax → sparse table, build O(n log n), query O(1)
+      - rank (jumlah nilai <= x) → merge-sort tree, query O(log² n)
+    Untuk nilai sama, argmin/argmax memilih index paling awal.
+    """
+
+    def __init__(self, prices):
+        self.prices = p = prices
+        n = len(p)
+        self._min = [array("I", range(n))]
+        self._max = [array("I", range(n))]
+        half = 1
+        while 2 * half <= n:
+            lo, hi = self._min[-1], self._max[-1]
+            self._min.append(array("I", (a if p[a] <= p[b] else b for a, b in zip(lo, lo[half:]))))
+            self._max.append(array("I", (a if p[a] >= p[b] else b for a, b in zip(hi, hi[half:]))))
+            half *= 2
+        self.size = size = 1 << max(n - 1, 0).bit_length()
+        tree = [array("d")] * (2 * size)
+        for i, x in enumerate(p):
+            tree[size + i] = array("d", (x,))
+        for i in range(size - 1, 0, -1):   # timsort menggabung dua run terurut secara linear
+            tree[i] = array("d", sorted(tree[2 * i] + tree[2 * i + 1]))
+        self._tree = tree
+
+    def __len__(self):
+        return len(self.prices)
+
+    def _pick(self, table: list, lo: int, hi: int, better) -> int:
+        k = (hi - lo).bit_length() - 1
+        a, b = table[k][lo], table[k][hi - (1 << k)]
+        return a if better(self.prices[a], self.prices[b]) else b
+
+    def argmin(self, lo: int, hi: int) -> int:
+        return self._pick(self._min, lo, hi, operator.le)
+
+    def argmax(self, lo: int, hi: int) -> int:
+        return self._pick(self._max, lo, hi, operator.ge)
+
+    def rank(self, lo: int, hi: int, x: float) -> int:
+        """Jumlah nilai <= x di [lo, hi)."""
+        count, lo, hi = 0, lo + self.size, hi + self.size
+        while lo < hi:
+            if lo & 1:
+                count += bisect.bisect_right(self._tree[lo], x)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                count += bisect.bisect_right(self._tree[hi], x)
+            lo, hi = lo >> 1, hi >> 1
+        return count
@@ -0,0 +1,225 @@
+"""
+intraday.py
+Mode polling intraday (long-running) selama jam Asia: spot Frankfurter, kurs
+BCA dan DXY di-poll dengan interval masing-masing. Tiap tick indikator
+(MA5/MA20, ATR proxy 14D, range & avg 30D) diupdate O(1) lewat
+indicators.Incremental — bar hari ini di-update, bar baru di-roll — lalu hanya
+section data-driven report hari ini (S2–S6 + DATA) yang ditulis ulang, dan
+hanya jika nilainya berubah.
+
+Narasi LLM di S4/S5 dipertahankan dari report pagi; header, twitter,
+telegram dan footer tidak disentuh. Report harian (fetch_data +
+generate_report) harus sudah ada.
+
+  python scripts/intraday.py                    # sampai INTRADAY_UNTIL (WIB)
+  python scripts/intraday.py --ticks 1          # satu putaran (mis. dari cron)
+
+Interval (detik): INTRADAY_SPOT_S, INTRADAY_BCA_S, INTRADAY_DXY_S.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+
+import assets
+import metrics
+import indicators
+import fetch_data
+import render_report
+from fetch_data import log
+from pairs import PRIMARY_PAIR, data_path, pair_label, report_filename
+
+INTERVALS = {
+    "spot": float(os.environ.get("INTRADAY_SPOT_S", "300")),
+    "bca": float(os.environ.get("INTRADAY_BCA_S", "120")),
+    "dxy": float(os.environ.get("INTRADAY_DXY_S", "300")),
+}
+INTRADAY_UNTIL = os.environ.get("INTRADAY_UNTIL", "17:00")   # WIB
+DOCS_DIR = "docs"
+INTRADAY_SECTIONS = ("S2", "S3", "S4", "S5", "S6", "DATA")
+ATR_WINDOW = 14
+SPOT_LOOKBACK = datetime.timedelta(days=7)
+
+
+def wib_now() -> datetime.datetime:
+    return datetime.datetime.utcnow() + datetime.timedelta(hours=7)
+
+
+def quote(d: dict) -> dict:
+    """Nilai yang dibandingkan antar poll (timestamp fetch diabaikan)."""
+    return {k: v for k, v in (d or {}).items() if k != "timestamp"}
+
+
+# ── State ────────────────────────────────────────────────────────────────────
+class Panel:
+    """market_data satu pair + indikator inkremental atas historical.prices."""
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.pair = data["meta"].get("pair", PRIMARY_PAIR)
+        hist = data["historical"]
+        self.window = len(hist["prices"])   # bar dalam range 30D
+        self.ind = indicators.Incremental(
+            hist["prices"], sma=(5, 20, ATR_WINDOW, self.window), std=(ATR_WINDOW,),
+            minmax=(self.window,), ndigits=6,
+        )
+
+    def on_spot(self, rate: dict) -> bool:
+        """Rate Frankfurter terbaru. Tanggal baru → roll bar, tanggal sama → update bar live."""
+        if not rate or not rate.get("prices"):
+            return False
+        hist = self.data["historical"]
+        date, price = rate["dates"][-1], rate["prices"][-1]
+        if date > hist["dates"][-1]:
+            self.ind.roll(price)
+            for key, value in (("dates", date), ("prices", price), ("ma5", None), ("ma20", None)):
+                hist[key].append(value)
+                del hist[key][0]            # window tetap self.window bar
+        elif date == hist["dates"][-1] and price != hist["prices"][-1]:
+            self.ind.update(price)
+            hist["prices"][-1] = price
+        else:
+            return False
+        self.data["spot"].update(label=rate.get("label", "PROXY"), source=rate.get("source"))
+        self._refresh()
+        return True
+
+    def on_bca(self, bca: dict) -> bool:
+        if not bca or quote(bca) == quote(self.data["bca"]):
+            return False
+        self.data["bca"] = bca
+        self._refresh()
+        return True
+
+    def on_dxy(self, dxy: dict) -> bool:
+        if not dxy or dxy.get("value") is None or quote(dxy) == quote(self.data["dxy"]):
+            return False
+        self.data["dxy"] = dxy
+        return True
+
+    def _refresh(self):
+        """Tulis nilai indikator O(1) ke ujung list historical + field turunan."""
+        ind, hist, w = self.ind, self.data["historical"], self.window
+        live, prev = ind.live, ind.prev()
+        for key, win in (("ma5", 5), ("ma20", 20)):
+            value = ind.sma(win)
+            hist[key][-1] = round(value, 2) if value is not None else None
+        hist["range_30d_low"], hist["range_30d_high"] = ind.min(w), ind.max(w)
+        hist["avg_30d"] = round(ind.sma(w), 2)
+        if ind.std(ATR_WINDOW) is not None:
+            self.data["volatility"] = fetch_data.atr_summary(ind.std(ATR_WINDOW), ind.sma(ATR_WINDOW))
+
+        spot = self.data["spot"]
+        spot["value"] = live
+        spot["change_pct"] = round((live - prev) / prev * 100, 3) if prev else 0
+        bca = self.data["bca"]
+        if self.pair == PRIMARY_PAIR and bca.get("mid") and bca.get("label") == "LIVE":
+            spot["value"] = bca["mid"]
+
+    def sections(self, narrative: dict) -> dict:
+        return render_report.render_sections(self.data, narrative, "", INTRADAY_SECTIONS)
+
+
+# ── Publish ──────────────────────────────────────────────────────────────────
+def write_atomic(path: str, text: str):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def publish(panel: Panel, report_path: str) -> list:
+    """Splice section yang berubah ke report (bentuk minified seperti assets.publish). Return sid yang ditulis."""
+    with open(report_path, "r", encoding="utf-8") as f:
+        html = f.read()
+    fresh = panel.sections(render_report.narrative_from(html))
+    changed = []
+    for sid in INTRADAY_SECTIONS:
+        block = assets.minify_html(render_report.section(sid, fresh[sid]))
+        if render_report.extract(html, sid) in (None, block):
+            continue                        # marker tidak ada (report LLM) atau tidak berubah
+        html = render_report.splice(html, sid, block)
+        changed.append(sid)
+    if changed:
+        write_atomic(report_path, html)
+    return changed
+
+
+# ── Loop ─────────────────────────────────────────────────────────────────────
+def pollers(panel: Panel) -> dict:
+    """{nama: fn() → bool berubah}; BCA hanya untuk USD/IDR (sama seperti build_market_data)."""
+    today = fetch_data.TODAY
+    out = {
+        "spot": lambda: panel.on_spot(
+            fetch_data.fetch_frankfurter([panel.pair], today - SPOT_LOOKBACK, today)[panel.pair]),
+        "dxy": lambda: panel.on_dxy(fetch_data.fetch_dxy()),
+    }
+    if panel.pair == PRIMARY_PAIR:
+        out["bca"] = lambda: panel.on_bca(fetch_data.fetch_bca_rate())
+    return out
+
+
+def run(panel: Panel, report_path: str, until: datetime.time, ticks: int = 0):
+    polls = pollers(panel)
+    due = dict.fromkeys(polls, 0.0)
+    rounds = 0
+    while wib_now().time() < until and (not ticks or rounds < ticks):
+        now = time.monotonic()
+        changed = False
+        for name, fn in polls.items():
+            if due[name] > now:
+                continue
+            due[name] = now + INTERVALS[name]
+            try:
+                with metrics.stage(f"intraday.{name}"):
+                    changed |= fn()
+            except Exception as e:
+                log(f"  ⚠️ Poll {name} gagal: {e}")
+
+        if changed:
+            with metrics.stage("intraday.publish"):
+                written = publish(panel, report_path)
+            panel.data["meta"]["intraday_at_wib"] = wib_now().strftime("%H:%M WIB")
+            write_atomic(data_path(panel.pair), json.dumps(panel.data, indent=2, ensure_ascii=False))
+            spot = panel.data["spot"]
+            log(f"🔄 {pair_label(panel.pair)} {spot['value']} ({spot['change_pct']:+}%) — "
+                f"section ditulis ulang: {', '.join(written) or 'tidak ada'}")
+        metrics.flush("intraday")
+        rounds += 1
+        if ticks and rounds >= ticks:
+            break
+        time.sleep(max(0.0, min(due.values()) - time.monotonic()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Polling intraday + update report inkremental.")
+    parser.add_argument("--pair", default=PRIMARY_PAIR)
+    parser.add_argument("--until", default=INTRADAY_UNTIL, help="jam berhenti (WIB, HH:MM)")
+    parser.add_argument("--ticks", type=int, default=0, help="jumlah putaran poll (0 = sampai --until)")
+    args = parser.parse_args(argv)
+
+    path = data_path(args.pair)
+    if not os.path.exists(path):
+        log(f"❌ {path} belum ada — jalankan fetch_data.py + generate_report.py dulu")
+        sys.exit(1)
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not data["historical"].get("prices"):
+        log("❌ historical.prices kosong — tidak ada basis indikator")
+        sys.exit(1)
+    report_path = os.path.join(DOCS_DIR, report_filename(args.pair, data["meta"]["date"]))
+    if not os.path.exists(report_path):
+        log(f"❌ Report {report_path} belum ada — jalankan generate_report.py dulu")
+        sys.exit(1)
+
+    until = datetime.time.fromisoformat(args.until)
+    log(f"⏱️ Intraday {pair_label(args.pair)} sampai {args.until} WIB — interval "
+        + ", ".join(f"{k} {v:.0f}s" for k, v in INTERVALS.items()))
+    run(Panel(data), report_path, until, args.ticks)
+
+
+if __name__ == "__main__":
+    with metrics.run("intraday"):
+        main()
@@ -0,0 +1,358 @@
+"""
+market_calendar.py
+Kalender hari kerja multi-tahun berbasis aturan (pengganti daftar
+HOLIDAYS_2026 yang di-hardcode per tahun).
+
+Pasar:
+  ID  — libur nasional + cuti bersama Indonesia
+  US  — US Federal holiday (relevan untuk data USD)
+  ECB — hari libur TARGET: tanggal tanpa fixing ECB = tanpa data Frankfurter
+
+Libur tanggal tetap, berbasis Paskah (computus) dan aturan "Senin ketiga
+Januari" dihitung untuk tahun berapa pun. Libur kalender bulan (Islam, Imlek,
+Nyepi, Waisak) dan cuti bersama diambil dari ID_OFFICIAL (SKB 3 Menteri);
+tahun yang belum ada di tabel memakai estimasi astronomis ±1 hari (namanya
+diberi akhiran "estimasi"). File TSV MARKET_HOLIDAYS_FILE menambah atau
+menghapus tanggal tanpa ubah kode.
+
+Libur tiap tahun dikompilasi sekali jadi bitset hari kerja; dari situ satu
+index per rentang tahun (jumlah hari kerja kumulatif + hari kerja
+berikut/sebelumnya per tanggal) membuat semua query O(1):
+
+  cal = MarketCalendar(("ID", "US"))
+  cal.is_business_day(d); cal.holiday_name(d)
+  cal.next_business_day(d); cal.prev_business_day(d)
+  cal.count(start, end)                 # jumlah hari kerja, inklusif
+  cal.business_days(start, end)         # list, O(hasil)
+"""
+import os
+import math
+import datetime
+from array import array
+
+MARKET_HOLIDAYS_FILE = os.environ.get("MARKET_HOLIDAYS_FILE", "")
+DEFAULT_MARKETS = ("ID", "US")
+ESTIMATED = " (estimasi)"
+
+# ── Tanggal resmi (SKB) libur kalender bulan + cuti bersama Indonesia ───────
+# Libur tanggal tetap dan berbasis Paskah tidak perlu ditulis di sini.
+ID_OFFICIAL = {
+    2025: {
+        "2025-01-27": "Isra Mikraj",
+        "2025-01-28": "Cuti bersama Imlek",
+        "2025-01-29": "Tahun Baru Imlek",
+        "2025-03-28": "Cuti bersama Nyepi",
+        "2025-03-29": "Hari Raya Nyepi",
+        "2025-03-31": "Idul Fitri",
+        "2025-04-01": "Idul Fitri",
+        "2025-04-02": "Cuti bersama Idul Fitri",
+        "2025-04-03": "Cuti bersama Idul Fitri",
+        "2025-04-04": "Cuti bersama Idul Fitri",
+        "2025-04-07": "Cuti bersama Idul Fitri",
+        "2025-05-12": "Hari Raya Waisak",
+        "2025-05-13": "Cuti bersama Waisak",
+        "2025-05-30": "Cuti bersama Kenaikan Isa Almasih",
+        "2025-06-06": "Idul Adha",
+        "2025-06-09": "Cuti bersama Idul Adha",
+        "2025-06-27": "Tahun Baru Islam",
+        "2025-08-18": "Cuti bersama HUT RI",
+        "2025-09-05": "Maulid Nabi",
+        "2025-12-26": "Cuti bersama Natal",
+    },
+    2026: {
+        "2026-01-16": "Isra Mikraj",
+        "2026-02-16": "Cuti bersama Imlek",
+        "2026-02-17": "Tahun Baru Imlek",
+        "2026-03-18": "Cuti bersama Nyepi",
+        "2026-03-19": "Hari Raya Nyepi",
+        "2026-03-20": "Cuti bersama Idul Fitri",
+        "2026-03-21": "Idul Fitri",
+        "2026-03-22": "Idul Fitri",
+        "2026-03-23": "Cuti bersama Idul Fitri",
+        "2026-03-24": "Cuti bersama Idul Fitri",
+        "2026-05-15": "Cuti bersama Kenaikan Isa Almasih",
+        "2026-05-27": "Idul Adha",
+        "2026-05-28": "Cuti bersama Idul Adha",
+        "2026-05-31": "Hari Raya Waisak",
+        "2026-06-16": "Tahun Baru Islam",
+        "2026-08-25": "Maulid Nabi",
+        "2026-12-24": "Cuti bersama Natal",
+    },
+}
+
+
+# ── Aturan ───────────────────────────────────────────────────────────────────
+def easter(year: int) -> datetime.date:
+    """Minggu Paskah (computus Gregorian anonim)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+
+def nth_weekday(year: int, month: int, weekday: int, n: int) -> datetime.date:
+    """Hari ke-n (0=Senin) dalam bulan; n=-1 → yang terakhir."""
+    if n > 0:
+        first = datetime.date(year, month, 1)
+        return first + datetime.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.timedelta(days=1)
+    return last - datetime.timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def observed(day: datetime.date) -> datetime.date:
+    """Aturan federal US: Sabtu → Jumat sebelumnya, Minggu → Senin."""
+    shift = {5: -1, 6: 1}.get(day.weekday(), 0)
+    return day + datetime.timedelta(days=shift)
+
+
+def hijri(year: int, month: int, day: int) -> datetime.date:
+    """Kalender Hijriah tabular (aritmetis) — beda ±1 hari dari isbat."""
+    days = day + math.ceil(29.5 * (month - 1)) + (year - 1) * 354 + (3 + 11 * year) // 30
+    return datetime.date.fromordinal(HIJRI_EPOCH + days - 1)
+
+
+HIJRI_EPOCH = datetime.date(622, 7, 19).toordinal()   # 1 Muharram 1 H
+
+
+def moon_phases(year: int, phase: float, utc_offset: float) -> list:
+    """
+    Tanggal lokal bulan baru (phase 0) / purnama (0.5) sepanjang `year`.
+    Meeus bab 49, suku koreksi utama saja (galat < ±20 menit).
+    """
+    out = []
+    k0 = math.floor((year - 2000) * 12.3685) - 1
+    for n in range(k0, k0 + 15):
+        k = n + phase
+        t = k / 1236.85
+        jde = 2451550.09766 + 29.530588861 * k + 0.00015437 * t * t
+        e = 1 - 0.002516 * t - 0.0000074 * t * t
+        m = math.radians(2.5534 + 29.10535670 * k)
+        mp = math.radians(201.5643 + 385.81693528 * k + 0.0107582 * t * t)
+        f = math.radians(160.7108 + 390.67050284 * k - 0.0016118 * t * t)
+        c = (0.17241 if not phase else 0.17302) * e * math.sin(m) - (0.40720 if not phase else 0.40614) * math.sin(mp)
+        c += 0.01608 * math.sin(2 * mp) + 0.01039 * math.sin(2 * f) + 0.00739 * e * math.sin(mp - m)
+        c += -0.00514 * e * math.sin(mp + m) + 0.00208 * e * e * math.sin(2 * m)
+        # JD 1721424.5 = tengah malam sebelum ordinal 1 (0001-01-01)
+        day = datetime.date.fromordinal(int(jde + c + utc_offset / 24 - 1721424.5))
+        if day.year == year:
+            out.append(day)
+    return out
+
+
+def first_in(days: list, lo: datetime.date, hi: datetime.date):
+    return next((d for d in days if lo <= d <= hi), None)
+
+
+def id_lunar_estimates(year: int) -> dict:
+    """Libur kalender bulan Indonesia untuk tahun tanpa tanggal resmi."""
+    out = {}
+
+    def add(day, name):
+        out[day] = f"{out[day]} / {name}" if day in out else name
+
+    hy = (year - 622) * 33 // 32
+    for hy in (hy - 1, hy, hy + 1):                   # tahun Hijriah yang beririsan
+        for (m, d), name in {(7, 27): "Isra Mikraj", (10, 1): "Idul Fitri", (10, 2): "Idul Fitri",
+                             (12, 10): "Idul Adha", (1, 1): "Tahun Baru Islam",
+                             (3, 12): "Maulid Nabi"}.items():
+            day = hijri(hy, m, d)
+            if day.year == year:
+                add(day, name)
+    # Imlek: bulan baru (UTC+8) 21 Jan–20 Feb; Waisak: purnama (WIB) 7 Mei–5 Jun;
+    # Nyepi: sehari setelah tilem Kesanga (bulan baru Maret, WITA)
+    imlek = first_in(moon_phases(year, 0, 8), datetime.date(year, 1, 21), datetime.date(year, 2, 20))
+    waisak = first_in(moon_phases(year, 0.5, 7), datetime.date(year, 5, 7), datetime.date(year, 6, 5))
+    tilem = first_in(moon_phases(year, 0, 8), datetime.date(year, 3, 1), datetime.date(year, 3, 31))
+    for day, name in ((imlek, "Tahun Baru Imlek"), (waisak, "Hari Raya Waisak"),
+                      (tilem and tilem + datetime.timedelta(days=1), "Hari Raya Nyepi")):
+        if day:
+            add(day, name)
+    return {day: name + ESTIMATED for day, name in out.items()}
+
+
+def rule_holidays(market: str, year: int) -> dict:
+    """{date: nama} satu pasar untuk satu tahun (weekend tidak termasuk)."""
+    d = datetime.date
+    paskah = easter(year)
+    if market == "ID":
+        out = {
+            d(year, 1, 1): "Tahun Baru", d(year, 5, 1): "Hari Buruh",
+            d(year, 6, 1): "Hari Lahir Pancasila", d(year, 8, 17): "HUT RI",
+            d(year, 12, 25): "Natal",
+            paskah - datetime.timedelta(days=2): "Wafat Isa Almasih",
+            paskah + datetime.timedelta(days=39): "Kenaikan Isa Almasih",
+        }
+        if year in ID_OFFICIAL:
+            out.update({d.fromisoformat(k): v for k, v in ID_OFFICIAL[year].items()})
+        else:
+            out.update(id_lunar_estimates(year))
+        return out
+    if market == "US":
+        fixed = {"New Year's Day": (1, 1), "Independence Day": (7, 4), "Christmas": (12, 25)}
+        if year >= 2021:
+            fixed["Juneteenth"] = (6, 19)
+        out = {}
+        for y in (year, year + 1):                 # 1 Jan Sabtu → observed 31 Des tahun sebelumnya
+            for name, (month, day) in fixed.items():
+                obs = observed(d(y, month, day))
+                if obs.year == year:
+                    out[obs] = name if obs.day == day else f"{name} (observed)"
+        out.update({
+            nth_weekday(year, 1, 0, 3): "Martin Luther King Jr. Day",
+            nth_weekday(year, 2, 0, 3): "Presidents' Day",
+            nth_weekday(year, 5, 0, -1): "Memorial Day",
+            nth_weekday(year, 9, 0, 1): "Labor Day",
+            nth_weekday(year, 11, 3, 4): "Thanksgiving",
+        })
+        return out
+    if market == "ECB":
+        return {
+            d(year, 1, 1): "New Year's Day", paskah - datetime.timedelta(days=2): "Good Friday",
+            paskah + datetime.timedelta(days=1): "Easter Monday", d(year, 5, 1): "Labour Day",
+            d(year, 12, 25): "Christmas", d(year, 12, 26): "Boxing Day",
+        }
+    raise ValueError(f"Pasar tidak dikenal: {market}")
+
+
+def load_extra(path: str) -> dict:
+    """
+    Baca TSV `YYYY-MM-DD<TAB>pasar<TAB>nama` (baris kosong / '#' diabaikan).
+    Nama "-" menghapus tanggal itu dari libur pasar tersebut.
+    """
+    extra = {}
+    if not path:
+        return extra
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            day, market, name = (line.split("\t") + ["", ""])[:3]
+            key = (market.strip().upper() or "ID", datetime.date.fromisoformat(day.strip()))
+            extra[key] = name.strip() or "Libur"
+    return extra
+
+
+# ── Kalender ─────────────────────────────────────────────────────────────────
+class MarketCalendar:
+    """Gabungan libur beberapa pasar: hari kerja = bukan weekend dan tidak libur di pasar mana pun."""
+
+    def __init__(self, markets=DEFAULT_MARKETS, extra: dict = None):
+        self.markets = tuple(markets)
+        self.extra = load_extra(MARKET_HOLIDAYS_FILE) if extra is None else extra
+        self._years = {}        # tahun → (bitset hari kerja, {ordinal: nama libur})
+        self._span = None       # (tahun_awal, tahun_akhir) yang sudah di-index
+        self._base = 0          # ordinal hari pertama index
+        self._before = array("I")   # hari kerja di [base, base+i)
+        self._next = array("I")     # ordinal hari kerja pertama >= base+i (0 = di luar index)
+        self._prev = array("I")     # ordinal hari kerja terakhir <= base+i
+
+    def holidays(self, year: int) -> dict:
+        """{date: nama} semua pasar untuk satu tahun; nama digabung jika libur di beberapa pasar."""
+        out = {}
+        for market in self.markets:
+            named = rule_holidays(market, year)
+            for (m, day), name in self.extra.items():
+                if m == market and day.year == year:
+                    if name == "-":
+                        named.pop(day, None)
+                    else:
+                        named[day] = name
+            for day, name in named.items():
+                if name not in out.setdefault(day, []):
+                    out[day].append(name)
+        return {day: " / ".join(names) for day, names in sorted(out.items())}
+
+    def year_bits(self, year: int) -> tuple:
+        """(bitset, nama): bit i = 1 jika hari ke-i (0 = 1 Januari) hari kerja."""
+        if year not in self._years:
+            jan1 = datetime.date(year, 1, 1).toordinal()
+            ndays = datetime.date(year + 1, 1, 1).toordinal() - jan1
+            names = {day.toordinal(): name for day, name in self.holidays(year).items()}
+            bits = 0
+            for i in range(ndays):
+                # ordinal 1 (0001-01-01) = Senin → (ordinal - 1) % 7 = weekday()
+                if (jan1 + i - 1) % 7 < 5 and jan1 + i not in names:
+                    bits |= 1 << i
+            self._years[year] = (bits, names)
+        return self._years[year]
+
+    def _build(self, lo: int, hi: int):
+        """Index kumulatif untuk tahun lo..hi (dibangun ulang saat rentang melebar)."""
+        base = datetime.date(lo, 1, 1).toordinal()
+        flags = []
+        for year in range(lo, hi + 1):
+            bits, _ = self.year_bits(year)
+            n = datetime.date(year + 1, 1, 1).toordinal() - datetime.date(year, 1, 1).toordinal()
+            flags.extend((bits >> i) & 1 for i in range(n))
+        before, prev, running, last = array("I", [0]), array("I"), 0, 0
+        for i, flag in enumerate(flags):
+            running += flag
+            before.append(running)
+            last = base + i if flag else last
+            prev.append(last)
+        nxt, upcoming = array("I", bytes(4 * len(flags))), 0
+        for i in range(len(flags) - 1, -1, -1):
+            upcoming = base + i if flags[i] else upcoming
+            nxt[i] = upcoming
+        self._span, self._base = (lo, hi), base
+        self._before, self._prev, self._next = before, prev, nxt
+
+    def _index(self, day: datetime.date) -> int:
+        """Posisi `day` di index; margin satu tahun di kiri-kanan untuk next/prev."""
+        lo, hi = day.year - 1, day.year + 1
+        if self._span is None or lo < self._span[0] or hi > self._span[1]:
+            span = self._span or (lo, hi)
+            self._build(min(lo, span[0]), max(hi, span[1]))
+        return day.toordinal() - self._base
+
+    def is_business_day(self, day: datetime.date) -> bool:
+        bits, _ = self.year_bits(day.year)
+        return bool(bits >> (day.timetuple().tm_yday - 1) & 1)
+
+    def holiday_name(self, day: datetime.date):
+        """Nama libur, atau None (hari kerja maupun weekend biasa)."""
+        return self.year_bits(day.year)[1].get(day.toordinal())
+
+    def next_business_day(self, day: datetime.date, inclusive: bool = False) -> datetime.date:
+        if not inclusive:
+            day += datetime.timedelta(days=1)
+        i = self._index(day)                  # bisa membangun ulang index — ambil array sesudahnya
+        return datetime.date.fromordinal(self._next[i])
+
+    def prev_business_day(self, day: datetime.date, inclusive: bool = False) -> datetime.date:
+        if not inclusive:
+            day -= datetime.timedelta(days=1)
+        i = self._index(day)
+        return datetime.date.fromordinal(self._prev[i])
+
+    def count(self, start: datetime.date, end: datetime.date) -> int:
+        """Jumlah hari kerja start..end (inklusif)."""
+        if end < start:
+            return 0
+        self._index(start), self._index(end)     # pastikan index mencakup keduanya dulu
+        return self._before[self._index(end) + 1] - self._before[self._index(start)]
+
+    def business_days(self, start: datetime.date, end: datetime.date) -> list:
+        out = []
+        day = self.next_business_day(start, inclusive=True)
+        while day <= end:
+            out.append(day)
+            day = self.next_business_day(day)
+        return out
+
+
+_CALENDARS = {}
+
+
+def calendar(*markets) -> MarketCalendar:
+    """Instance bersama per kombinasi pasar (bitset tiap tahun cukup dikompilasi sekali)."""
+    markets = markets or DEFAULT_MARKETS
+    if markets not in _CALENDARS:
+        _CALENDARS[markets] = MarketCalendar(markets)
+    return _CALENDARS[markets]
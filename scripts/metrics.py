@@ -0,0 +1,239 @@
+"""
+metrics.py
+Instrumentasi per tahap pipeline + ledger run di data/metrics.jsonl.
+
+Setiap tahap (fungsi yang dibungkus @timed atau `with stage(...)`) mencatat:
+  duration_s, bytes (body HTTP yang diterima), requests, cache_hits,
+  retries, tokens_in / tokens_out (usage LLM), branch (cabang fallback
+  yang menang) dan status ok|error.
+Counter diatribusikan ke tahap terdalam yang sedang berjalan di thread
+yang sama, jadi fetcher paralel (satu thread per sumber) tidak tercampur.
+
+Satu baris JSON per run script (lihat run()). Ringkasan p50/p95 per tahap:
+
+  python scripts/metrics.py [--last 30] [--script fetch_data]
+"""
+import os
+import sys
+import json
+import math
+import time
+import uuid
+import argparse
+import datetime
+import threading
+import functools
+from contextlib import contextmanager
+
+METRICS_PATH = os.environ.get("METRICS_PATH", "data/metrics.jsonl")
+
+_local = threading.local()
+_lock = threading.Lock()
+_stages = []
+_run_started = time.perf_counter()
+
+
+def _stack() -> list:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def _current():
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+# ── Counter (dipanggil dari kode yang sedang berada di dalam tahap) ─────────
+def add_bytes(n: int):
+    rec = _current()
+    if rec is not None:
+        rec["bytes"] += n
+
+
+def add_request(from_cache: bool = False):
+    rec = _current()
+    if rec is not None:
+        rec["requests"] += 1
+        rec["cache_hits"] += bool(from_cache)
+
+
+def add_retry(n: int = 1):
+    rec = _current()
+    if rec is not None:
+        rec["retries"] += n
+
+
+def add_tokens(prompt: int, output: int):
+    """Token LLM aktual (usageMetadata): prompt → tokens_in, kandidat + thinking → tokens_out."""
+    rec = _current()
+    if rec is not None:
+        rec["tokens_in"] += prompt
+        rec["tokens_out"] += output
+
+
+def branch(name: str):
+    """Tandai cabang fallback yang menghasilkan nilai (mis. "tavily", "known_value")."""
+    rec = _current()
+    if rec is not None:
+        rec["branch"] = name
+
+
+@contextmanager
+def stage(name: str):
+    rec = {
+        "name": name, "thread": threading.current_thread().name,
+        "start_s": round(time.perf_counter() - _run_started, 3),
+        "duration_s": None, "bytes": 0, "requests": 0, "cache_hits": 0,
+        "retries": 0, "tokens_in": 0, "tokens_out": 0, "branch": None, "status": "ok",
+    }
+    stack = _stack()
+    stack.append(rec)
+    t0 = time.perf_counter()
+    try:
+        yield rec
+    except BaseException:
+        rec["status"] = "error"
+        raise
+    finally:
+        rec["duration_s"] = round(time.perf_counter() - t0, 3)
+        stack.pop()
+        with _lock:
+            _stages.append(rec)
+
+
+def timed(name: str = None):
+    """Decorator: jalankan fungsi di dalam stage(name or fn.__name__)."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with stage(name or fn.__name__):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+# ── Ledger ───────────────────────────────────────────────────────────────────
+def flush(script: str, status: str = "ok", path: str = METRICS_PATH) -> dict:
+    """Append semua tahap yang tercatat sebagai satu run ke metrics.jsonl."""
+    global _run_started
+    with _lock:
+        stages = sorted(_stages, key=lambda s: s["start_s"])
+        _stages.clear()
+    record = {
+        "run_id": uuid.uuid4().hex[:12],
+        "script": script,
+        "finished_at": datetime.datetime.utcnow().isoformat() + "Z",
+        "wall_s": round(time.perf_counter() - _run_started, 3),
+        "status": status,
+        "stages": stages,
+    }
+    _run_started = time.perf_counter()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return record
+
+
+@contextmanager
+def run(script: str):
+    """Bungkus main() sebuah script: run selalu di-flush, juga saat gagal/exit."""
+    status = "ok"
+    try:
+        yield
+    except SystemExit as e:
+        status = "ok" if e.code in (None, 0) else "error"
+        raise
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        flush(script, status)
+
+
+# ── Report ───────────────────────────────────────────────────────────────────
+def percentile(values: list, pct: float):
+    """Nearest-rank percentile dari list yang sudah terurut."""
+    if not values:
+        return None
+    k = math.ceil(pct / 100 * len(values)) - 1
+    return values[max(0, min(len(values) - 1, k))]
+
+
+def load_runs(path: str = METRICS_PATH, script: str = None, last: int = None) -> list:
+    runs = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    r = json.loads(line)
+                    if script is None or r["script"] == script:
+                        runs.append(r)
+    except OSError:
+        return []
+    return runs[-last:] if last else runs
+
+
+def summarize(runs: list) -> dict:
+    """{(script, stage): {n, p50_s, p95_s, max_s, bytes_avg, retries, errors, branches}}."""
+    groups = {}
+    for r in runs:
+        groups.setdefault((r["script"], "(run)"), []).append(
+            {"duration_s": r["wall_s"], "bytes": 0, "retries": 0, "branch": None, "status": r["status"],
+             "tokens_in": sum(s.get("tokens_in", 0) for s in r["stages"]),
+             "tokens_out": sum(s.get("tokens_out", 0) for s in r["stages"])}
+        )
+        for s in r["stages"]:
+            groups.setdefault((r["script"], s["name"]), []).append(s)
+
+    out = {}
+    for key, stages in groups.items():
+        durations = sorted(s["duration_s"] for s in stages)
+        branches = {}
+        for s in stages:
+            if s.get("branch"):
+                branches[s["branch"]] = branches.get(s["branch"], 0) + 1
+        out[key] = {
+            "n": len(stages),
+            "p50_s": percentile(durations, 50),
+            "p95_s": percentile(durations, 95),
+            "max_s": durations[-1],
+            "bytes_avg": round(sum(s["bytes"] for s in stages) / len(stages)),
+            "retries": sum(s["retries"] for s in stages),
+            "tokens_in_avg": round(sum(s.get("tokens_in", 0) for s in stages) / len(stages)),
+            "tokens_out_avg": round(sum(s.get("tokens_out", 0) for s in stages) / len(stages)),
+            "errors": sum(1 for s in stages if s["status"] != "ok"),
+            "branches": branches,
+        }
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ringkasan p50/p95 per tahap dari data/metrics.jsonl.")
+    parser.add_argument("--last", type=int, default=None, help="hanya N run terakhir (per script)")
+    parser.add_argument("--script", default=None, help="filter script (fetch_data, generate_report, ...)")
+    parser.add_argument("--path", default=METRICS_PATH)
+    args = parser.parse_args(argv)
+
+    runs = load_runs(args.path, args.script)
+    if args.last:
+        per_script = {}
+        for r in runs:
+            per_script.setdefault(r["script"], []).append(r)
+        runs = [r for rs in per_script.values() for r in rs[-args.last:]]
+    if not runs:
+        sys.exit(f"Tidak ada run di {args.path}")
+
+    summary = summarize(runs)
+    print(f"{'script':<16} {'tahap':<22} {'n':>4} {'p50 s':>8} {'p95 s':>8} {'max s':>8} "
+          f"{'KB avg':>8} {'retry':>5} {'err':>4} {'token in/out':>13}  cabang")
+    for (script, name), s in sorted(summary.items(), key=lambda kv: (kv[0][0], -(kv[1]["p50_s"] or 0))):
+        branches = ", ".join(f"{b}×{c}" for b, c in sorted(s["branches"].items(), key=lambda x: -x[1]))
+        tokens = f"{s['tokens_in_avg']}/{s['tokens_out_avg']}" if s["tokens_in_avg"] or s["tokens_out_avg"] else "-"
+        print(f"{script:<16} {name:<22} {s['n']:>4} {s['p50_s']:>8.2f} {s['p95_s']:>8.2f} {s['max_s']:>8.2f} "
+              f"{s['bytes_avg'] / 1024:>8.1f} {s['retries']:>5} {s['errors']:>4} {tokens:>13}  {branches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+news_classifier.py
+Klasifikasi sentimen berita terhadap IDR (BULLISH_IDR / BEARISH_IDR / NEUTRAL)
+dengan leksikon berbobot dua bahasa (id/en) dan matcher multi-pattern.
+
+Semua term dikompilasi sekali menjadi satu regex berbentuk trie
+("men(?:guat|urun)|..."), jadi satu teks — atau satu hari penuh artikel yang
+digabung — dipindai sekali di C, bukan satu loop Python per keyword:
+
+  classify("Rupiah menguat, cadangan devisa naik")        # → "BULLISH_IDR"
+  classify_batch(titles, bodies, body_weight=0.5)          # list label
+  score_batch(titles)                                      # list skor
+
+Semantik sama dengan classify_news lama: pencocokan substring pada teks
+lowercase, tiap term dihitung sekali per teks. Bedanya, pada posisi yang sama
+term terpanjang yang menang ("tekanan jual" tidak ikut dihitung sebagai "jual").
+
+Bobot positif = bullish IDR, negatif = bearish IDR. Term tambahan bisa dimuat
+dari file TSV `term<TAB>bobot` lewat env NEWS_LEXICON (menimpa bobot bawaan).
+
+  python scripts/news_classifier.py "Rupiah melemah ke rekor rendah"
+"""
+import os
+import re
+import sys
+
+NEWS_LEXICON = os.environ.get("NEWS_LEXICON", "")
+
+# ── Leksikon bawaan ──────────────────────────────────────────────────────────
+LEXICON = {
+    # Bullish IDR (id)
+    "menguat": 1, "naik": 1, "apresiasi": 1, "positif": 1, "stabil": 1, "surplus": 1,
+    "deal": 1, "investasi masuk": 1, "cadangan devisa": 1, "beli rupiah": 1,
+    "rupiah perkasa": 2, "rupiah menguat": 2, "dolar melemah": 1.5, "dollar melemah": 1.5,
+    "inflow": 1, "modal asing masuk": 1.5, "net buy": 1, "intervensi bi": 0.5,
+    "suku bunga naik": 0.5, "bi rate naik": 0.5, "the fed pangkas": 1, "penurunan suku bunga fed": 1,
+    "neraca dagang surplus": 1.5, "peringkat naik": 1, "upgrade": 1,
+    # Bullish IDR (en)
+    "rupiah strengthens": 2, "rupiah gains": 2, "rupiah rises": 2, "rupiah rallies": 2,
+    "dollar weakens": 1.5, "dollar falls": 1.5, "dollar slips": 1.5, "fed rate cut": 1,
+    "fed cuts": 1, "dovish": 0.5, "risk-on": 1, "risk on": 1, "foreign inflows": 1.5,
+    "trade surplus": 1, "rating upgrade": 1,
+    # Bearish IDR (id)
+    "melemah": -1, "turun": -1, "depresiasi": -1, "tekanan": -1, "defisit": -1, "jual": -1,
+    "anjlok": -1, "rekor rendah": -1, "risk off": -1, "capital outflow": -1,
+    "rupiah melemah": -2, "rupiah anjlok": -2, "rupiah terpuruk": -2, "tekanan jual": -1.5,
+    "dolar menguat": -1.5, "dollar menguat": -1.5, "modal asing keluar": -1.5, "net sell": -1,
+    "arus keluar": -1, "neraca dagang defisit": -1.5, "peringkat turun": -1, "krisis": -1.5,
+    "the fed naikkan": -1, "kenaikan suku bunga fed": -1,
+    # Bearish IDR (en)
+    "rupiah weakens": -2, "rupiah falls": -2, "rupiah slumps": -2, "rupiah slides": -2,
+    "record low": -1.5, "dollar strengthens": -1.5, "dollar rallies": -1.5, "dollar gains": -1,
+    "fed rate hike": -1, "fed hikes": -1, "hawkish": -0.5, "risk-off": -1, "outflows": -1,
+    "selloff": -1, "sell-off": -1, "trade deficit": -1, "downgrade": -1,
+}
+
+# Kata kunci relevansi IDR untuk hasil scraping (tanpa bobot)
+RELEVANCE_TERMS = ["rupiah", "kurs", "idr", "bi rate", "dollar", "devisa", "valas"]
+
+_SEP = "\n"  # pemisah teks dalam batch; term tidak pernah berisi newline
+
+
+def load_lexicon(path: str) -> dict:
+    """Baca TSV `term<TAB>bobot` (baris kosong / '#' diabaikan)."""
+    terms = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            term, _, weight = line.partition("\t")
+            terms[term.strip().lower()] = float(weight or 1)
+    return terms
+
+
+# ── Matcher ──────────────────────────────────────────────────────────────────
+def _trie_pattern(terms) -> str:
+    """Regex berbentuk trie dari daftar term; alternatif terpanjang dicoba dulu."""
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node) -> str:
+        end = node.get("", False)
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 and not end else "(?:" + "|".join(branches) + ")"
+        return body + "?" if end else body
+
+    return build(trie)
+
+
+class Matcher:
+    """Satu regex terkompilasi untuk seluruh leksikon {term: bobot}."""
+
+    def __init__(self, terms: dict):
+        self.weights = {t.lower(): w for t, w in terms.items() if t}
+        self.regex = re.compile(_trie_pattern(sorted(self.weights)))
+        self._batch_regex = re.compile(re.escape(_SEP) + "|" + self.regex.pattern)
+
+    def find(self, text: str) -> set:
+        """Term (distinct) yang muncul di text."""
+        return set(self.regex.findall(text.lower()))
+
+    def matches(self, text: str) -> bool:
+        return self.regex.search(text.lower()) is not None
+
+    def score(self, text: str) -> float:
+        return sum(self.weights[t] for t in self.find(text))
+
+    def score_batch(self, texts: list) -> list:
+        """Skor banyak teks dengan satu pemindaian regex atas teks gabungan."""
+        scores = [0.0] * len(texts)
+        i, seen = 0, set()
+        joined = _SEP.join(texts)
+        if joined.count(_SEP) != len(texts) - 1:    # ada newline di dalam teks (isi artikel)
+            joined = _SEP.join(t.replace(_SEP, " ") for t in texts)
+        joined = joined.lower()
+        for term in self._batch_regex.findall(joined):
+            if term == _SEP:         # batas teks berikutnya
+                i, seen = i + 1, set()
+            elif term not in seen:
+                seen.add(term)
+                scores[i] += self.weights[term]
+        return scores
+
+
+def _build_sentiment() -> Matcher:
+    terms = dict(LEXICON)
+    if NEWS_LEXICON:
+        terms.update(load_lexicon(NEWS_LEXICON))
+    return Matcher(terms)
+
+
+SENTIMENT = _build_sentiment()
+RELEVANCE = Matcher({t: 1 for t in RELEVANCE_TERMS})
+
+
+# ── API ──────────────────────────────────────────────────────────────────────
+def label(score: float) -> str:
+    if score > 0:
+        return "BULLISH_IDR"
+    if score < 0:
+        return "BEARISH_IDR"
+    return "NEUTRAL"
+
+
+def score_batch(titles: list, bodies: list = None, body_weight: float = 0.5,
+                matcher: Matcher = None) -> list:
+    """Skor per artikel: skor judul + body_weight × skor isi (jika ada)."""
+    matcher = matcher or SENTIMENT
+    scores = matcher.score_batch(titles)
+    if bodies:
+        for i, s in enumerate(matcher.score_batch([b or "" for b in bodies])):
+            scores[i] += body_weight * s
+    return scores
+
+
+def classify_batch(titles: list, bodies: list = None, body_weight: float = 0.5,
+                   matcher: Matcher = None) -> list:
+    return [label(s) for s in score_batch(titles, bodies, body_weight, matcher)]
+
+
+def classify(title: str, body: str = "") -> str:
+    return classify_batch([title], [body] if body else None)[0]
+
+
+def is_relevant(text: str) -> bool:
+    """True jika text menyebut rupiah/kurs/dollar/... (filter hasil scraping)."""
+    return RELEVANCE.matches(text)
+
+
+if __name__ == "__main__":
+    for text in sys.argv[1:]:
+        print(f"{classify(text):<12} {SENTIMENT.score(text):+.1f}  {sorted(SENTIMENT.find(text))}  {text}")
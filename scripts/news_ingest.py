@@ -0,0 +1,192 @@
+"""
+news_ingest.py
+Ingest berita volume besar: artikel dari semua sumber (NewsAPI multi-halaman,
+Tavily, scraping) dialirkan satu per satu lewat deteksi near-duplicate
+MinHash lalu diperingkat ke top-N. Memori tetap terbatas berapa pun jumlah
+artikelnya:
+
+  - heap min berukuran TOP_N menyimpan artikel terbaik;
+  - signature MinHash hanya untuk DEDUP_WINDOW artikel unik terakhir
+    (deque + index LSH), yang lebih lama dilupakan.
+
+Near-duplicate: estimasi Jaccard >= DUP_THRESHOLD antara himpunan kata +
+bigram judul (suffix " - Reuters", huruf besar dan tanda baca dibuang).
+Signature dipecah jadi BANDS band; hanya judul yang sama persis di minimal
+satu band yang dibandingkan, jadi lookup tidak memindai seluruh window.
+
+Salinan sindikasi tidak disimpan, tapi menaikkan skor artikel pertamanya
+(field "copies"): berita yang dimuat banyak media naik peringkat.
+
+  ingest = Ingest(top_n=30)
+  for article in stream:           # dict: title, body, source, datetime, url, label
+      ingest.add(article)
+  ingest.ranked()                  # list terurut skor, sudah diklasifikasi
+"""
+import os
+import re
+import math
+import heapq
+import struct
+import hashlib
+import itertools
+from collections import deque
+
+import news_classifier
+
+TOP_N = int(os.environ.get("NEWS_TOP_N", "30"))
+DEDUP_WINDOW = int(os.environ.get("NEWS_DEDUP_WINDOW", "4096"))
+DUP_THRESHOLD = 0.7    # estimasi Jaccard shingle judul (sindikasi ≈ 0.85+)
+NUM_PERM = 32
+BANDS, ROWS = 8, 4      # LSH: kandidat jika 1 dari 8 band (4 slot) sama; J=0.8 → 98%
+_UNPACK = struct.Struct(f">{NUM_PERM}H").unpack
+_PACK = struct.Struct(f">{NUM_PERM}H").pack
+_LANE_LOW = int("0001" * NUM_PERM, 16)
+_BAND_BITS = 16 * ROWS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+SUFFIX_RE = re.compile(r"\s+[-–—|]\s+[^-–—|]{2,40}$")   # " - Reuters", " | Kontan"
+WORD_RE = re.compile(r"\w+")
+
+
+# ── MinHash ──────────────────────────────────────────────────────────────────
+def normalize(title: str) -> list:
+    return WORD_RE.findall(SUFFIX_RE.sub("", title).lower())
+
+
+def shingles(title: str) -> set:
+    """Kata + bigram kata judul yang sudah dinormalisasi."""
+    words = normalize(title)
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def minhash(title: str):
+    """
+    Signature NUM_PERM slot × 16 bit, dikemas jadi satu int: satu digest
+    blake2b 64 byte per shingle memberi 32 hash sekaligus. None jika judul
+    tidak punya kata sama sekali (tidak bisa dibandingkan → tidak di-dedup).
+    """
+    rows = [_UNPACK(hashlib.blake2b(sh.encode(), digest_size=64).digest()) for sh in shingles(title)]
+    if not rows:
+        return None
+    return int.from_bytes(_PACK(*(min(col) for col in zip(*rows))), "big")
+
+
+def similarity(a: int, b: int) -> float:
+    """Estimasi Jaccard: porsi slot 16-bit yang sama (tanpa unpack)."""
+    x = a ^ b
+    x |= x >> 1
+    x |= x >> 2
+    x |= x >> 4
+    x |= x >> 8     # bit terendah tiap slot = 1 jika slot berbeda
+    return 1 - (x & _LANE_LOW).bit_count() / NUM_PERM
+
+
+class MinHashIndex:
+    """Signature terakhir (maks `window`) dengan lookup LSH per band."""
+
+    def __init__(self, window: int = DEDUP_WINDOW, threshold: float = DUP_THRESHOLD):
+        self.window = window
+        self.threshold = threshold
+        self.order = deque()
+        self.buckets = {}   # key band → [signature]
+        self.meta = {}      # signature → data pemanggil
+
+    @staticmethod
+    def _keys(sig: int):
+        # isi band + nomor band di bit atas → satu int per key
+        return [(sig >> (b * _BAND_BITS) & _BAND_MASK) | (b << _BAND_BITS) for b in range(BANDS)]
+
+    def find(self, sig: int):
+        """Signature paling mirip dengan estimasi Jaccard >= threshold, atau None."""
+        best, best_sim = None, self.threshold
+        for key in self._keys(sig):
+            for other in self.buckets.get(key, ()):
+                sim = similarity(sig, other)
+                if sim >= best_sim:
+                    best, best_sim = other, sim
+        return best
+
+    def add(self, sig: int, meta):
+        if sig in self.meta:
+            return
+        if len(self.order) >= self.window:
+            self._evict()
+        self.order.append(sig)
+        self.meta[sig] = meta
+        for key in self._keys(sig):
+            self.buckets.setdefault(key, []).append(sig)
+
+    def _evict(self):
+        old = self.order.popleft()
+        del self.meta[old]
+        for key in self._keys(old):
+            bucket = self.buckets[key]
+            bucket.remove(old)
+            if not bucket:
+                del self.buckets[key]
+
+
+# ── Ingest ───────────────────────────────────────────────────────────────────
+class Ingest:
+    """Dedup + peringkat streaming: add() per artikel, ranked() di akhir."""
+
+    def __init__(self, top_n: int = TOP_N, window: int = DEDUP_WINDOW,
+                 threshold: float = DUP_THRESHOLD, today: str = None):
+        self.top_n = top_n
+        self.today = today
+        self.index = MinHashIndex(window, threshold)
+        self.heap = []              # [skor, seq, item] — min-heap, maks top_n
+        self.seq = itertools.count()
+        self.stats = {"seen": 0, "duplicates": 0, "kept": 0, "evicted": 0}
+
+    def score(self, item: dict, sentiment: float) -> float:
+        """Relevansi IDR + kekuatan sentimen + jumlah salinan + bonus hari ini."""
+        relevance = len(news_classifier.RELEVANCE.find(item["title"]))
+        fresh = 1 if self.today and item.get("datetime", "").startswith(self.today) else 0
+        return (2 * min(relevance, 3) + min(abs(sentiment), 4)
+                + math.log2(item.get("copies", 1)) + fresh)
+
+    def add(self, article: dict) -> str:
+        """Return "kept", "duplicate" atau "dropped" (kalah dari top-N)."""
+        self.stats["seen"] += 1
+        title = article["title"]
+        sig = minhash(title)
+        near = self.index.find(sig) if sig is not None else None
+        if near is not None:
+            self.stats["duplicates"] += 1
+            entry = self.index.meta[near]
+            if entry[2] is not None:        # artikel aslinya masih di top-N
+                item = entry[2]
+                item["copies"] += 1
+                entry[0] = self.score(item, item["sentiment"])
+                # skor hanya naik → cukup sift-down entry ini (bukan heapify seluruh heap)
+                pos = next(i for i, e in enumerate(self.heap) if e is entry)
+                heapq._siftup(self.heap, pos)
+            return "duplicate"
+
+        sentiment = news_classifier.score_batch([title], [article.get("body") or ""])[0]
+        item = {k: v for k, v in article.items() if k != "body"}
+        item["title"] = title[:120]
+        item["classification"] = news_classifier.label(sentiment)
+        item["sentiment"] = round(sentiment, 2)
+        item["copies"] = 1
+        entry = [self.score(item, sentiment), next(self.seq), item]
+        if sig is not None:
+            self.index.add(sig, entry)
+
+        if len(self.heap) < self.top_n:
+            heapq.heappush(self.heap, entry)
+        elif entry[0] > self.heap[0][0]:
+            out = heapq.heapreplace(self.heap, entry)
+            out[2] = None                   # signature tetap diingat, isi dilepas
+            self.stats["evicted"] += 1
+        else:
+            entry[2] = None
+            return "dropped"
+        self.stats["kept"] = len(self.heap)
+        return "kept"
+
+    def ranked(self) -> list:
+        """Top-N terurut skor menurun (urutan masuk untuk skor sama)."""
+        entries = sorted(self.heap, key=lambda e: (-e[0], e[1]))
+        return [dict(e[2], score=round(e[0], 2)) for e in entries]
@@ -0,0 +1,53 @@
+"""
+pairs.py
+Konfigurasi pasangan mata uang yang dipantau radar.
+
+RADAR_PAIRS (env) = daftar dipisah koma, mis. "USDIDR,SGDIDR,JPYIDR,CNYIDR,EURIDR".
+USDIDR selalu ikut dan selalu jadi pair utama (BCA, JISDOR, index Pages,
+pesan Telegram tetap berbasis USD/IDR).
+"""
+import os
+import re
+
+PRIMARY_PAIR = "USDIDR"
+PAIRS = [PRIMARY_PAIR] + [
+    p for p in dict.fromkeys(
+        x.strip().upper().replace("/", "") for x in os.environ.get("RADAR_PAIRS", "").split(",")
+    )
+    if re.fullmatch(r"[A-Z]{6}", p) and p != PRIMARY_PAIR
+]
+REPORT_PREFIX = "PreMarket_Radar_"
+REPORT_RE = re.compile(r"PreMarket_Radar_([A-Z]{6})_(\d{4}-\d{2}-\d{2})\.html$")
+
+
+def pair_parts(pair: str) -> tuple:
+    """"SGDIDR" → ("SGD", "IDR")."""
+    return pair[:3], pair[3:]
+
+
+def pair_label(pair: str) -> str:
+    """"SGDIDR" → "SGD/IDR"."""
+    base, quote = pair_parts(pair)
+    return f"{base}/{quote}"
+
+
+def data_path(pair: str) -> str:
+    """USDIDR tetap di data/market_data.json agar kompatibel."""
+    if pair == PRIMARY_PAIR:
+        return "data/market_data.json"
+    return f"data/market_data_{pair}.json"
+
+
+def report_filename(pair: str, date_str: str) -> str:
+    return f"{REPORT_PREFIX}{pair}_{date_str}.html"
+
+
+def cross_rate(usd_rates: dict, base: str, quote: str):
+    """
+    Kurs base/quote dari tabel kurs per 1 USD (format Frankfurter from=USD).
+    Return None jika salah satu mata uang tidak ada.
+    """
+    table = dict(usd_rates, USD=1.0)
+    if base not in table or quote not in table or not table[base]:
+        return None
+    return round(table[quote] / table[base], 4)
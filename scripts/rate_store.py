@@ -0,0 +1,185 @@
+"""
+rate_store.py
+Time-series store lokal untuk kurs close harian (append-only).
+
+Format file data/rates/<PAIR>.bin: record biner fixed-width 12 byte
+  <uint32 date.toordinal()> <float64 close>
+urut naik berdasarkan tanggal. Saat dibuka, seluruh file dimuat ke dua
+array (ordinal + harga) sehingga query window cukup bisect + slice:
+O(log n + window).
+
+Setiap run cukup fetch dari hari fixing pertama yang belum ada (first_gap)
+lalu merge(). range_index() melayani high/low/persentil window berapa pun
+(52W, multi-tahun) tanpa memindai window.
+
+data/rates/<PAIR>.meta.json mencatat `covered_from`: awal range yang sudah
+pernah di-fetch (mark_fetched). Hari sebelum record pertama yang memang
+tidak ada di sumber tidak diminta ulang tiap run.
+"""
+import os
+import json
+import struct
+import bisect
+import datetime
+from array import array
+
+import indicators
+import market_calendar
+
+STORE_DIR = os.environ.get("RATE_STORE_DIR", "data/rates")
+RECORD = struct.Struct("<Id")
+# Frankfurter = kurs referensi ECB: ada record tepat di hari kerja TARGET
+FIXING = market_calendar.calendar("ECB")
+
+
+class RateStore:
+    def __init__(self, pair: str = "USDIDR", root: str = STORE_DIR):
+        self.pair = pair
+        self.path = os.path.join(root, f"{pair}.bin")
+        self.meta_path = os.path.join(root, f"{pair}.meta.json")
+        self.ordinals = array("I")
+        self.prices = array("d")
+        self.covered_from = None  # awal range yang sudah di-fetch (lihat mark_fetched)
+        self._range = None      # indicators.RangeIndex, dibangun saat pertama dipakai
+        self._load()
+
+    def _load(self):
+        if os.path.exists(self.meta_path):
+            try:
+                with open(self.meta_path, "r", encoding="utf-8") as f:
+                    self.covered_from = datetime.date.fromisoformat(json.load(f)["covered_from"])
+            except (OSError, ValueError, KeyError, TypeError):
+                self.covered_from = None
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        usable = len(raw) - len(raw) % RECORD.size  # buang record terpotong
+        for ordinal, price in RECORD.iter_unpack(raw[:usable]):
+            self.ordinals.append(ordinal)
+            self.prices.append(price)
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def first_date(self):
+        return datetime.date.fromordinal(self.ordinals[0]) if self.ordinals else None
+
+    def last_date(self):
+        return datetime.date.fromordinal(self.ordinals[-1]) if self.ordinals else None
+
+    def get(self, date: datetime.date):
+        i = bisect.bisect_left(self.ordinals, date.toordinal())
+        if i < len(self.ordinals) and self.ordinals[i] == date.toordinal():
+            return self.prices[i]
+        return None
+
+    def merge(self, rates: dict) -> int:
+        """
+        Tambah {date_iso: close}. Tanggal setelah last_date() di-append ke
+        file; tanggal lebih lama yang belum ada (backfill) memicu rewrite
+        file sekali. Return jumlah tanggal baru.
+        """
+        rows = sorted(
+            (datetime.date.fromisoformat(d).toordinal(), float(v))
+            for d, v in rates.items() if v is not None
+        )
+        self._range = None
+        last = self.ordinals[-1] if self.ordinals else 0
+        newer = [(o, p) for o, p in rows if o > last]
+        older = [(o, p) for o, p in rows if o <= last and self.get(datetime.date.fromordinal(o)) is None]
+
+        if older:
+            merged = dict(zip(self.ordinals, self.prices))
+            merged.update(older)
+            merged.update(newer)
+            self.ordinals = array("I", sorted(merged))
+            self.prices = array("d", (merged[o] for o in self.ordinals))
+            self._rewrite()
+            return len(older) + len(newer)
+
+        if newer:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "ab") as f:
+                for o, p in newer:
+                    f.write(RECORD.pack(o, p))
+                    self.ordinals.append(o)
+                    self.prices.append(p)
+        return len(newer)
+
+    def _rewrite(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            for o, p in zip(self.ordinals, self.prices):
+                f.write(RECORD.pack(o, p))
+        os.replace(tmp, self.path)
+
+    def mark_fetched(self, start: datetime.date, end: datetime.date):
+        """
+        Catat bahwa start..end sudah di-fetch dan di-merge. Jika range itu
+        menyambung ke record pertama, hari sebelumnya memang tidak ada di
+        sumber → covered_from = start (disimpan ke meta.json).
+        """
+        first = self.first_date()
+        if first is None or not start < first <= end + datetime.timedelta(days=1):
+            return
+        if self.covered_from is not None and self.covered_from <= start:
+            return
+        self.covered_from = start
+        os.makedirs(os.path.dirname(self.meta_path), exist_ok=True)
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"covered_from": start.isoformat()}, f)
+        os.replace(tmp, self.meta_path)
+
+    def _known_start(self, start: datetime.date) -> datetime.date:
+        """start, dimajukan ke record pertama jika covered_from..record pertama sudah di-fetch."""
+        if self.covered_from is not None and self.ordinals and self.covered_from <= start:
+            return max(start, self.first_date())
+        return start
+
+    def span(self, start: datetime.date, end: datetime.date) -> tuple:
+        """Index [lo, hi) untuk tanggal start..end (inklusif)."""
+        lo = bisect.bisect_left(self.ordinals, start.toordinal())
+        hi = bisect.bisect_right(self.ordinals, end.toordinal())
+        return lo, hi
+
+    def window(self, start: datetime.date, end: datetime.date) -> tuple:
+        """Return (dates_iso, prices) untuk start..end — O(log n + window)."""
+        lo, hi = self.span(start, end)
+        dates = [datetime.date.fromordinal(o).isoformat() for o in self.ordinals[lo:hi]]
+        return dates, self.prices[lo:hi].tolist()
+
+    def range_index(self) -> indicators.RangeIndex:
+        """Index min/max/rank atas seluruh series (dibangun ulang setelah merge)."""
+        if self._range is None:
+            self._range = indicators.RangeIndex(self.prices)
+        return self._range
+
+    def first_gap(self, start: datetime.date, end: datetime.date):
+        """
+        Hari fixing pertama di start..end yang belum ada di store, atau None.
+        Store lengkap dicek O(log n): jumlah record vs jumlah hari fixing
+        dari kalender; tanggal per tanggal hanya dipindai jika ada yang kurang.
+        Hari sebelum record pertama yang sudah di-fetch (covered_from) tidak dihitung.
+        """
+        start = self._known_start(start)
+        if start > end:
+            return None
+        lo, hi = self.span(start, end)
+        if FIXING.count(start, end) <= hi - lo:
+            return None
+        return next((d for d in FIXING.business_days(start, end) if self.get(d) is None), None)
+
+    def covers_start(self, start: datetime.date) -> bool:
+        """True jika record pertama ada di/sebelum hari fixing pertama >= start, atau start sudah di-fetch."""
+        if not self.ordinals:
+            return False
+        if self.covered_from is not None and self.covered_from <= start:
+            return True
+        return self.first_date() <= FIXING.next_business_day(start, inclusive=True)
+
+    def covers(self, start: datetime.date, end: datetime.date) -> bool:
+        """True jika store sudah mencakup start..end (tidak perlu fetch)."""
+        return self.first_gap(start, end) is None
@@ -0,0 +1,516 @@
+"""
+render_report.py
+Renderer HTML lokal (deterministik) untuk layout S1–S9 dari market_data.json.
+
+Semua angka, chart dan tabel dibangun langsung dari data; LLM hanya
+menyumbang teks naratif pendek (lihat generate_report.generate_narrative):
+  - quick_take        → S4 (di bawah tabel analisis)
+  - risk_commentary   → S5 (di bawah risk scoring)
+  - telegram_preview  → S8
+
+Setiap section dibungkus marker <!-- Sx:start --> ... <!-- Sx:end -->
+(data chart di marker DATA) agar bisa diganti sebagian tanpa merender
+ulang seluruh halaman (splice(), dipakai scripts/intraday.py).
+section_hashes() memberi hash input persis tiap section: generate_report
+hanya merender ulang section yang hash-nya berubah.
+"""
+import re
+import json
+import hashlib
+import html as _html
+
+from pairs import PRIMARY_PAIR, pair_label
+
+CHART_JS = "https://cdnjs.cloudflare.com/ajax/libs/Chart.js/4.4.1/chart.umd.min.js"
+FONTS = "https://fonts.googleapis.com/css2?family=DM+Mono:wght@400;500&family=Syne:wght@700;800&display=swap"
+SECTIONS = ("S1", "S2", "S3", "S4", "S5", "S6", "S7", "S8", "S9")
+# Setiap perubahan file ini mengubah hash semua section (cache section ikut basi)
+with open(__file__, "rb") as _f:
+    RENDERER_HASH = hashlib.sha256(_f.read()).hexdigest()[:12]
+NARRATIVE_RE = re.compile(r'<div class="(?:narrative|telegram)">(.*?)</div>', re.DOTALL)
+
+CSS = """
+:root { --bg:#080c10; --surface:#0d1318; --border:#1a2332; --cyan:#00f2ff; --orange:#ff9d00;
+  --green:#00ff88; --red:#ff4d4d; --yellow:#ffd600; --text:#e0e6ed; --dim:#8a95a5; }
+* { margin:0; padding:0; box-sizing:border-box; }
+body { background:var(--bg); color:var(--text); font-family:'DM Mono',monospace; line-height:1.4; overflow-x:hidden; }
+body::before { content:" "; position:fixed; inset:0; pointer-events:none; z-index:9999;
+  background:linear-gradient(rgba(18,16,16,0) 50%, rgba(0,0,0,0.1) 50%); background-size:100% 3px; }
+.container { max-width:1400px; margin:0 auto; padding:20px; }
+.panel { background:var(--surface); border:1px solid var(--border); padding:20px; margin-bottom:20px; }
+.panel-title { font-family:'Syne',sans-serif; font-size:0.8rem; letter-spacing:2px; text-transform:uppercase;
+  color:var(--dim); margin-bottom:15px; display:flex; justify-content:space-between; align-items:center; }
+header { display:flex; justify-content:space-between; align-items:center; }
+.header-title { font-family:'Syne',sans-serif; font-size:1.5rem; text-transform:uppercase; letter-spacing:2px;
+  display:flex; align-items:center; gap:15px; }
+.radar-dot { width:12px; height:12px; background:var(--cyan); border-radius:50%; position:relative; }
+.radar-dot::after { content:""; position:absolute; inset:0; background:var(--cyan); border-radius:50%; animation:pulse 2s infinite; }
+@keyframes pulse { 0% { transform:scale(1); opacity:0.8; } 100% { transform:scale(4); opacity:0; } }
+.timestamp { font-size:0.8rem; color:var(--dim); text-align:right; }
+.grid-4 { display:grid; grid-template-columns:repeat(4,1fr); gap:15px; margin-bottom:20px; }
+.grid-2 { display:grid; grid-template-columns:1fr 1fr; gap:20px; }
+.hero-card { background:var(--surface); border:1px solid var(--border); border-top:3px solid var(--accent); padding:20px; }
+.hero-label { font-size:0.7rem; color:var(--dim); margin-bottom:10px; display:flex; justify-content:space-between; }
+.hero-value { font-size:1.8rem; font-weight:700; font-family:'Syne',sans-serif; color:var(--accent); }
+.hero-sub { font-size:0.85rem; margin-top:5px; color:var(--dim); }
+.tag { padding:2px 6px; border-radius:3px; font-size:0.6rem; font-weight:bold; white-space:nowrap; }
+.tag-live { color:var(--cyan); border:1px solid var(--cyan); background:rgba(0,242,255,0.1); }
+.tag-proxy { color:var(--orange); border:1px solid var(--orange); background:rgba(255,157,0,0.1); }
+.tag-stale { color:var(--red); border:1px solid var(--red); background:rgba(255,77,77,0.1); }
+.badge { padding:4px 12px; font-weight:bold; font-size:0.8rem; border-radius:4px; }
+.badge-up { color:var(--green); border:1px solid var(--green); background:rgba(0,255,136,0.15); }
+.badge-down { color:var(--red); border:1px solid var(--red); background:rgba(255,77,77,0.15); }
+.chart-box { position:relative; height:380px; }
+.chart-box.small { height:260px; }
+.news-item { display:flex; gap:10px; padding:10px 0; border-bottom:1px solid var(--border); font-size:0.8rem; }
+.dot { width:8px; height:8px; border-radius:50%; margin-top:5px; flex-shrink:0; }
+.dot-bull { background:var(--green); } .dot-bear { background:var(--red); } .dot-neutral { background:var(--yellow); }
+.news-meta { color:var(--dim); font-size:0.7rem; margin-top:3px; }
+table { width:100%; border-collapse:collapse; font-size:0.75rem; }
+th, td { text-align:left; padding:8px 6px; border-bottom:1px solid var(--border); }
+th { color:var(--dim); font-weight:normal; text-transform:uppercase; font-size:0.65rem; }
+.bull { color:var(--green); } .bear { color:var(--red); } .neutral { color:var(--yellow); }
+.narrative { margin-top:15px; padding:12px; border-left:3px solid var(--cyan); background:rgba(0,242,255,0.04);
+  font-size:0.8rem; white-space:pre-line; }
+.risk-row { margin-bottom:10px; font-size:0.75rem; }
+.risk-head { display:flex; justify-content:space-between; margin-bottom:4px; }
+.risk-bar { height:6px; background:var(--border); border-radius:3px; overflow:hidden; }
+.risk-fill { height:100%; }
+.macro-grid { display:grid; grid-template-columns:repeat(3,1fr); gap:10px; }
+.macro-box { border:1px solid var(--border); padding:12px; }
+.macro-label { font-size:0.65rem; color:var(--dim); text-transform:uppercase; }
+.macro-value { font-family:'Syne',sans-serif; font-size:1.2rem; margin-top:6px; }
+.tweet-card { border:1px solid var(--border); padding:15px; font-size:0.75rem; }
+.tweet-tag { font-family:'Syne',sans-serif; font-size:1rem; color:var(--cyan); margin-bottom:6px; }
+.telegram { font-size:0.85rem; white-space:pre-line; background:#0a1a24; border:1px solid #1f3b4d; padding:15px; border-radius:6px; }
+footer { font-size:0.7rem; color:var(--dim); text-align:center; padding:20px 0; }
+@media (max-width:900px) { .grid-4 { grid-template-columns:1fr 1fr; } .grid-2 { grid-template-columns:1fr; } }
+"""
+
+CHART_SCRIPT = """
+Chart.defaults.color = '#8a95a5';
+Chart.defaults.font.family = "'DM Mono', monospace";
+Chart.defaults.borderColor = '#1a2332';
+const D = JSON.parse(document.getElementById('radar-data').textContent);
+new Chart(document.getElementById('priceChart'), {
+  type: 'line',
+  data: { labels: D.dates, datasets: [
+    { label: D.pair, data: D.prices, borderColor: '#00f2ff', borderWidth: 2, pointRadius: 0, tension: 0.2 },
+    { label: '5D MA', data: D.ma5, borderColor: '#ff9d00', borderDash: [5, 5], borderWidth: 1.5, pointRadius: 0 },
+    { label: '20D MA', data: D.ma20, borderColor: '#ff4d4d', borderDash: [5, 5], borderWidth: 1.5, pointRadius: 0 }
+  ] },
+  options: { maintainAspectRatio: false, interaction: { mode: 'index', intersect: false },
+    scales: { y: { min: D.y_min, max: D.y_max } } }
+});
+new Chart(document.getElementById('signalChart'), {
+  type: 'bar',
+  data: { labels: D.signals.map(s => s[0]), datasets: [{ data: D.signals.map(s => s[1]),
+    backgroundColor: D.signals.map(s => s[1] >= 66 ? '#ff4d4d' : s[1] >= 33 ? '#ff9d00' : '#00ff88') }] },
+  options: { maintainAspectRatio: false, plugins: { legend: { display: false } }, scales: { y: { min: 0, max: 100 } } }
+});
+new Chart(document.getElementById('sentimentChart'), {
+  type: 'doughnut',
+  data: { labels: ['Bearish IDR', 'Bullish IDR', 'Neutral'], datasets: [{ data: D.sentiment,
+    backgroundColor: ['#ff4d4d', '#00ff88', '#ffd600'], borderWidth: 0 }] },
+  options: { maintainAspectRatio: false, cutout: '65%' }
+});
+"""
+
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+def esc(value) -> str:
+    return _html.escape("" if value is None else str(value))
+
+
+def fmt(value, ndigits: int = 2, suffix: str = "") -> str:
+    if value is None:
+        return "N/A"
+    try:
+        return f"{float(value):,.{ndigits}f}{suffix}"
+    except (TypeError, ValueError):
+        return esc(value)
+
+
+def signed(value, ndigits: int = 3, suffix: str = "%") -> str:
+    return "N/A" if value is None else f"{value:+.{ndigits}f}{suffix}"
+
+
+def tag(label) -> str:
+    label = (label or "PROXY").upper()
+    text = {"LIVE": "● LIVE", "STALE": "⚠ STALE"}.get(label, "⚡ PROXY")
+    return f'<span class="tag tag-{label.lower() if label in ("LIVE", "STALE") else "proxy"}">{text}</span>'
+
+
+def cls_of(classification: str) -> str:
+    return {"BULLISH_IDR": "bull", "BEARISH_IDR": "bear"}.get(classification, "neutral")
+
+
+def clamp(x: float, lo: float = 0, hi: float = 100) -> int:
+    return int(max(lo, min(hi, round(x))))
+
+
+def section(sid: str, body: str) -> str:
+    return f"<!-- {sid}:start -->\n{body}\n<!-- {sid}:end -->"
+
+
+def splice(html: str, sid: str, block: str):
+    """Ganti blok <!-- sid:start --> ... <!-- sid:end --> (marker ikut) dengan block. None jika marker tidak ada."""
+    start_marker, end_marker = f"<!-- {sid}:start -->", f"<!-- {sid}:end -->"
+    i = html.find(start_marker)
+    j = html.find(end_marker, i)
+    if i < 0 or j < 0:
+        return None
+    return html[:i] + block + html[j + len(end_marker):]
+
+
+def extract(html: str, sid: str):
+    """Isi blok section sid (marker ikut), atau None."""
+    start_marker, end_marker = f"<!-- {sid}:start -->", f"<!-- {sid}:end -->"
+    i = html.find(start_marker)
+    j = html.find(end_marker, i)
+    return html[i:j + len(end_marker)] if i >= 0 and j >= 0 else None
+
+
+def narrative_from(html: str) -> dict:
+    """Narasi yang sudah ada di report (S4/S5/S8) → dict untuk render ulang section."""
+    narrative = {}
+    for key, sid in (("quick_take", "S4"), ("risk_commentary", "S5"), ("telegram_preview", "S8")):
+        m = NARRATIVE_RE.search(extract(html, sid) or "")
+        narrative[key] = _html.unescape(m.group(1)) if m else ""
+    return narrative
+
+
+def last_valid(values: list):
+    return next((v for v in reversed(values or []) if v is not None), None)
+
+
+# ── Derived metrics (deterministik dari data) ────────────────────────────────
+def derive(data: dict) -> dict:
+    """Hitung metrik turunan yang dipakai beberapa section."""
+    spot, hist, dxy = data["spot"], data["historical"], data["dxy"]
+    vol, sent, bca = data["volatility"], data["sentiment_dist"], data["bca"]
+    prices = hist.get("prices") or []
+    last = prices[-1] if prices else spot.get("value")
+    ma5, ma20 = last_valid(hist.get("ma5")), last_valid(hist.get("ma20"))
+    lo, hi = hist.get("range_30d_low"), hist.get("range_30d_high")
+
+    trend = None
+    if last is not None and ma20 is not None:
+        trend = "UPTREND" if last > ma20 else "DOWNTREND"
+    ma20_gap = (last - ma20) / ma20 * 100 if last and ma20 else 0.0
+    range_pos = (last - lo) / (hi - lo) * 100 if last is not None and lo is not None and hi and hi > lo else 50.0
+    spread_pct = (bca["sell"] - bca["buy"]) / bca["mid"] * 100 if bca.get("sell") and bca.get("buy") and bca.get("mid") else 0.0
+    labels = [spot.get("label"), bca.get("label"), data["jisdor"].get("label"), dxy.get("label"), data["bi_rate"].get("label")]
+    weak = sum(1 for lb in labels if lb != "LIVE")
+
+    change = spot.get("change_pct") or 0.0
+    dxy_change = dxy.get("change_pct") or 0.0
+    atr_pct = vol.get("atr_pct") or 0.0
+    skew = sent.get("bearish_pct", 0) - sent.get("bullish_pct", 0)
+
+    signals = [
+        ("Spot Δ", clamp(abs(change) / 0.5 * 100)),
+        ("Trend MA20", clamp(abs(ma20_gap) / 1.0 * 100)),
+        ("Volatilitas", clamp(atr_pct / 0.6 * 100)),
+        ("DXY", clamp(abs(dxy_change) / 0.6 * 100)),
+        ("Sentimen", clamp(abs(skew))),
+        ("Posisi range", clamp(abs(range_pos - 50) * 2)),
+    ]
+    risks = [
+        ("Tekanan depresiasi IDR", clamp(50 + change / 0.5 * 50)),
+        ("Momentum vs MA20", clamp(50 + ma20_gap / 1.0 * 50)),
+        ("Volatilitas (ATR 14D)", clamp(atr_pct / 0.6 * 100)),
+        ("Tekanan DXY", clamp(50 + dxy_change / 0.6 * 50)),
+        ("Sentimen berita bearish", clamp(sent.get("bearish_pct", 0))),
+        ("Dekat high 30D", clamp(range_pos)),
+        ("Spread BCA", clamp(spread_pct / 1.0 * 100)),
+        ("Kualitas data (PROXY/STALE)", clamp(weak / len(labels) * 100)),
+    ]
+    return {
+        "last": last, "ma5": ma5, "ma20": ma20, "trend": trend, "ma20_gap": ma20_gap,
+        "range_pos": range_pos, "signals": signals, "risks": risks, "skew": skew,
+    }
+
+
+def analysis_rows(data: dict, m: dict) -> list:
+    """Tabel 5 faktor: (faktor, nilai, implikasi)."""
+    dxy, bi, sent = data["dxy"], data["bi_rate"], data["sentiment_dist"]
+
+    def side(bearish: bool, neutral: bool = False) -> str:
+        return "NEUTRAL" if neutral else "BEARISH_IDR" if bearish else "BULLISH_IDR"
+
+    rows = [
+        ("Spot vs 5D MA", f"{fmt(m['last'])} / {fmt(m['ma5'])}",
+         side(bool(m["ma5"] and m["last"] > m["ma5"]), not m["ma5"] or m["last"] is None)),
+        ("Spot vs 20D MA", f"{m['ma20_gap']:+.2f}%", side(m["ma20_gap"] > 0, not m["ma20"])),
+        ("DXY", f"{fmt(dxy.get('value'))} ({signed(dxy.get('change_pct'))})",
+         side((dxy.get("change_pct") or 0) > 0, dxy.get("change_pct") is None)),
+        ("BI Rate", f"{fmt(bi.get('rate'), 2, '%')} · {esc(bi.get('decision', 'N/A'))}", "NEUTRAL"),
+        ("Sentimen berita", f"▲{sent.get('bullish_pct', 0)}% ▼{sent.get('bearish_pct', 0)}%",
+         side(m["skew"] > 0, m["skew"] == 0)),
+    ]
+    return rows
+
+
+# ── Sections ─────────────────────────────────────────────────────────────────
+def render_header(data: dict, date_label: str) -> str:
+    meta = data["meta"]
+    label = pair_label(meta.get("pair", PRIMARY_PAIR))
+    return f"""<header class="panel">
+  <div class="header-title"><div class="radar-dot"></div>Pre-Market Intelligence Radar · {esc(label)} · {esc(date_label.upper())}</div>
+  <div class="timestamp">Generated {esc(meta.get('generated_at_wib', ''))}<br>Data date {esc(meta.get('date', ''))}</div>
+</header>"""
+
+
+def render_hero(data: dict) -> str:
+    spot, bca, jisdor, bi, hist = data["spot"], data["bca"], data["jisdor"], data["bi_rate"], data["historical"]
+    label = pair_label(data["meta"].get("pair", PRIMARY_PAIR))
+    change = spot.get("change_pct")
+    change_cls = "bear" if (change or 0) > 0 else "bull" if (change or 0) < 0 else "neutral"
+    return f"""<div class="grid-4">
+  <div class="hero-card" style="--accent:var(--cyan)">
+    <div class="hero-label">SPOT {esc(label)} {tag(spot.get('label'))}</div>
+    <div class="hero-value">{fmt(spot.get('value'))}</div>
+    <div class="hero-sub"><span class="{change_cls}">{signed(change)}</span> · {esc(spot.get('source') or '')}</div>
+  </div>
+  <div class="hero-card" style="--accent:var(--orange)">
+    <div class="hero-label">BCA E-RATE {tag(bca.get('label'))}</div>
+    <div class="hero-value">{fmt(bca.get('buy'), 0)} / {fmt(bca.get('sell'), 0)}</div>
+    <div class="hero-sub">Beli / Jual · {esc(bca.get('timestamp') or bca.get('source') or '')}</div>
+  </div>
+  <div class="hero-card" style="--accent:var(--green)">
+    <div class="hero-label">RANGE 30D {tag(hist.get('label'))}</div>
+    <div class="hero-value">{fmt(hist.get('range_30d_low'))} – {fmt(hist.get('range_30d_high'))}</div>
+    <div class="hero-sub">Avg 30D: {fmt(hist.get('avg_30d'))}</div>
+  </div>
+  <div class="hero-card" style="--accent:var(--red)">
+    <div class="hero-label">JISDOR · BI RATE {tag(jisdor.get('label'))}</div>
+    <div class="hero-value">{fmt(jisdor.get('rate'), 0)}</div>
+    <div class="hero-sub">BI Rate {fmt(bi.get('rate'), 2, '%')} {tag(bi.get('label'))}</div>
+  </div>
+</div>"""
+
+
+def render_chart(data: dict, m: dict) -> str:
+    trend = m["trend"]
+    badge = (f'<span class="badge badge-{"up" if trend == "UPTREND" else "down"}">{trend}</span>'
+             if trend else '<span class="badge">N/A</span>')
+    return f"""<div class="panel">
+  <div class="panel-title">30-Day Price Action {tag(data['historical'].get('label'))} {badge}</div>
+  <div class="chart-box"><canvas id="priceChart"></canvas></div>
+</div>"""
+
+
+def render_news(data: dict, m: dict, narrative: dict) -> str:
+    items = "".join(
+        f"""
+    <div class="news-item"><div class="dot dot-{cls_of(n.get('classification'))}"></div><div>
+      {esc(n.get('title'))}
+      <div class="news-meta">{esc(n.get('source', ''))} · {esc(n.get('datetime', ''))} ·
+        <span class="{cls_of(n.get('classification'))}">{esc(n.get('classification'))}</span> {tag(n.get('label'))}</div>
+    </div></div>"""
+        for n in data["news"][:5]
+    )
+    rows = "".join(
+        f"<tr><td>{esc(f)}</td><td>{v}</td><td class=\"{cls_of(c)}\">{esc(c)}</td></tr>"
+        for f, v, c in analysis_rows(data, m)
+    )
+    return f"""<div class="grid-2">
+  <div class="panel"><div class="panel-title">News Feed 24H</div>{items}
+  </div>
+  <div class="panel"><div class="panel-title">Analisis 5 Faktor</div>
+    <table><tr><th>Faktor</th><th>Nilai</th><th>Implikasi</th></tr>{rows}</table>
+    <div class="narrative">{esc(narrative.get('quick_take'))}</div>
+  </div>
+</div>"""
+
+
+def render_risk(data: dict, m: dict, narrative: dict) -> str:
+    bars = "".join(
+        f"""
+    <div class="risk-row"><div class="risk-head"><span>{esc(name)}</span><span>{score}</span></div>
+      <div class="risk-bar"><div class="risk-fill" style="width:{score}%;background:{'var(--red)' if score >= 66 else 'var(--orange)' if score >= 33 else 'var(--green)'}"></div></div></div>"""
+        for name, score in m["risks"]
+    )
+    return f"""<div class="grid-2">
+  <div class="panel"><div class="panel-title">Signal Intensity {tag('PROXY')}</div>
+    <div class="chart-box small"><canvas id="signalChart"></canvas></div>
+  </div>
+  <div class="panel"><div class="panel-title">Risk Scoring {tag(data['volatility'].get('label'))}</div>{bars}
+    <div class="narrative">{esc(narrative.get('risk_commentary'))}</div>
+  </div>
+</div>"""
+
+
+def render_macro(data: dict) -> str:
+    sent, dxy, bi, jisdor = data["sentiment_dist"], data["dxy"], data["bi_rate"], data["jisdor"]
+    hist, vol = data["historical"], data["volatility"]
+    boxes = [
+        ("BI Rate", fmt(bi.get("rate"), 2, "%"), bi.get("label")),
+        ("DXY", f"{fmt(dxy.get('value'))} ({signed(dxy.get('change_pct'))})", dxy.get("label")),
+        ("JISDOR", fmt(jisdor.get("rate"), 0), jisdor.get("label")),
+        ("Avg 30D", fmt(hist.get("avg_30d")), hist.get("label")),
+        ("ATR 14D", f"±{fmt(vol.get('atr'))} ({fmt(vol.get('atr_pct'), 3, '%')})", vol.get("label")),
+        ("IDR terkuat 30D", fmt(hist.get("range_30d_low")), hist.get("label")),
+    ]
+    ranges = hist.get("ranges") or {}
+    r52, rall = ranges.get("52w") or {}, ranges.get("all") or {}
+    boxes += [
+        ("Range 52W", f"{fmt(r52.get('low'))} – {fmt(r52.get('high'))}", r52.get("label", "PROXY")),
+        ("Persentil 52W", f"{fmt(r52.get('percentile'), 0, '%')} · {signed(r52.get('from_high_pct'), 2)} dari high",
+         r52.get("label", "PROXY")),
+        (f"High sejak {(rall.get('from') or 'N/A')[:4]}",
+         f"{fmt(rall.get('high'))} ({signed(rall.get('from_high_pct'), 2)})", rall.get("label", "PROXY")),
+    ]
+    grid = "".join(
+        f'<div class="macro-box"><div class="macro-label">{esc(n)} {tag(lb)}</div><div class="macro-value">{v}</div></div>'
+        for n, v, lb in boxes
+    )
+    return f"""<div class="grid-2">
+  <div class="panel"><div class="panel-title">Distribusi Sentimen Berita</div>
+    <div class="chart-box small"><canvas id="sentimentChart"></canvas></div>
+    <div class="news-meta">Bearish {sent['bearish_pct']}% · Bullish {sent['bullish_pct']}% · Neutral {sent['neutral_pct']}%</div>
+  </div>
+  <div class="panel"><div class="panel-title">Macro Snapshot</div><div class="macro-grid">{grid}</div></div>
+</div>"""
+
+
+def render_twitter(data: dict) -> str:
+    cards = "".join(
+        f"""
+  <div class="tweet-card"><div class="tweet-tag">{esc(t['hashtag'])}</div>
+    <div>{esc(t['summary'])}</div>
+    <div class="news-meta">Engagement {esc(t['engagement'])} · <span class="{cls_of(t['classification'])}">{esc(t['classification'])}</span> {tag('PROXY')}</div>
+  </div>"""
+        for t in data["twitter"][:4]
+    )
+    return f"""<div class="panel"><div class="panel-title">X / Twitter Sentiment {tag('PROXY')}</div>
+<div class="grid-4" style="margin-bottom:0">{cards}
+</div></div>"""
+
+
+def render_telegram(narrative: dict) -> str:
+    return f"""<div class="panel"><div class="panel-title">Telegram Preview</div>
+  <div class="telegram">{esc(narrative.get('telegram_preview'))}</div>
+</div>"""
+
+
+def render_footer(data: dict) -> str:
+    sources = sorted({
+        s for s in (
+            data["spot"].get("source"), data["bca"].get("source"), data["jisdor"].get("source"),
+            data["dxy"].get("source"), data["bi_rate"].get("source"),
+        ) if s
+    })
+    return f"""<footer>
+  Sumber: {esc(' · '.join(sources) or 'N/A')}<br>
+  Generated {esc(data['meta'].get('generated_at', ''))} · Jadwal: Senin–Jumat 08:00 WIB · ● LIVE ⚡ PROXY ⚠ STALE
+</footer>"""
+
+
+def chart_payload(data: dict, m: dict) -> dict:
+    hist = data["historical"]
+    prices = hist.get("prices") or []
+    values = [v for v in prices + (hist.get("ma5") or []) + (hist.get("ma20") or []) if v is not None]
+    return {
+        "pair": pair_label(data["meta"].get("pair", PRIMARY_PAIR)),
+        "dates": hist.get("dates") or [],
+        "prices": prices,
+        "ma5": hist.get("ma5") or [],
+        "ma20": hist.get("ma20") or [],
+        "y_min": round(min(values) * 0.995, 2) if values else None,
+        "y_max": round(max(values) * 1.005, 2) if values else None,
+        "signals": m["signals"],
+        "sentiment": [
+            data["sentiment_dist"]["bearish_pct"],
+            data["sentiment_dist"]["bullish_pct"],
+            data["sentiment_dist"]["neutral_pct"],
+        ],
+    }
+
+
+def render_data(data: dict, m: dict) -> str:
+    """Isi marker DATA: payload chart sebagai <script> JSON."""
+    payload = json.dumps(chart_payload(data, m), ensure_ascii=False).replace("</", "<\\/")
+    return f'<script type="application/json" id="radar-data">{payload}</script>'
+
+
+# ── Public API ───────────────────────────────────────────────────────────────
+RENDERERS = {
+    "S1": lambda d, m, n, label: render_header(d, label),
+    "S2": lambda d, m, n, label: render_hero(d),
+    "S3": lambda d, m, n, label: render_chart(d, m),
+    "S4": lambda d, m, n, label: render_news(d, m, n),
+    "S5": lambda d, m, n, label: render_risk(d, m, n),
+    "S6": lambda d, m, n, label: render_macro(d),
+    "S7": lambda d, m, n, label: render_twitter(d),
+    "S8": lambda d, m, n, label: render_telegram(n),
+    "S9": lambda d, m, n, label: render_footer(d),
+    "DATA": lambda d, m, n, label: render_data(d, m),
+}
+
+
+def render_sections(data: dict, narrative: dict, date_label: str, sids=SECTIONS) -> dict:
+    """Render tiap section secara terpisah → {"S1": html, ...} (hanya `sids`)."""
+    m = derive(data)
+    return {sid: RENDERERS[sid](data, m, narrative, date_label) for sid in sids}
+
+
+def section_inputs(data: dict, narrative: dict, date_label: str) -> dict:
+    """
+    Input persis yang dibaca tiap section (+ DATA, dan PAGE = kerangka
+    <head>) — basis hash cache per section di generate_report.
+    """
+    m = derive(data)
+    meta, hist = data["meta"], data["historical"]
+    pair = meta.get("pair", PRIMARY_PAIR)
+    summary = {k: hist.get(k) for k in ("label", "range_30d_low", "range_30d_high", "avg_30d")}
+    return {
+        "PAGE": [pair, date_label],
+        "S1": [pair, date_label, meta.get("generated_at_wib"), meta.get("date")],
+        "S2": [pair, data["spot"], data["bca"], data["jisdor"], data["bi_rate"], summary],
+        "S3": [hist.get("label"), m["trend"]],
+        "S4": [data["news"][:5], analysis_rows(data, m), narrative.get("quick_take")],
+        "S5": [m["risks"], data["volatility"].get("label"), narrative.get("risk_commentary")],
+        "S6": [data["sentiment_dist"], data["dxy"], data["bi_rate"], data["jisdor"], summary, data["volatility"],
+               hist.get("ranges")],
+        "S7": [data["twitter"][:4]],
+        "S8": [narrative.get("telegram_preview")],
+        "S9": [[data[k].get("source") for k in ("spot", "bca", "jisdor", "dxy", "bi_rate")], meta.get("generated_at")],
+        "DATA": [chart_payload(data, m)],
+    }
+
+
+def section_hashes(data: dict, narrative: dict, date_label: str) -> dict:
+    """{sid: hash input} — berubah juga jika renderer ini berubah (RENDERER_HASH)."""
+    return {
+        sid: hashlib.sha256(json.dumps([RENDERER_HASH, inputs], sort_keys=True, ensure_ascii=False,
+                                       default=str).encode("utf-8")).hexdigest()[:16]
+        for sid, inputs in section_inputs(data, narrative, date_label).items()
+    }
+
+
+def render(data: dict, narrative: dict, date_label: str) -> str:
+    """Render halaman lengkap S1–S9."""
+    sections = render_sections(data, narrative, date_label, SECTIONS + ("DATA",))
+    label = pair_label(data["meta"].get("pair", PRIMARY_PAIR))
+    body = "\n".join(section(sid, sections[sid]) for sid in SECTIONS)
+    return f"""<!DOCTYPE html>
+<html lang="id">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>FX Radar {esc(label)} - {esc(date_label.upper())}</title>
+  <link rel="preconnect" href="https://fonts.googleapis.com">
+  <link href="{FONTS}" rel="stylesheet">
+  <script src="{CHART_JS}"></script>
+  <style>{CSS}</style>
+</head>
+<body>
+<div class="container">
+{body}
+</div>
+{section("DATA", sections["DATA"])}
+<script>{CHART_SCRIPT}</script>
+</body>
+</html>"""
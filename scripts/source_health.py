@@ -0,0 +1,160 @@
+"""
+source_health.py
+Catatan kesehatan per sumber data + circuit breaker, disimpan di
+data/source_health.json antar run.
+
+  with source_health.track("bi_webservice") as t:
+      r = http_client.get(url, timeout=source_health.timeout_for("bi_webservice", 15))
+      ...
+      t.ok()          # sumber memberi data; keluar tanpa ok() = gagal
+
+Setelah FAIL_THRESHOLD kegagalan beruntun breaker terbuka: track() langsung
+raise SourceSkipped (tanpa request) sampai cooldown habis. Setelah itu satu
+run menjadi probe — sukses menutup breaker, gagal membuka lagi dengan
+cooldown dua kali lipat (maks COOLDOWN_MAX_H).
+
+timeout_for() memotong timeout sumber yang sehat ke ±4× latency rata-rata,
+jadi deadline fetch tidak habis menunggu sumber yang biasanya cepat.
+
+  python scripts/source_health.py          # ringkasan per sumber
+"""
+import os
+import json
+import time
+import datetime
+import threading
+
+HEALTH_PATH = os.environ.get("SOURCE_HEALTH_PATH", "data/source_health.json")
+FAIL_THRESHOLD = 3
+COOLDOWN_H = float(os.environ.get("BREAKER_COOLDOWN_H", "24"))
+COOLDOWN_MAX_H = 24 * 7
+RECENT = 20             # jumlah hasil terakhir untuk success rate
+MIN_TIMEOUT = 3.0
+LATENCY_ALPHA = 0.3     # bobot EWMA latency
+
+_lock = threading.RLock()
+_state = None
+
+
+class SourceSkipped(Exception):
+    """Breaker sumber sedang terbuka — request tidak dilakukan."""
+
+
+def _now() -> float:
+    return time.time()
+
+
+def _iso(ts) -> str:
+    return datetime.datetime.utcfromtimestamp(ts).isoformat(timespec="seconds") + "Z" if ts else None
+
+
+def load() -> dict:
+    global _state
+    with _lock:
+        if _state is None:
+            try:
+                with open(HEALTH_PATH, "r", encoding="utf-8") as f:
+                    _state = json.load(f)
+            except (OSError, ValueError):
+                _state = {}
+        return _state
+
+
+def save(path: str = HEALTH_PATH):
+    state = load()
+    with _lock:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+
+
+def _entry(name: str) -> dict:
+    return load().setdefault(name, {
+        "ok": 0, "fail": 0, "recent": "", "consecutive_failures": 0,
+        "latency_s": None, "last_success": None, "last_failure": None, "last_error": None,
+        "open_until": None, "cooldown_h": COOLDOWN_H,
+    })
+
+
+def allow(name: str) -> bool:
+    """False jika breaker terbuka dan cooldown belum habis."""
+    e = load().get(name)
+    return not (e and e["open_until"] and _now() < e["open_until"])
+
+
+def record(name: str, ok: bool, latency: float, error: str = None):
+    with _lock:
+        e = _entry(name)
+        e["recent"] = (e["recent"] + ("1" if ok else "0"))[-RECENT:]
+        if ok:
+            e["ok"] += 1
+            e["consecutive_failures"] = 0
+            e["last_success"] = _now()
+            e["open_until"] = None
+            e["cooldown_h"] = COOLDOWN_H
+            prev = e["latency_s"]
+            e["latency_s"] = round(latency if prev is None else prev + LATENCY_ALPHA * (latency - prev), 3)
+            return
+        e["fail"] += 1
+        e["consecutive_failures"] += 1
+        e["last_failure"] = _now()
+        e["last_error"] = (error or "tanpa data")[:200]
+        if e["open_until"] is not None:          # probe gagal → cooldown ×2
+            e["cooldown_h"] = min(COOLDOWN_MAX_H, e["cooldown_h"] * 2)
+        if e["consecutive_failures"] >= FAIL_THRESHOLD:
+            e["open_until"] = _now() + e["cooldown_h"] * 3600
+
+
+def timeout_for(name: str, default: float) -> float:
+    """Timeout request: default, atau ±4× latency EWMA untuk sumber yang sehat."""
+    e = load().get(name)
+    if not e or e["latency_s"] is None or e["ok"] < 3 or e["consecutive_failures"]:
+        return default
+    return round(min(default, max(MIN_TIMEOUT, e["latency_s"] * 4)), 1)
+
+
+class track:
+    """Context manager: ukur satu percobaan sumber dan catat hasilnya."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.success = False
+
+    def ok(self):
+        self.success = True
+
+    def __enter__(self):
+        if not allow(self.name):
+            e = load()[self.name]
+            raise SourceSkipped(f"breaker {self.name} terbuka sampai {_iso(e['open_until'])}")
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        error = f"{exc_type.__name__}: {exc}" if exc_type else None
+        record(self.name, self.success and exc_type is None, time.perf_counter() - self.t0, error)
+        return False
+
+
+def main():
+    state = load()
+    if not state:
+        print(f"Belum ada data di {HEALTH_PATH}")
+        return
+    print(f"{'sumber':<22} {'sukses':>7} {'recent':>7} {'latency':>8} {'gagal×':>6}  status")
+    for name, e in sorted(state.items()):
+        total = e["ok"] + e["fail"]
+        recent = e["recent"]
+        status = (f"OPEN s/d {_iso(e['open_until'])}" if e["open_until"] and _now() < e["open_until"]
+                  else "half-open (probe)" if e["open_until"] else "closed")
+        latency = f"{e['latency_s']:.2f}s" if e["latency_s"] is not None else "-"
+        print(f"{name:<22} {e['ok'] / total if total else 0:>7.0%} "
+              f"{recent.count('1') / len(recent) if recent else 0:>7.0%} {latency:>8} "
+              f"{e['consecutive_failures']:>6}  {status}"
+              + (f" — {e['last_error']}" if e["consecutive_failures"] else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""range_summary: window 52W tanpa record tidak boleh menggagalkan ringkasan."""
+import os
+import sys
+import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import fetch_data  # noqa: E402
+from rate_store import RateStore  # noqa: E402
+
+
+def make_store(tmp_path, days):
+    store = RateStore("USDIDR", root=str(tmp_path))
+    first = datetime.date(2020, 1, 1)
+    store.merge({(first + datetime.timedelta(days=i)).isoformat(): 15000.0 + i for i in range(days)})
+    return store
+
+
+def test_window_without_records_is_skipped(tmp_path):
+    store = make_store(tmp_path, 30)
+    end = store.last_date() + datetime.timedelta(days=400)
+    out = fetch_data.range_summary(store, end, "LIVE")
+    assert "52w" not in out
+    assert out["all"]["points"] == 30
+    assert out["all"]["high"] == 15029.0
+
+
+def test_window_with_records(tmp_path):
+    store = make_store(tmp_path, 30)
+    out = fetch_data.range_summary(store, store.last_date(), "LIVE")
+    assert out["52w"]["points"] == 30
+    assert out["52w"]["percentile"] == 100.0